@@ -0,0 +1,284 @@
+import hashlib
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Lock
+from typing import Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+_MASK = (1 << 64) - 1
+
+
+def _hash64(data: str) -> int:
+    """Persistent 64 bit hash of the string."""
+    return int.from_bytes(hashlib.blake2b(data.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _mix(values: npt.NDArray[np.uint64]) -> npt.NDArray[np.uint64]:
+    """Scrambles the bits of 64 bit integers (the finalizer of splitmix64). Overflows are intended."""
+    with np.errstate(over='ignore'):
+        values = (values ^ (values >> np.uint64(30))) * \
+            np.uint64(0xbf58476d1ce4e5b9)
+        values = (values ^ (values >> np.uint64(27))) * \
+            np.uint64(0x94d049bb133111eb)
+        return values ^ (values >> np.uint64(31))
+
+
+def make_digest(words: List[str]) -> str:
+    """
+    Fingerprint for finding exact duplicates.
+
+    words:
+    The words of the cleaned text.
+
+    returns:
+    The hash of the text as hex string.
+    """
+    return hashlib.blake2b(' '.join(words).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def make_signature(words: List[str], num_perm: int = 64, shingle_size: int = 3) -> npt.NDArray[np.uint64]:
+    """
+    Computes the MinHash signature of the text. The share of equal entries in the signatures of two
+    texts estimates the Jaccard similarity of their sets of shingles.
+
+    words:
+    The words of the cleaned text.
+
+    num_perm (default 64):
+    Length of the signature.
+
+    shingle_size (default 3):
+    Number of consecutive words forming a shingle.
+
+    returns:
+    The signature.
+    """
+    size = min(shingle_size, len(words))
+    shingles = {' '.join(words[pos:pos+size])
+                for pos in range(len(words) - size + 1)}
+    if len(shingles) == 0:
+        return np.full(num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+
+    hashes = np.array([_hash64(shingle)
+                      for shingle in shingles], dtype=np.uint64)
+    # one hash function per entry, derived from the shingle hash by seed and bit mixing
+    seeds = _mix(np.arange(1, num_perm + 1, dtype=np.uint64))
+    return _mix(hashes[:, None] ^ seeds[None, :]).min(axis=0)
+
+
+class DedupIndex():
+    """
+    Remembers fingerprints of the samples in an SQLite database, for recognizing a text that is already
+    known. The same text is found by a hash over its cleaned words. Near duplicates, like the same
+    posting with another footer, are found by MinHash signatures: the signatures are cut into bands,
+    and samples sharing a band are candidates. Candidates count as duplicates if their signatures
+    agree in at least 'threshold' of the entries.
+
+    Duplicates that have been turned away are linked to the known sample, together with their origin,
+    their url, and how similar they are, so that the decision can be reviewed.
+
+    Samples collected before the index existed are added once by 'seed'.
+
+    All methods can be called from several threads.
+    """
+
+    path: Path
+    """The database file."""
+    num_perm: int
+    """Length of the MinHash signatures."""
+    bands: int
+    """Number of bands the signatures are cut into. Must divide 'num_perm'."""
+    threshold: float
+    """Minimum estimated similarity of near duplicates."""
+    _lock: Lock
+
+    def __init__(self, path: Path, num_perm: int = 64, bands: int = 16, threshold: float = 0.8) -> None:
+        if num_perm % bands != 0:
+            raise ValueError('num_perm must be a multiple of bands')
+        self.path = path
+        self.num_perm = num_perm
+        self.bands = bands
+        self.threshold = threshold
+        self._lock = Lock()
+
+    def find_or_add(self, id: str, words: List[str], origin: str = '', url: str = '') -> Optional[str]:
+        """
+        Looks for a known sample with the same or a similar text. If there is none, the text is added
+        under the given id. Otherwise, the duplicate is linked to the known sample.
+
+        id:
+        Id of the new sample.
+
+        words:
+        The words of the cleaned text.
+
+        origin (default ''):
+        Where the new sample comes from, noted down for a duplicate.
+
+        url (default ''):
+        The page of the new sample, noted down for a duplicate.
+
+        returns:
+        The id of the known sample, or None if the text is new.
+        """
+        digest = make_digest(words)
+        signature = make_signature(words, self.num_perm)
+        keys = self._band_keys(signature)
+        with self._lock, self._transaction() as con:
+            known, similarity = self._find(con, digest, signature, keys)
+            if known is None:
+                self._add(con, id, digest, signature, keys)
+            else:
+                con.execute('INSERT INTO links (sample, origin, url, similarity) VALUES (?, ?, ?, ?)',
+                            (known, origin, url, similarity))
+            return known
+
+    def is_seeded(self) -> bool:
+        """
+        returns:
+        True if the samples collected before the index existed have been added.
+        """
+        with self._lock, self._transaction() as con:
+            return con.execute("SELECT 1 FROM meta WHERE key = 'seeded'").fetchone() is not None
+
+    def seed(self, samples: Iterable[Tuple[str, List[str]]]) -> int:
+        """
+        Adds samples collected before the index existed, so that new pages are checked against them as
+        well. The samples are added as they are, without looking for duplicates among them. Samples already
+        known are skipped. Afterwards, the index counts as seeded.
+
+        samples:
+        The ids of the samples with the words of their cleaned texts.
+
+        returns:
+        The number of samples added.
+        """
+        prints = []
+        for id, words in samples:
+            signature = make_signature(words, self.num_perm)
+            prints.append((id, make_digest(words), signature,
+                          self._band_keys(signature)))
+        added = 0
+        with self._lock, self._transaction() as con:
+            known = {row[0]
+                     for row in con.execute('SELECT sample FROM signatures')}
+            for id, digest, signature, keys in prints:
+                if id not in known:
+                    known.add(id)
+                    self._add(con, id, digest, signature, keys)
+                    added += 1
+            con.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('seeded', '1')")
+        return added
+
+    def find(self, words: List[str]) -> Optional[str]:
+        """
+        Looks for a known sample with the same or a similar text without adding anything.
+
+        words:
+        The words of the cleaned text.
+
+        returns:
+        The id of the known sample, or None if the text is new.
+        """
+        signature = make_signature(words, self.num_perm)
+        with self._lock, self._transaction() as con:
+            return self._find(con, make_digest(words), signature, self._band_keys(signature))[0]
+
+    def get_links(self, id: str) -> pd.DataFrame:
+        """
+        returns:
+        The duplicates that have been linked to the sample, one row each with the columns 'origin', 'url',
+        and 'similarity'. The similarity is 1 for the same text.
+        """
+        with self._lock, self._transaction() as con:
+            rows = con.execute(
+                'SELECT origin, url, similarity FROM links WHERE sample = ?', (id,)).fetchall()
+        return pd.DataFrame(rows, columns=['origin', 'url', 'similarity'])
+
+    def remove(self, id: str) -> None:
+        """
+        Forgets the sample, so that its text counts as new again.
+
+        id:
+        Id of the sample.
+        """
+        with self._lock, self._transaction() as con:
+            for table, column in [('exact', 'sample'), ('signatures', 'sample'), ('bands', 'sample'), ('links', 'sample')]:
+                con.execute(f'DELETE FROM {table} WHERE {column} = ?', (id,))
+
+    def _add(self, con: sqlite3.Connection, id: str, digest: str, signature: npt.NDArray[np.uint64], keys: List[str]) -> None:
+        """Stores the fingerprints of the sample."""
+        con.execute('INSERT OR REPLACE INTO exact VALUES (?, ?)', (digest, id))
+        con.execute('INSERT OR REPLACE INTO signatures VALUES (?, ?)',
+                    (id, signature.tobytes()))
+        con.executemany('INSERT INTO bands VALUES (?, ?)',
+                        [(key, id) for key in keys])
+
+    def _find(self, con: sqlite3.Connection, digest: str, signature: npt.NDArray[np.uint64], keys: List[str]) -> Tuple[Optional[str], float]:
+        """
+        Looks for the exact text first, and for the most similar candidate from the bands then.
+
+        returns:
+        The id of the known sample, or None, and the estimated similarity.
+        """
+        row = con.execute(
+            'SELECT sample FROM exact WHERE digest = ?', (digest,)).fetchone()
+        if row is not None:
+            return (row[0], 1.0)
+
+        marks = ', '.join(['?' for _ in keys])
+        candidates = con.execute(
+            f'SELECT DISTINCT s.sample, s.signature FROM bands b JOIN signatures s ON b.sample = s.sample WHERE b.key IN ({marks})', keys).fetchall()
+        best = None
+        best_similarity = self.threshold
+        for sample, blob in candidates:
+            other = np.frombuffer(blob, dtype=np.uint64)
+            if len(other) != len(signature):
+                continue
+            similarity = float(np.mean(other == signature))
+            if similarity >= best_similarity:
+                best = sample
+                best_similarity = similarity
+        return (best, best_similarity)
+
+    def _band_keys(self, signature: npt.NDArray[np.uint64]) -> List[str]:
+        """Splits the signature into bands, and names each band by its position and content."""
+        rows = self.num_perm // self.bands
+        return [f'{band}:' + hashlib.blake2b(signature[band*rows:(band+1)*rows].tobytes(), digest_size=8).hexdigest()
+                for band in range(self.bands)]
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Opens the database for a single transaction, creating the tables if missing. The transaction
+        is committed if the block succeeds and rolled back otherwise.
+        """
+        con = sqlite3.connect(self.path)
+        try:
+            with con:
+                con.execute(
+                    'CREATE TABLE IF NOT EXISTS exact (digest TEXT PRIMARY KEY, sample TEXT)')
+                con.execute(
+                    'CREATE TABLE IF NOT EXISTS signatures (sample TEXT PRIMARY KEY, signature BLOB)')
+                con.execute(
+                    'CREATE TABLE IF NOT EXISTS bands (key TEXT, sample TEXT)')
+                con.execute(
+                    'CREATE INDEX IF NOT EXISTS bands_key ON bands (key)')
+                con.execute(
+                    'CREATE TABLE IF NOT EXISTS links (sample TEXT, origin TEXT, url TEXT, similarity REAL)')
+                present = [row[1]
+                           for row in con.execute('PRAGMA table_info(links)')]
+                for column, type in [('url', 'TEXT'), ('similarity', 'REAL')]:
+                    if column not in present:
+                        # written before the links were detailed
+                        con.execute(
+                            f'ALTER TABLE links ADD COLUMN {column} {type}')
+                con.execute(
+                    'CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+                yield con
+        finally:
+            con.close()
@@ -0,0 +1,181 @@
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+import pandas as pd
+from look_around.tools import keys
+
+_ID = 'id'
+"""Column in the database that holds the index of the sample file index."""
+TRAINING_SCHEMA: Dict[str, str] = {
+    keys.RAW_FILE: 'TEXT',
+    keys.PREP_FILE: 'TEXT',
+    keys.ORIGIN: 'TEXT',
+    keys.LANGUAGE: 'TEXT',
+    keys.RATING: 'INTEGER',
+    keys.LABELED_BY: 'TEXT',
+    keys.USAGE: 'TEXT'
+}
+"""Typed columns of the training files index."""
+DATA_SCHEMA: Dict[str, str] = {
+    keys.RAW_FILE: 'TEXT',
+    keys.PREP_FILE: 'TEXT',
+    keys.LANGUAGE: 'TEXT',
+    keys.PREDICTION: 'INTEGER',
+    keys.PREDICTED_BY: 'TEXT'
+}
+"""Typed columns of the index of the data files."""
+_CATEGORICAL = [keys.ORIGIN, keys.LANGUAGE, keys.USAGE]
+"""Columns with few distinct values that samples are frequently selected by. These get a database index."""
+_INTEGER = [keys.RATING, keys.PREDICTION]
+
+
+def _quote(name: str) -> str:
+    """Quotes the column or table name for the use in an sql statement."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+class SqliteIndexStore():
+    """
+    Stores a sample file index in an SQLite database. Unlike the csv file, single rows can be
+    inserted and updated without rewriting the entire index, and each write is a transaction that
+    either succeeds as a whole or leaves the previous state untouched.
+
+    The columns of the schema are typed: the rating is an integer, for instance, while origin, language,
+    and usage are indexed text columns. Further columns are added untyped when they show up. The index
+    of the sample file index is stored untyped, so it keeps its type.
+    """
+
+    path: Path
+    """The database file."""
+    schema: Dict[str, str]
+    """The typed columns, with their SQLite types."""
+    table: str
+    """The table the index is kept in."""
+
+    def __init__(self, path: Path, schema: Dict[str, str] = TRAINING_SCHEMA, table: str = 'samples') -> None:
+        self.path = path
+        self.schema = schema
+        self.table = table
+
+    def exists(self) -> bool:
+        """
+        returns:
+        True if the database file exists.
+        """
+        return self.path.exists() and self.path.is_file()
+
+    def read(self) -> pd.DataFrame:
+        """
+        Reads the entire sample file index.
+
+        returns:
+        The sample file index. Empty if the database does not exist yet.
+        """
+        with self._transaction() as con:
+            self._ensure_table(con, [])
+            file_data = pd.read_sql_query(
+                f'SELECT * FROM {_quote(self.table)}', con, index_col=_ID)
+        file_data.index.name = None
+        return file_data
+
+    def write(self, file_data: pd.DataFrame) -> None:
+        """
+        Replaces the stored sample file index by the given one in a single transaction.
+
+        file_data:
+        The sample file index.
+        """
+        with self._transaction() as con:
+            self._ensure_table(con, file_data.columns)
+            con.execute(f'DELETE FROM {_quote(self.table)}')
+            self._insert(con, file_data)
+
+    def upsert(self, file_data: pd.DataFrame, rows: Iterable = None) -> None:
+        """
+        Inserts or updates just the given rows of the sample file index. Rows are identified by the
+        index of 'file_data'.
+
+        file_data:
+        The sample file index.
+
+        rows (default None):
+        The index values of the rows to be written. All rows of 'file_data' are written if None.
+        """
+        if rows is not None:
+            file_data = file_data.loc[list(rows)]
+        if len(file_data) == 0:
+            return
+
+        with self._transaction() as con:
+            self._ensure_table(con, file_data.columns)
+            self._insert(con, file_data)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Opens the database for a single transaction. The transaction is committed if the block
+        succeeds and rolled back otherwise. The connection is closed in either case.
+        """
+        con = sqlite3.connect(self.path)
+        try:
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    def _ensure_table(self, con: sqlite3.Connection, columns: Iterable[str]) -> None:
+        """
+        Creates the table and its database indices if missing, and adds the given columns if they
+        are not present yet.
+        """
+        cols = [f'{_quote(_ID)} PRIMARY KEY'] + \
+            [f'{_quote(col)} {type}' for col, type in self.schema.items()]
+        con.execute(
+            f'CREATE TABLE IF NOT EXISTS {_quote(self.table)} ({", ".join(cols)})')
+        for col in [col for col in _CATEGORICAL if col in self.schema]:
+            idx_name = _quote(f'{self.table}_{col}')
+            con.execute(
+                f'CREATE INDEX IF NOT EXISTS {idx_name} ON {_quote(self.table)} ({_quote(col)})')
+
+        present = [row[1]
+                   for row in con.execute(f'PRAGMA table_info({_quote(self.table)})')]
+        for col in columns:
+            if col not in present:
+                con.execute(
+                    f'ALTER TABLE {_quote(self.table)} ADD COLUMN {_quote(col)}')
+
+    def _insert(self, con: sqlite3.Connection, file_data: pd.DataFrame) -> None:
+        """
+        Inserts the rows of 'file_data'. For rows with an index already present, the values of the
+        columns of 'file_data' are updated, while other columns remain untouched.
+        """
+        columns = list(file_data.columns)
+        names = ', '.join([_quote(col) for col in [_ID] + columns])
+        marks = ', '.join(['?' for _ in range(len(columns) + 1)])
+        sql = f'INSERT INTO {_quote(self.table)} ({names}) VALUES ({marks})'
+        if len(columns) > 0:
+            updates = ', '.join(
+                [f'{_quote(col)} = excluded.{_quote(col)}' for col in columns])
+            sql += f' ON CONFLICT ({_quote(_ID)}) DO UPDATE SET {updates}'
+        else:
+            sql += f' ON CONFLICT ({_quote(_ID)}) DO NOTHING'
+        con.executemany(sql, self._to_records(file_data))
+
+    def _to_records(self, file_data: pd.DataFrame) -> List[List]:
+        """
+        Converts the rows into lists of plain python values, with None for missing values and
+        integers in the integer columns. The index values keep their type.
+        """
+        values = [file_data.index.tolist()]
+        for col in file_data.columns:
+            series = file_data[col]
+            missing = series.isna().tolist()
+            if col in _INTEGER:
+                column = [None if miss else int(val)
+                          for val, miss in zip(series.tolist(), missing)]
+            else:
+                column = [None if miss else val
+                          for val, miss in zip(series.tolist(), missing)]
+            values.append(column)
+        return [list(row) for row in zip(*values)]
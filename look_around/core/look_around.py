@@ -1,22 +1,20 @@
 from pathlib import Path
 import json
-from typing import Dict, Tuple, List
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple, List
+from concurrent.futures import ProcessPoolExecutor
 from look_around.core.project import Project
+from look_around.core import packed_corpus
 import numpy as np
 import numpy.typing as npt
 import pandas as pd
 from look_around.tools import tools
 from scipy.sparse import spmatrix
-from look_around.run import run_dev
 from look_around.tools import keys
-from look_around.doc_process import html_cleaning, stops_removal, stemming
-from look_around.doc_process import lang_detection
+from look_around.doc_process import stemming, stopword_registry
+from look_around.doc_process.lang_detection import UNKNOWN
+from look_around.doc_process.document_pipeline import DocumentPipeline
 from look_around.models.model_wrapper import ModelWrapper
-from look_around.presenter.presenter import Presenter
-from look_around.scraper.selenium_scraper import SeleniumScraper
-from look_around.scraper.page_handlers.print_handler import PrintHandler
 
-_UNKNOWN = "unknown"
 _ORIGIN = "origin"
 
 
@@ -47,10 +45,13 @@ class LookAround():
     test_data: Tuple[spmatrix, pd.Series]
     origins: List[Dict]
     browser: str
+    index_format: Optional[str]
+    """How the sample file index is stored, 'csv' or 'sqlite'. Decided by the project if None."""
     model_data: pd.DataFrame
     """The model index that lists all known models within the project along their scores."""
 
     def __init__(self) -> None:
+        self.prj = None
         path = Path(__file__).parent
         path = Path(path, '..',
                     'look_around_config.json').absolute().resolve()
@@ -78,6 +79,12 @@ class LookAround():
                         self.browser = ''
                         self._config['browser'] = self.browser
 
+                    # storage of the sample file index
+                    try:
+                        self.index_format = self._config['index_format'].lower()
+                    except BaseException:
+                        self.index_format = None
+
             except BaseException as be:
                 print('could not load configuration')
                 print(be)
@@ -96,7 +103,8 @@ class LookAround():
         returns:
         Instance of project
         """
-        self.prj = Project(name, self.home_path)
+        self.prj = Project(name, self.home_path,
+                           index_format=self._get_index_format())
         self.prj.make_missing_dirs()
         return self.prj
 
@@ -122,7 +130,8 @@ class LookAround():
         if not path.exists:
             raise RuntimeError('No such project')  # TODO: localize message
 
-        self.prj = Project(name, self.home_path)
+        self.prj = Project(name, self.home_path,
+                           index_format=self._get_index_format())
         return self.prj
 
     # _______________  vocabulary  _______________
@@ -166,9 +175,41 @@ class LookAround():
         returns:
         The model index.
         """
-        new_model_data = tools.make_model_index(index=[model.name])
-        self.model_data = pd.concat([self.model_data, new_model_data])
-        self.update_model_in_index(model, write_on_update)
+        return self.add_models_to_index([model], write_on_update)
+
+    def add_models_to_index(self, models: Iterable[ModelWrapper], write_on_update: bool = True) -> pd.DataFrame:
+        """
+        Adds many models to the model index, or updates their entries if they are listed already. The
+        rows of all models are built at once and merged into the index in a single step, and the index
+        is written just once.
+
+        models:
+        The models to be added or updated.
+
+        write_on_update (default True):
+        Write the model index to disk if it has been updated?
+
+        returns:
+        The model index.
+        """
+        rows = tools.make_model_index_rows(models)
+        if len(rows) == 0:
+            return self.model_data
+
+        new = rows.index.difference(self.model_data.index, sort=False)
+        listed = rows.index.difference(new, sort=False)
+        model_data = self.model_data.copy()
+        if len(listed) > 0:
+            model_data.loc[listed, rows.columns] = rows.loc[listed]
+        if len(new) > 0 and len(model_data) == 0:
+            model_data = rows.loc[new]
+        elif len(new) > 0:
+            model_data = pd.concat([model_data, rows.loc[new]])
+        self.model_data = model_data
+
+        if write_on_update:
+            self.prj.write_model_index(self.model_data)
+
         return self.model_data
 
     def update_model_in_index(self, model: ModelWrapper, write_on_update: bool = True) -> pd.DataFrame:
@@ -186,44 +227,12 @@ class LookAround():
         returns:
         The model index
         """
-        try:
-            self.model_data.loc[model.name]
-        except KeyError as ke:
+        if model.name not in self.model_data.index:
             # TODO: localize message
             print('No model with such a name is listed in the index.')
             return self.model_data
 
-        try:
-            if model.desc is not None:
-                use_desc = model.desc
-            else:
-                use_desc = pd.NA
-        except AttributeError:
-            # desc not set
-            use_desc = pd.NA
-
-        self.model_data.loc[model.name, keys.DESC] = use_desc
-        self.model_data.loc[model.name,
-                            keys.TRAIN_ACC] = model.train_scores.loc['avg', keys.ACCURACY]
-        self.model_data.loc[model.name,
-                            keys.TRAIN_PREC] = model.train_scores.loc['avg', keys.PRECISION]
-        self.model_data.loc[model.name,
-                            keys.TRAIN_REC] = model.train_scores.loc['avg', keys.RECALL]
-        self.model_data.loc[model.name,
-                            keys.TRAIN_F1] = model.train_scores.loc['avg', keys.F1]
-        self.model_data.loc[model.name,
-                            keys.VAL_ACC] = model.val_scores.loc['avg', keys.ACCURACY]
-        self.model_data.loc[model.name,
-                            keys.VAL_PREC] = model.val_scores.loc['avg', keys.PRECISION]
-        self.model_data.loc[model.name,
-                            keys.VAL_REC] = model.val_scores.loc['avg', keys.RECALL]
-        self.model_data.loc[model.name,
-                            keys.VAL_F1] = model.val_scores.loc['avg', keys.F1]
-
-        if write_on_update:
-            self.prj.write_model_index(self.model_data)
-
-        return self.model_data
+        return self.add_models_to_index([model], write_on_update)
 
     def write_model(self, model: ModelWrapper) -> None:
         """
@@ -238,6 +247,48 @@ class LookAround():
     def read_model(self, name: str) -> ModelWrapper:
         return self.prj.read_model(name)
 
+    def sweep_models(self, jobs: Dict, workers: int = 2) -> List[str]:
+        """
+        Trains and validates many models in parallel on the current training and test data, as computed
+        by 'get_feature_labels'. Each model is written to the model directory, and is added to the
+        model index as soon as it is done. Models already listed in the model index are skipped, so
+        an interrupted sweep is resumed by running it again.
+
+        jobs:
+        By model name, the sklearn estimators, or module level functions that take the model name and
+        return the wrapped model. See 'sweep.make_grid' for trying combinations of parameters.
+
+        workers (default 2):
+        Number of processes training models at the same time.
+
+        returns:
+        The names of the models that have been trained.
+        """
+        from look_around.models.sweep import SweepRunner
+        try:
+            self.model_data
+        except AttributeError:
+            self.read_model_index()
+
+        runner = SweepRunner(self.prj.model_dir, workers=workers)
+        trained = runner.run(jobs, self.train_data, self.test_data,
+                             skip=self.model_data.index, on_done=self._sweep_done)
+        print('\r')
+        print(f'Trained {len(trained)} models')
+        return trained
+
+    def _sweep_done(self, model: ModelWrapper) -> None:
+        """
+        Takes note of a model the sweep has written: a model of the same name kept in memory is outdated
+        now, and the model is added to the model index.
+
+        model:
+        The model as it comes from the sweep, with scores but without the trained model itself.
+        """
+        # the workers write the files past the project, so the model registry does not know them yet
+        self.prj.model_registry.forget(model.name)
+        self.add_to_model_index(model)
+
     def compute_train_scores(self, model: ModelWrapper) -> pd.DataFrame:
         """
         Computes some scores of the model from the training data and their labels. The scores are
@@ -270,7 +321,32 @@ class LookAround():
         self.test_samples = self.prj.read_test_samples(self.file_data)
         return (self.train_samples, self.test_samples)
 
-    def prepare_unclean_samples(self, backup_langs: List[str] = ['english'], write_on_update: bool = True) -> None:
+    def pack_samples(self) -> int:
+        """
+        Packs all prepared training samples into a single corpus file, so that reading the samples
+        does not need to open every prepared file.
+
+        returns:
+        The number of packed samples.
+        """
+        return self.prj.pack_training_samples(self.file_data)
+
+    def prepare_unclean_samples(self, backup_langs: List[str] = ['english'], write_on_update: bool = True, workers: int = 1) -> None:
+        """
+        Preprocesses the raw sample files that do not have a prepared file yet. The html is stripped,
+        the language is detected if unknown, and stop words are removed before the remaining words
+        are stemmed. The results are written next to the raw files.
+
+        backup_langs (default ['english']):
+        Languages used for the language detection if no default languages are configured.
+
+        write_on_update (default True):
+        Write the sample file index to disk once all files are processed?
+
+        workers (default 1):
+        Number of processes that preprocess the files in parallel. With 1, all files are processed
+        in this process. The sample file index is updated in this process in any case.
+        """
         idx1 = self.file_data[keys.RAW_FILE].notna()
         idx2 = self.file_data[keys.PREP_FILE].isna()
         df = self.file_data[idx1 & idx2]
@@ -278,97 +354,118 @@ class LookAround():
             root = self.prj.training_dir
         else:
             root = self.prj.data_dir
-        filecount = len(df)
-        counter = 1
-        for row in df.index:
-            print(f'\rpreprocessing file {counter} of {filecount}:', end='')
-            raw_file = Path(root, str(df.loc[row, keys.RAW_FILE])).resolve()
-            print(f' {str(raw_file.name)} ', end='')
-            prep_name = raw_file.stem + '-cleaned.txt'
-            prep_file = Path(root, raw_file.parent, prep_name)
-            try:
-                use_langs = self.default_langs
-            except AttributeError:
-                use_langs = backup_langs
-            ok = self._prepare_unclean_sample(
-                row, raw_file, prep_file, root, use_langs)
-            if ok:
-                counter += 1
-
-        if write_on_update and counter > 0:
-            self.prj.write_training_index(self.file_data)
+        try:
+            use_langs = self.default_langs
+        except AttributeError:
+            use_langs = backup_langs
+        # loaded once here, forked workers inherit the stop words
+        stopword_registry.warm_up(use_langs)
+
+        pipeline = DocumentPipeline(use_langs, threshold=0.1)
+        jobs = [self._make_preparation_job(row, df, root, pipeline)
+                for row in df.index]
+        filecount = len(jobs)
+        if workers > 1 and filecount > 1:
+            chunksize = max(1, filecount // (workers * 4))
+            # the workers get a stem cache of the same size as this process
+            cache_size = stemming.get_cache_info()['max_size']
+            with ProcessPoolExecutor(max_workers=workers, initializer=stemming.set_cache_size, initargs=(cache_size,)) as executor:
+                results = self._collect_preparations(
+                    executor.map(_prepare_unclean_sample, *zip(*jobs), chunksize=chunksize), filecount)
+        else:
+            results = self._collect_preparations(
+                (_prepare_unclean_sample(*job) for job in jobs), filecount)
+
+        # apply all results to the sample file index in one go
+        prepared = [result for result in results if result[2] is not None]
+        detected = [result for result in results if result[1] is not None]
+        if len(detected) > 0:
+            self.file_data.loc[[result[0] for result in detected], keys.LANGUAGE] = [
+                result[1] for result in detected]
+        if len(prepared) > 0:
+            self.file_data.loc[[result[0] for result in prepared], keys.PREP_FILE] = [
+                result[2] for result in prepared]
+
+        if write_on_update and len(results) > 0:
+            self.prj.write_training_index_rows(
+                self.file_data, [result[0] for result in results])
         print('\r')
-        print(f'Preprocessed and wrote {counter-1} files')
+        print(f'Preprocessed and wrote {len(prepared)} files')
 
-    def _prepare_unclean_sample(self, row: str, raw_file: Path, prep_file: Path, root: Path, search_langs: List[str]) -> bool:
-        try:
-            with open(raw_file, 'rt') as raw:
-                lines = [line.strip() for line in raw.readlines()]
-                # join by space prevents two words merging into one
-                text = ' '.join(lines)
-        except BaseException as be:
-            print(f'cannot read raw sample file {str(raw_file)}:')
-            print(be)
-            return False
-
-        # process sample, part one
-        text = html_cleaning.clean_html(text)
+    def _make_preparation_job(self, row: str, df: pd.DataFrame, root: Path, pipeline: DocumentPipeline) -> Tuple:
+        """
+        Collects everything a worker needs for preprocessing the sample in the given row, so
+        that the worker does not need access to the sample file index.
+
+        returns:
+        The arguments for '_prepare_unclean_sample'.
+        """
+        raw_file = Path(root, str(df.loc[row, keys.RAW_FILE])).resolve()
+        prep_name = raw_file.stem + '-cleaned.txt'
+        prep_file = Path(root, raw_file.parent, prep_name)
 
         try:
-            origin = str(self.file_data.loc[row, keys.ORIGIN])
-        except BaseException as ba:
+            origin = df.loc[row, keys.ORIGIN]
+        except KeyError:
             origin = pd.NA
 
+        origin_stopwords = frozenset()
         if pd.notna(origin):
             try:
-                sw_list = self._get_origin_stopwords(origin)
-                text = stops_removal.remove_given_stopwords(text, sw_list)
+                origin_stopwords = self._get_origin_stopwords(str(origin))
             except BaseException as be:
                 # origin not listed in configuration. Could be mistake, could be purpose, simply skip this step
                 pass
 
-        # which language?
         try:
-            if pd.notna(self.file_data.loc[row, keys.LANGUAGE]) and self.file_data.loc[row, keys.LANGUAGE] != _UNKNOWN:
-                # use existing language
-                use_lang = str(self.file_data.loc[row, keys.LANGUAGE])
+            lang = df.loc[row, keys.LANGUAGE]
+            if pd.isna(lang) or lang == UNKNOWN:
+                lang = None
             else:
-                # auto detect
-                use_lang = lang_detection.detect_lang(
-                    text, search_langs, threshold=0.1)
+                lang = str(lang)
         except KeyError:  # column language still does not exists in file_data
-            use_lang = lang_detection.detect_lang(
-                text, search_langs, threshold=0.1)
+            lang = None
 
-        self.file_data.loc[row, keys.LANGUAGE] = use_lang
-        if use_lang == _UNKNOWN:
-            return False
+        return (row, raw_file, prep_file, root, pipeline, lang, origin_stopwords)
 
-        # process sample, part two
-        text = stops_removal.remove_stop_words(text, lang=use_lang)
-        text = stemming.stem(text, lang=use_lang)
+    def _collect_preparations(self, results: Iterable[Tuple[str, Optional[str], Optional[str]]], filecount: int) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        """
+        Gathers the results of the preprocessing while printing the progress.
 
-        # write cleaned file
-        ok = True
-        try:
-            with open(prep_file, 'wt') as prep:
-                prep.write(text)
-                self.file_data.loc[row, keys.PREP_FILE] = str(
-                    prep_file.relative_to(root))
-        except BaseException as be:
-            print()
-            print(f'cannot write {prep_file.name}:')
-            print(be)
-            print()
-            ok = False
-
-        return ok
-
-    def get_feature_labels(self, ngram_range: Tuple[int, int] = (1, 1)) -> Tuple[spmatrix, pd.Series, spmatrix, pd.Series]:
+        results:
+        The results as they come from '_prepare_unclean_sample'.
+
+        filecount:
+        Total number of files to be preprocessed.
+
+        returns:
+        The results as list.
+        """
+        collected = []
+        for counter, result in enumerate(results, start=1):
+            print(f'\rpreprocessing file {counter} of {filecount}:', end='')
+            collected.append(result)
+        return collected
+
+    def get_feature_labels(self, ngram_range: Tuple[int, int] = (1, 1), use_cache: bool = True) -> Tuple[spmatrix, pd.Series, spmatrix, pd.Series]:
+        """
+        Computes the feature matrices and the labels of the training and the test samples.
+
+        ngram_range (default (1,1)):
+        The ngram range passed to the TfidfVectorizer.
+
+        use_cache (default True):
+        Take the features of samples vectorized before from the feature cache of the project, and
+        vectorize just the new ones?
+
+        returns:
+        Training features, training labels, test features, and test labels.
+        """
+        cache = self.prj.get_feature_cache() if use_cache else None
         self.train_data = tools.get_features_labels(
-            self.vocab, self.train_samples, self.file_data, ngram_range=ngram_range)
+            self.vocab, self.train_samples, self.file_data, ngram_range=ngram_range, cache=cache)
         self.test_data = tools.get_features_labels(
-            self.vocab, self.test_samples, self.file_data, ngram_range=ngram_range)
+            self.vocab, self.test_samples, self.file_data, ngram_range=ngram_range, cache=cache)
         return (self.train_data[0], self.train_data[1], self.test_data[0], self.test_data[1])
 
     def load_training_project(self, name: str) -> pd.DataFrame:
@@ -382,14 +479,178 @@ class LookAround():
         self.read_training_index()
         return self.file_data
 
+    # _______________  actual data  _______________
+
+    def read_data_index(self) -> pd.DataFrame:
+        """
+        Reads the index of the data files, with the labels predicted so far.
+
+        returns:
+        The index of the data files.
+        """
+        return self.prj.read_data_index()
+
+    def rate_data(self, model: ModelWrapper, batch_size: int = 1000, ngram_range: Tuple[int, int] = (1, 1), backup_langs: List[str] = ['english'], workers: int = 1) -> int:
+        """
+        Rates the raw files in the data directory that are not listed in the index of the data files yet.
+        The files are processed in batches: each batch is preprocessed, vectorized with the active
+        vocabulary, and rated by the model, and then its rows are appended to the index of the data
+        files. Just one batch of texts and features is held in memory at a time, however large the
+        data directory is.
+
+        model:
+        The model that rates the files. It must have been trained on the active vocabulary.
+
+        batch_size (default 1000):
+        Number of files processed at a time.
+
+        ngram_range (default (1,1)):
+        The ngram range passed to the TfidfVectorizer. Must be the one the model was trained with.
+
+        backup_langs (default ['english']):
+        Languages used for the language detection if no default languages are configured.
+
+        workers (default 1):
+        Number of processes that preprocess the files of a batch in parallel.
+
+        returns:
+        The number of files that have been rated.
+        """
+        root = self.prj.data_dir
+        new_files, manifest = self.prj.find_new_data_files(
+            self.prj.read_data_index())
+        filecount = len(new_files)
+        if filecount == 0:
+            print('no new files')
+            self.prj.write_data_scan_manifest(manifest)
+            return 0
+
+        try:
+            use_langs = self.default_langs
+        except AttributeError:
+            use_langs = backup_langs
+        stopword_registry.warm_up(use_langs)
+        pipeline = DocumentPipeline(use_langs, threshold=0.1)
+
+        executor = None
+        if workers > 1:
+            cache_size = stemming.get_cache_info()['max_size']
+            executor = ProcessPoolExecutor(
+                max_workers=workers, initializer=stemming.set_cache_size, initargs=(cache_size,))
+
+        rated = 0
+        try:
+            for start in range(0, filecount, batch_size):
+                batch = new_files[start:start+batch_size]
+                rows, texts = self._prepare_data_batch(
+                    batch, root, pipeline, executor, workers)
+                if len(texts) > 0:
+                    features = tools.get_features(
+                        self.vocab, texts, ngram_range=ngram_range)
+                    rows.loc[texts.index, keys.PREDICTION] = model.predict(
+                        features)
+                    rows.loc[texts.index, keys.PREDICTED_BY] = model.name
+                self.prj.append_data_index_rows(rows)
+                rated += len(texts)
+                print(
+                    f'\rrated files {start + len(batch)} of {filecount}', end='')
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self.prj.write_data_scan_manifest(manifest)
+        print('\r')
+        print(f'Rated {rated} of {filecount} new files')
+        return rated
+
+    def _prepare_data_batch(self, batch: List[str], root: Path, pipeline: DocumentPipeline, executor: Optional[ProcessPoolExecutor], workers: int) -> Tuple[pd.DataFrame, pd.Series]:
+        """
+        Preprocesses a batch of raw data files and reads back the prepared texts.
+
+        batch:
+        The raw files, relative to 'root'.
+
+        root:
+        The data directory.
+
+        pipeline:
+        The pipeline the files are prepared with.
+
+        executor:
+        The worker processes, or None for preparing the files in this process.
+
+        workers:
+        Number of worker processes.
+
+        returns:
+        The rows of the batch for the index of the data files, without predictions yet, and the
+        prepared texts of those files that could be prepared.
+        """
+        rows = pd.DataFrame({keys.RAW_FILE: batch}, index=batch)
+        jobs = [self._make_preparation_job(row, rows, root, pipeline)
+                for row in rows.index]
+        if executor is not None:
+            chunksize = max(1, len(jobs) // (workers * 4))
+            results = list(executor.map(
+                _prepare_unclean_sample, *zip(*jobs), chunksize=chunksize))
+        else:
+            results = [_prepare_unclean_sample(*job) for job in jobs]
+        rows[keys.PREP_FILE] = [result[2] for result in results]
+        rows[keys.LANGUAGE] = [result[1] for result in results]
+        rows[keys.PREDICTION] = pd.NA
+        rows[keys.PREDICTED_BY] = pd.NA
+
+        file_names = rows[keys.PREP_FILE].dropna()
+        contents = packed_corpus.read_text_files(
+            [Path(root, file_name) for file_name in file_names])
+        texts = pd.Series(contents, index=file_names.index,
+                          dtype=object).dropna()
+        return (rows, texts)
+
     # _______________  present data  _______________
 
     def present_training_data(self):
         """
-        Presents the training data in a rating window.
+        Presents the training data in a rating window. The ratings are noted down in the rating journal
+        as they are given, and compacted into the sample file index when the window is closed.
         """
-        pres = Presenter(self.file_data, self.prj.training_dir)
+        # tkinter and the html widget are needed only from here on
+        from look_around.presenter.presenter import Presenter
+        pres = Presenter(self.file_data, self.prj.training_dir,
+                         journal=self.prj.get_rating_journal())
         pres.show()
+        self.file_data = self.prj.compact_rating_journal(self.file_data)
+
+    def present_uncertain_samples(self, model_name: str, method: str = 'entropy', ngram_range: Tuple[int, int] = (1, 1)) -> None:
+        """
+        Presents the unrated training samples in a rating window, the samples the model is most
+        uncertain about first. The order takes the ratings into account as they are given: the model is
+        updated in memory and the samples are scored anew in the background, if the model supports
+        updates. The model file remains unchanged.
+
+        model_name:
+        Name of a model in the model directory. It must have been trained on the active vocabulary.
+
+        method (default entropy):
+        How the uncertainty is measured: 'entropy', 'margin', or 'least confident'.
+
+        ngram_range (default (1,1)):
+        The ngram range the model has been trained with.
+        """
+        from look_around.presenter.presenter import Presenter
+        from look_around.presenter.active_order import ActiveOrder
+        model = self.prj.read_model(model_name)
+        texts = self.prj.read_unlabeled_samples(self.file_data)
+        features = self.prj.get_feature_cache().get_features(
+            self.vocab, texts, ngram_range=ngram_range)
+        order = ActiveOrder(model, features, texts.index, method=method)
+
+        pres = Presenter(self.file_data, self.prj.training_dir,
+                         journal=self.prj.get_rating_journal(), order=order)
+        pres.show()
+        # the model has been changed in memory, the next request shall load the file again
+        self.prj.model_registry.forget(model_name)
+        self.file_data = self.prj.compact_rating_journal(self.file_data)
 
     # _______________  scraper  _______________
 
@@ -406,13 +667,118 @@ class LookAround():
             print('Cannot scrape origin: no actions')
             return
 
-        scraper = SeleniumScraper(base_url, browser)
-        scraper.register_page_handler('print_handler', PrintHandler())
-        scraper.run(actions)
+        # selenium is imported only when scraping
+        from look_around.scraper.selenium_scraper import SeleniumScraper
+        from look_around.scraper.rate_limiter import HostRateLimiter
+        scraper = SeleniumScraper(
+            base_url, browser, rate_limiter=HostRateLimiter())
+        storage = []
+        dedup = self.prj.get_dedup_index(
+            self.training_mode) if self.prj is not None else None
+        for name, handler in self._make_page_handlers(origin, storage, dedup).items():
+            scraper.register_page_handler(name, handler)
+        try:
+            scraper.run(actions)
+        finally:
+            for handler in storage:
+                handler.close()
+            self._merge_stored_pages(storage)
+
+    def scrape_all_origins(self, max_sessions: int = 2, requests_per_second: float = 1.0) -> Dict[str, bool]:
+        """
+        Scrapes all configured origins, several at the same time on a pool of headless browser
+        sessions. Origins on the same host are scraped one after the other, and the requests to
+        each host are limited to a polite rate.
+
+        max_sessions (default 2):
+        Maximum number of browser sessions open at the same time.
+
+        requests_per_second (default 1.0):
+        Requests sent to a single host per second at most, after a short burst.
+
+        returns:
+        By origin, whether it has been scraped without being aborted.
+        """
+        # selenium is imported only when scraping
+        from look_around.scraper.origin_scheduler import OriginScheduler
+        from look_around.scraper.session_pool import SessionPool
+        from look_around.scraper.rate_limiter import HostRateLimiter
+
+        pool = SessionPool(self.browser, max_sessions=max_sessions)
+        storage = []
+        # one dedup index for all origins, as the same posting is often listed on several sites
+        dedup = self.prj.get_dedup_index(
+            self.training_mode) if self.prj is not None else None
+        scheduler = OriginScheduler(
+            pool, self.browser, lambda origin: self._make_page_handlers(origin, storage, dedup),
+            rate_limiter=HostRateLimiter(requests_per_second))
+        try:
+            return scheduler.run(self.origins)
+        finally:
+            pool.close()
+            for handler in storage:
+                handler.close()
+            self._merge_stored_pages(storage)
+
+    def _merge_stored_pages(self, storage: List) -> None:
+        """
+        Adds the samples the storage handlers have appended to the training files index on disk to the
+        sample file index in memory. Otherwise, the next time the entire index is written, the stored
+        samples would be dropped.
+
+        storage:
+        The storage handlers, already closed.
+        """
+        if len(storage) == 0 or not self.training_mode:
+            return
+        try:
+            file_data = self.file_data
+        except AttributeError:
+            # not read yet, so it is read from disk with the stored samples anyway
+            return
+
+        stored = self.prj.read_training_index()
+        new = stored.index.difference(file_data.index)
+        if len(new) == 0:
+            return
+        if len(file_data) == 0:
+            self.file_data = stored.loc[new]
+        else:
+            self.file_data = pd.concat([file_data, stored.loc[new]])
+
+    def _make_page_handlers(self, origin: Dict, storage: List, dedup=None) -> Dict:
+        """
+        Creates the page handlers for scraping the origin. With a project open, the pages are stored
+        in the training or data directory, depending on the mode. Duplicates of known samples are not
+        stored.
+
+        origin:
+        The configuration of the origin.
+
+        storage:
+        Storage handlers created are appended, so they can be closed when scraping is done.
+
+        dedup (default None):
+        The dedup index the pages are checked against. Every page is stored if None.
+
+        returns:
+        The page handlers by name.
+        """
+        from look_around.scraper.page_handlers.print_handler import PrintHandler
+        handlers = {'print_handler': PrintHandler()}
+        if self.prj is not None:
+            from look_around.scraper.page_handlers.storage_handler import StorageHandler
+            name = str(origin.get('origin', origin['base_url']))
+            handler = StorageHandler(
+                self.prj, name, training=self.training_mode, dedup=dedup)
+            storage.append(handler)
+            handlers['storage_handler'] = handler
+        return handlers
 
     # _______________  misc  _______________
 
     def make_dev_project(self, size: int, name: str) -> Project:
+        from look_around.run import run_dev
         self.prj = run_dev.create_dev_project(size, name, self.home_path)
         return self.prj
 
@@ -424,20 +790,37 @@ class LookAround():
     def is_in_training_mode(self) -> bool:
         return self.training_mode
 
-    def _get_origin_stopwords(self, name: str) -> List[str]:
+    def _get_index_format(self) -> Optional[str]:
         """
-        Gets the stopword list of the given origin from the configuration.
+        returns:
+        The configured storage of the sample file index, or None if not configured.
+        """
+        try:
+            return self.index_format
+        except AttributeError:
+            return None
+
+    def _get_origin_stopwords(self, name: str) -> FrozenSet[str]:
+        """
+        Gets the stopword list of the given origin from the configuration. The list is put into the
+        stopword registry, so the configuration is searched just once per origin.
 
         name:
         Name of the origin.
 
         returns:
-        The list of stopwords for this origin, or empty list if no origin of the given name is found.
+        The set of stopwords for this origin, or an empty set if no origin of the given name is found.
 
         raises KeyError:
         When a json object of an origin does not have a name key (indicates a misconfiguration). Or when the
         json object of the correct origin does not have a stopword list (indicates a misconfiguration, too).
         """
+        key = f'{_ORIGIN}:{name}'
+        try:
+            return stopword_registry.get_registered(key)
+        except KeyError:
+            pass
+
         for origin in self.origins:
             # get name (might missing due to misconfiguration, raising an error then)
             oname = origin['origin']
@@ -447,6 +830,67 @@ class LookAround():
             # now we have the coorect json object with name == oname
             # get list (might be missing due to misconfiguration, raising an error in this case)
             list = origin['stopwords']
-            return list
+            return stopword_registry.register_stopwords(key, list)
+
+        return frozenset()
+
 
-        return []
+def _prepare_unclean_sample(row: str, raw_file: Path, prep_file: Path, root: Path, pipeline: DocumentPipeline, lang: Optional[str], origin_stopwords: FrozenSet[str]) -> Tuple[str, Optional[str], Optional[str]]:
+    """
+    Preprocesses a single raw sample file and writes the prepared text. This function does not touch
+    the sample file index, so it can run in a worker process.
+
+    row:
+    Index of the sample in the sample file index.
+
+    raw_file:
+    The raw sample file.
+
+    prep_file:
+    The file the prepared text is written to.
+
+    root:
+    The training directory or the data directory.
+
+    pipeline:
+    The pipeline the sample is prepared with.
+
+    lang:
+    The language of the sample, or None if it is yet to be detected.
+
+    origin_stopwords:
+    Origin specific stop words that are removed in addition to the language specific ones.
+
+    returns:
+    The row, the language of the sample, and the path of the prepared file relative to 'root'. The
+    path is None if no prepared file has been written. The language is the one passed in if the raw
+    file could not be read.
+    """
+    try:
+        with open(raw_file, 'rt') as raw:
+            lines = [line.strip() for line in raw.readlines()]
+            # join by space prevents two words merging into one
+            text = ' '.join(lines)
+    except BaseException as be:
+        print(f'cannot read raw sample file {str(raw_file)}:')
+        print(be)
+        # the sample file index is left as it is
+        return (row, lang, None)
+
+    lang, words = pipeline.process(
+        text, lang=lang, origin_stopwords=origin_stopwords)
+    if words is None:
+        return (row, lang, None)
+
+    # write cleaned file
+    try:
+        with open(prep_file, 'wt') as prep:
+            prep.write(' '.join(words))
+    except BaseException as be:
+        print()
+        print(f'cannot write {prep_file.name}:')
+        print(be)
+        print()
+        return (row, lang, None)
+
+    return (row, lang, str(prep_file.relative_to(root)))
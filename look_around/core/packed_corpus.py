@@ -0,0 +1,173 @@
+import mmap
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from look_around.tools import keys
+
+_OFFSET = 'offset'
+"""Column in the offset table: position of the first byte of a text in the corpus file."""
+_LENGTH = 'length'
+"""Column in the offset table: number of bytes of a text in the corpus file."""
+_MTIME = 'mtime_ns'
+"""Column in the offset table: modification time of the prepared file when packed, in nanoseconds."""
+_SIZE = 'size'
+"""Column in the offset table: size of the prepared file when packed."""
+
+
+def _stat_files(paths: List[Path]) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """
+    returns:
+    The modification times in nanoseconds and the sizes of the files, or -1 for files that cannot be found.
+    """
+    mtimes = np.full(len(paths), -1, dtype=np.int64)
+    sizes = np.full(len(paths), -1, dtype=np.int64)
+    for pos, path in enumerate(paths):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        mtimes[pos] = stat.st_mtime_ns
+        sizes[pos] = stat.st_size
+    return (mtimes, sizes)
+
+
+def read_text_files(paths: List[Path], workers: int = 8) -> List[Optional[str]]:
+    """
+    Reads the stripped content of many small text files with a pool of threads. A file that cannot
+    be read is skipped with a message.
+
+    paths:
+    The files.
+
+    workers (default 8):
+    Number of threads reading files at the same time.
+
+    returns:
+    The contents, in the order of 'paths'. None for each file that could not be read.
+    """
+    contents: List[Optional[str]] = [None] * len(paths)
+    if len(paths) == 0:
+        return contents
+
+    def read(pos: int) -> None:
+        try:
+            with open(paths[pos], 'rt') as file:
+                contents[pos] = file.read().strip()
+        except BaseException as be:
+            print(f'SKIPPING FILE {paths[pos]}')
+            print(be)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        # consume the iterator for waiting until all files are read
+        for _ in executor.map(read, range(len(paths))):
+            pass
+    return contents
+
+
+class PackedCorpus():
+    """
+    All prepared texts in a single file, along with an offset table. The table lists, for each sample,
+    the prepared file the text originates from and where the text is located within the corpus file.
+    Loading the texts from the corpus saves opening every single prepared file.
+
+    The corpus is a snapshot. Texts of samples that have been prepared after packing are not in
+    there, and are read from their prepared files instead. So are texts whose prepared file has been
+    written again since, which the table tells by the modification time and size of the file.
+    """
+
+    corpus_path: Path
+    """The file with the concatenated, utf-8 encoded texts."""
+    table_path: Path
+    """The csv file with the offset table."""
+    files_dir: Path
+    """The directory the names of the prepared files are relative to."""
+
+    def __init__(self, corpus_path: Path, table_path: Path, files_dir: Path) -> None:
+        self.corpus_path = corpus_path
+        self.table_path = table_path
+        self.files_dir = files_dir
+
+    def exists(self) -> bool:
+        """
+        returns:
+        True if both the corpus file and the offset table exist.
+        """
+        return self.corpus_path.is_file() and self.table_path.is_file()
+
+    def write(self, texts: pd.Series, file_names: pd.Series) -> None:
+        """
+        Writes the texts into the corpus file, replacing the previous corpus. The prepared files are
+        noted down as they are now, so the texts should just have been read from them.
+
+        texts:
+        The prepared texts, indexed like the sample file index.
+
+        file_names:
+        The prepared files the texts have been read from, with the same index as 'texts'.
+        """
+        offsets = []
+        lengths = []
+        position = 0
+        tmp_corpus = Path(self.corpus_path.parent,
+                          self.corpus_path.name + '.tmp')
+        with open(tmp_corpus, 'wb') as file:
+            for text in texts:
+                data = text.encode('utf-8')
+                file.write(data)
+                offsets.append(position)
+                lengths.append(len(data))
+                position += len(data)
+
+        packed_names = file_names.loc[texts.index]
+        mtimes, sizes = _stat_files([Path(self.files_dir, name)
+                                     for name in packed_names])
+        table = pd.DataFrame({keys.PREP_FILE: packed_names.values, _OFFSET: offsets, _LENGTH: lengths,
+                              _MTIME: mtimes, _SIZE: sizes}, index=texts.index)
+        tmp_table = Path(self.table_path.parent, self.table_path.name + '.tmp')
+        table.to_csv(tmp_table, index=True)
+
+        # without the table, the corpus is ignored. So an interruption never leaves
+        # a table that points into the wrong corpus
+        self.table_path.unlink(missing_ok=True)
+        tmp_corpus.replace(self.corpus_path)
+        tmp_table.replace(self.table_path)
+
+    def read(self, file_names: pd.Series) -> Tuple[pd.Series, pd.Series]:
+        """
+        Takes the texts of the given prepared files from the corpus. A text is taken only if the offset
+        table lists the same prepared file for the sample, and if that file has not changed since packing.
+
+        file_names:
+        The prepared files, indexed like the sample file index.
+
+        returns:
+        The texts found in the corpus, and the prepared files of those samples that are not in the corpus.
+        """
+        table = pd.read_csv(self.table_path, index_col=0)
+        if _MTIME not in table.columns or _SIZE not in table.columns:
+            # packed before the files were noted down, nothing can be trusted
+            return (pd.Series([], dtype=object), file_names)
+        common = file_names.index.intersection(table.index)
+        same = table.loc[common, keys.PREP_FILE].astype(
+            str).values == file_names.loc[common].astype(str).values
+        found = common[same]
+        mtimes, sizes = _stat_files([Path(self.files_dir, str(name))
+                                     for name in file_names.loc[found]])
+        unchanged = (table.loc[found, _MTIME].values == mtimes) & (
+            table.loc[found, _SIZE].values == sizes)
+        found = found[unchanged]
+
+        starts = table.loc[found, _OFFSET].values
+        ends = starts + table.loc[found, _LENGTH].values
+        texts = [''] * len(found)
+        if len(found) > 0 and self.corpus_path.stat().st_size > 0:
+            # just the pages holding the requested texts are read, in the order they are stored
+            with open(self.corpus_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                for pos in np.argsort(starts, kind='stable'):
+                    texts[pos] = data[starts[pos]:ends[pos]].decode('utf-8')
+
+        missing = file_names.drop(found)
+        return (pd.Series(texts, index=found, dtype=object), missing)
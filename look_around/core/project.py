@@ -1,15 +1,23 @@
 from pathlib import Path
+from collections import Counter
+import json
+from threading import Lock
+import os
 import numpy as np
 import numpy.typing as npt
 import look_around.dev_tools.utils as utils
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 import pandas as pd
 from look_around.tools import keys, tools
 from look_around.models.model_wrapper import ModelWrapper
-from tensorflow.keras.models import load_model
-from look_around.models.tfkeras_model import TfKerasModel
-from look_around.models.sklearn_model import SklearnModel
-from joblib import load
+from look_around.models.model_registry import ModelRegistry
+from look_around.core.index_store import DATA_SCHEMA, TRAINING_SCHEMA, SqliteIndexStore
+from look_around.core import packed_corpus
+from look_around.core.packed_corpus import PackedCorpus
+from look_around.core.dedup_index import DedupIndex
+from look_around.core.rating_journal import RatingJournal
+from look_around.doc_process.html_cleaning import html_to_words
+from look_around.tools.feature_cache import FeatureCache
 
 _train_dir = 'training'
 """Directory for the training data."""
@@ -19,9 +27,33 @@ _data_dir = 'data'
 """Directory for the data that is actually analyzed."""
 _doc_index = 'document_index.csv'
 """File name of the list of properties of the samples."""
+_doc_index_db = 'document_index.sqlite'
+"""File name of the list of properties of the samples when stored in a database."""
+_migrated_suffix = '.migrated'
+"""Appended to the name of the csv index once it has been migrated into the database."""
+INDEX_CSV = 'csv'
+"""The sample file index is kept in a csv file."""
+INDEX_SQLITE = 'sqlite'
+"""The sample file index is kept in an SQLite database."""
 _chars = np.array(
     list('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'))
 _model_index = 'model_index.csv'
+_scan_manifest = 'scan_manifest.json'
+"""File name of the modification times of the subdirectories at the last scan for new files."""
+_corpus = 'prepared_corpus.txt'
+"""File name of the packed texts of the prepared files."""
+_corpus_table = 'prepared_corpus_offsets.csv'
+"""File name of the offset table of the packed texts."""
+_feature_cache_dir = 'feature_cache'
+"""Directory for the cached feature matrices."""
+_rating_journal = 'rating_journal.jsonl'
+"""File name of the journal of ratings not compacted into the sample file index yet."""
+_dedup_index = 'dedup_index.sqlite'
+"""File name of the fingerprints of the samples, for recognizing duplicates."""
+_training_columns = list(TRAINING_SCHEMA.keys())
+"""Columns of the training files index."""
+_data_columns = list(DATA_SCHEMA.keys())
+"""Columns of the index of the data files."""
 
 
 class Project():
@@ -37,10 +69,23 @@ class Project():
     data_dir: Path
     """Directory with the data actually ised for predictions"""
     sample_counter: int
+    _id_lock: Lock
+    """Sample ids may be created by several scrapers at the same time."""
+    _index_lock: Lock
+    """Several scrapers may append to the same file index at the same time. Also guards creating the rating journal."""
+    _journal: Optional[RatingJournal]
+    """The rating journal, created on first use."""
     rand = np.random.Generator
     name: str
+    model_registry: ModelRegistry
+    """Hands out the models of the model directory, keeping the recently used ones in memory."""
+    index_format: Optional[str]
+    """
+    How the sample file index is stored, either 'csv' or 'sqlite'. If None, the database is used if it
+    exists and the csv file otherwise.
+    """
 
-    def __init__(self, name: str, parent: Path) -> None:
+    def __init__(self, name: str, parent: Path, index_format: Optional[str] = None) -> None:
         # TODO: check if writable / for already existing
         self.name = name
         self.root_dir = Path(parent.absolute(), name)
@@ -49,6 +94,11 @@ class Project():
         self.data_dir = Path(self.root_dir, _data_dir)
         self.sample_counter = 0
         self.rand = np.random.default_rng()
+        self.index_format = index_format
+        self.model_registry = ModelRegistry(self.model_dir)
+        self._id_lock = Lock()
+        self._index_lock = Lock()
+        self._journal = None
 
     def make_missing_dirs(self) -> None:
         """
@@ -71,11 +121,13 @@ class Project():
         end in. Appended to that dir name, divided by the path division symbol, is
         the id.
         """
-        self.sample_counter += 1
+        with self._id_lock:
+            self.sample_counter += 1
+            counter = self.sample_counter
+            id = ''.join(utils.pick_several_from_array(_chars, 6))
 
-        id = ''.join(utils.pick_several_from_array(_chars, 6))
-        id = '_'.join([id, str(self.sample_counter)])
-        dir = str(self.sample_counter//300)
+        id = '_'.join([id, str(counter)])
+        dir = str(counter//300)
         if len(dir) < 4:
             dir = ''.join([str(0) for _ in range(4-len(dir))]) + dir
 
@@ -110,35 +162,165 @@ class Project():
 
     def write_training_index(self, file_data: pd.DataFrame) -> None:
         """
-        Writes the training files index as csv to the disk.
+        Writes the entire training files index to the disk, as csv or into the database.
 
         file_data:
         Index list of sample files ffor training.
         """
-        full_path = Path(self.training_dir, _doc_index)
-        file_data.to_csv(full_path, index=True)
+        store = self._get_training_index_store()
+        if store is not None:
+            store.write(file_data)
+        else:
+            full_path = Path(self.training_dir, _doc_index)
+            file_data.to_csv(full_path, index=True)
+
+    def write_training_index_rows(self, file_data: pd.DataFrame, rows: Iterable) -> None:
+        """
+        Writes the given rows of the training files index to the disk. When the index is kept in the
+        database, just these rows are inserted or updated. Only the database is written incrementally:
+        the csv file has no way of updating a row in place, so it is rewritten entirely.
+
+        file_data:
+        Index list of sample files for training.
+
+        rows:
+        Index values of the rows that have been added or modified.
+        """
+        store = self._get_training_index_store()
+        if store is not None:
+            store.upsert(file_data, rows)
+        else:
+            self.write_training_index(file_data)
 
     def read_training_index(self) -> pd.DataFrame:
         """
         Reads the training files index from disk. Does not take care of I/O errors!
 
+        If the index is to be kept in the database but only the csv file exists, the csv file is
+        migrated into the database and renamed afterwards. Ratings left in the rating journal are
+        compacted into the index.
+
         returns:
         Index list of sample data for training. A new, empty one is created if the file
         does not exist.
         """
         full_path = Path(self.training_dir, _doc_index)
-        if full_path.exists():
+        store = self._get_training_index_store()
+        if store is not None:
+            if not store.exists() and full_path.exists():
+                store.write(pd.read_csv(full_path, index_col=0))
+                full_path.rename(
+                    Path(full_path.parent, full_path.name + _migrated_suffix))
+            file_data = store.read()
+        elif full_path.exists():
             file_data = pd.read_csv(full_path, index_col=0)
         else:
-            file_data = pd.DataFrame(
-                [], columns=[keys.RAW_FILE, keys.PREP_FILE, keys.ORIGIN, keys.LANGUAGE, keys.RATING, keys.LABELED_BY, keys.USAGE])
+            file_data = pd.DataFrame([], columns=_training_columns)
+        return self.compact_rating_journal(file_data)
+
+    def get_rating_journal(self) -> RatingJournal:
+        """
+        returns:
+        The journal the ratings of the training samples are noted down in. Always the same instance,
+        so that recording and compacting are serialized.
+        """
+        with self._index_lock:
+            if self._journal is None:
+                self._journal = RatingJournal(
+                    Path(self.training_dir, _rating_journal))
+            return self._journal
+
+    def get_dedup_index(self, training: bool = True, workers: int = 8) -> DedupIndex:
+        """
+        Gets the fingerprints of the samples. On first use, the raw files already in the directory are added,
+        so that pages collected before are recognized as well.
+
+        training (default True):
+        Get the index of the training directory? Otherwise, the index of the data directory is returned.
+
+        workers (default 8):
+        Number of threads reading the raw files when adding them.
+
+        returns:
+        The fingerprints of the samples, identified by their raw files.
+        """
+        modedir = self.training_dir if training else self.data_dir
+        dedup = DedupIndex(Path(modedir, _dedup_index))
+        if not dedup.is_seeded():
+            raw_files = [str(file.relative_to(modedir)) for file in sorted(modedir.glob('*/*.htm*'))
+                         if file.suffix in ['.html', '.htm'] and file.is_file()]
+            contents = packed_corpus.read_text_files(
+                [Path(modedir, name) for name in raw_files], workers=workers)
+            added = dedup.seed([(name, html_to_words(content)) for name, content in zip(raw_files, contents)
+                                if content is not None])
+            if added > 0:
+                print(f'added {added} known samples to the dedup index')
+        return dedup
+
+    def compact_rating_journal(self, file_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Applies the ratings of the rating journal to the sample file index, writes the changed rows,
+        and empties the journal. The latest rating of a sample wins. Ratings of samples not listed in
+        the index are dropped.
+
+        file_data:
+        The sample file index.
+
+        returns:
+        The sample file index with the ratings applied.
+        """
+        journal = self.get_rating_journal()
+        with journal.compacting() as ratings:
+            if len(ratings) == 0:
+                return file_data
+
+            ratings = ratings[~ratings.index.duplicated(keep='last')]
+            ratings = ratings.loc[ratings.index.isin(
+                file_data.index.astype(str))]
+            if len(ratings) > 0:
+                # the journal knows the samples by their index as string
+                rows = file_data.index[file_data.index.astype(
+                    str).isin(ratings.index)]
+                as_str = rows.astype(str)
+                file_data.loc[rows, keys.RATING] = ratings.loc[as_str,
+                                                               keys.RATING].values.astype(float)
+                file_data.loc[rows, keys.LABELED_BY] = ratings.loc[as_str,
+                                                                   keys.LABELED_BY].values
+                self.write_training_index_rows(file_data, rows)
+        print(f'compacted {len(ratings)} ratings into the index')
         return file_data
 
+    def _get_training_index_store(self) -> Optional[SqliteIndexStore]:
+        """
+        returns:
+        The database of the training files index, or None if the index is kept in a csv file.
+        """
+        return self._get_index_store(self.training_dir, TRAINING_SCHEMA)
+
+    def _get_index_store(self, modedir: Path, schema: Dict[str, str]) -> Optional[SqliteIndexStore]:
+        """
+        modedir:
+        The training directory or the data directory.
+
+        schema:
+        The typed columns of the file index in 'modedir'.
+
+        returns:
+        The database of the file index in 'modedir', or None if the index is kept in a csv file.
+        """
+        store = SqliteIndexStore(Path(modedir, _doc_index_db), schema)
+        if self.index_format == INDEX_SQLITE or (self.index_format is None and store.exists()):
+            return store
+        return None
+
     def update_training_index(self, file_data: pd.DataFrame, write_on_update: bool = True) -> pd.DataFrame:
         """
         Looks for .html and .htm files in the training directory that have not been added to
         the sample file index yet. The files found become listed in the index.
 
+        Subdirectories that have neither been modified since the last scan nor lost files from the
+        index are skipped.
+
         file_data:
         The sample file index.
 
@@ -148,31 +330,72 @@ class Project():
         returns:
         The sample file index.
         """
-        counter = 0
-        for subdir in self.training_dir.iterdir():
-            if subdir.is_file():
-                continue
-
-            new_files = self._update_training_directory(
-                file_data, subdir, self.training_dir)
-            counter += len(new_files)
-            file_data = pd.concat([file_data]+new_files)
-        if counter > 0:
-            print(f'added {counter} files')  # TODO: localize info message
+        file_data, added, manifest = self._scan_for_new_files(
+            file_data, self.training_dir)
+        if len(added) > 0:
+            print(f'added {len(added)} files')  # TODO: localize info message
             if write_on_update:
-                self.write_training_index(file_data)
+                self.write_training_index_rows(file_data, added)
+                self._write_scan_manifest(self.training_dir, manifest)
         else:
             print('no new files')
+            self._write_scan_manifest(self.training_dir, manifest)
         return file_data
 
-    def _update_training_directory(self, file_data: pd.DataFrame, subdir: Path, modedir: Path) -> List[pd.DataFrame]:
+    def _scan_for_new_files(self, file_data: pd.DataFrame, modedir: Path) -> Tuple[pd.DataFrame, List[str], Dict[str, List[int]]]:
         """
-        Browses the 'subdir' for .htm and .html files. For any file found, it is checked if the
-        file is listed in the sample file index. If not, the file is added.
+        Browses the subdirectories of 'modedir' for files not listed in the sample file index yet.
+
+        A subdirectory is skipped if its modification time and its number of html files, as noted in
+        the scan manifest, are unchanged, and if the index still lists that many files of the subdirectory.
 
         file_data:
         The sample file index.
 
+        modedir:
+        The training directory or the data directory.
+
+        returns:
+        The sample file index with the new files appended, the index values of the new rows, and the
+        updated scan manifest.
+        """
+        known = set(file_data[keys.RAW_FILE].dropna().astype(str))
+        known_per_dir = Counter(path.split(os.sep, 1)[0] for path in known)
+        manifest = self._read_scan_manifest(modedir)
+
+        added: List[str] = []
+        new_manifest: Dict[str, List[int]] = {}
+        for subdir in modedir.iterdir():
+            if subdir.is_file():
+                continue
+
+            mtime = subdir.stat().st_mtime_ns
+            try:
+                last_mtime, last_count = manifest[subdir.name]
+                if last_mtime == mtime and last_count == known_per_dir[subdir.name]:
+                    new_manifest[subdir.name] = [last_mtime, last_count]
+                    continue
+            except (KeyError, TypeError, ValueError):
+                pass  # not scanned before or garbled entry
+
+            new_files, count = self._update_training_directory(
+                known, subdir, modedir)
+            added += new_files
+            new_manifest[subdir.name] = [mtime, count]
+
+        if len(added) > 0:
+            new_data = pd.DataFrame({keys.RAW_FILE: added}, index=added)
+            file_data = pd.concat([file_data, new_data])
+        return (file_data, added, new_manifest)
+
+    def _update_training_directory(self, known: Set[str], subdir: Path, modedir: Path) -> Tuple[List[str], int]:
+        """
+        Browses the 'subdir' for .htm and .html files. For any file found, it is checked if the
+        file is listed in the sample file index.
+
+        known:
+        The raw files already listed in the sample file index.
+
         subdir:
         The directory in that new files are looked for.
 
@@ -180,22 +403,145 @@ class Project():
         The training directory or the data directory.
 
         returns:
-        Single row data frames that can be appended to the file index. One row per new entry.
+        The paths, relative to 'modedir', of the files not listed yet, and the number of html files in
+        'subdir' in total.
         """
         new_files = []
+        count = 0
         for file in subdir.glob('*.htm*'):
-            if not file.is_file():
-                continue
             if not file.suffix == '.html' and not file.suffix == '.htm':
                 continue
+            if not file.is_file():
+                continue
 
+            count += 1
             file_path = str(file.relative_to(modedir))
-            idx = file_data[keys.RAW_FILE] == file_path
-            if not idx.any():
-                df = pd.DataFrame(
-                    {keys.RAW_FILE: file_path}, index=[file_path])
-                new_files.append(df)
-        return new_files
+            if file_path not in known:
+                new_files.append(file_path)
+        return (new_files, count)
+
+    def _read_scan_manifest(self, modedir: Path) -> Dict[str, List[int]]:
+        """
+        Reads the scan manifest of the training directory or the data directory.
+
+        returns:
+        Modification time in nanoseconds and number of html files of each subdirectory at the last scan.
+        Empty if the manifest is missing or cannot be read.
+        """
+        full_path = Path(modedir, _scan_manifest)
+        try:
+            with open(full_path, 'rt') as file:
+                manifest = json.load(file)
+            if isinstance(manifest, dict):
+                return manifest
+        except BaseException:
+            pass
+        return {}
+
+    def _write_scan_manifest(self, modedir: Path, manifest: Dict[str, List[int]]) -> None:
+        """
+        Writes the scan manifest of the training directory or the data directory. Failing to write
+        the manifest just causes a full scan next time, so errors are only printed.
+        """
+        full_path = Path(modedir, _scan_manifest)
+        try:
+            with open(full_path, 'wt') as file:
+                json.dump(manifest, file)
+        except BaseException as be:
+            print('could not write the scan manifest')
+            print(be)
+
+    def read_data_index(self) -> pd.DataFrame:
+        """
+        Reads the index of the data files, which lists the raw and prepared files in the data directory
+        along with the predicted labels. Does not take care of I/O errors!
+
+        returns:
+        Index list of the data files. A new, empty one is created if the file does not exist.
+        """
+        full_path = Path(self.data_dir, _doc_index)
+        store = self._get_index_store(self.data_dir, DATA_SCHEMA)
+        if store is not None:
+            data_index = store.read()
+        elif full_path.exists():
+            data_index = pd.read_csv(full_path, index_col=0)
+        else:
+            data_index = pd.DataFrame([], columns=_data_columns)
+        return data_index
+
+    def append_data_index_rows(self, rows: pd.DataFrame) -> None:
+        """
+        Adds the rows to the index of the data files on disk. The rows already written are not
+        rewritten, so the cost depends on the number of new rows only.
+
+        rows:
+        The new rows, indexed by the raw file.
+        """
+        self._append_index_rows(self.data_dir, rows, DATA_SCHEMA)
+
+    def append_training_index_rows(self, rows: pd.DataFrame) -> None:
+        """
+        Adds the rows to the training files index on disk, without rewriting the rows already written.
+        A sample file index held in memory does not know about these rows. It must be read again or
+        merged with the rows before it is written entirely, or the rows are lost.
+
+        rows:
+        The new rows, indexed by the raw file.
+        """
+        self._append_index_rows(self.training_dir, rows, TRAINING_SCHEMA)
+
+    def _append_index_rows(self, modedir: Path, rows: pd.DataFrame, schema: Dict[str, str]) -> None:
+        """
+        Adds the rows to the file index in 'modedir', by an insert into the database or by appending to
+        the csv file.
+
+        schema:
+        The typed columns of the file index, which are also the columns of a csv file that does not exist yet.
+        """
+        if len(rows) == 0:
+            return
+        # one append at a time, otherwise two writers may both create the csv file with a header
+        with self._index_lock:
+            store = self._get_index_store(modedir, schema)
+            if store is not None:
+                store.upsert(rows)
+                return
+
+            full_path = Path(modedir, _doc_index)
+            columns = list(schema.keys())
+            if full_path.exists():
+                # keep the column order of the existing file
+                columns = pd.read_csv(full_path, index_col=0, nrows=0).columns
+                rows.reindex(columns=columns).to_csv(
+                    full_path, mode='a', header=False, index=True)
+            else:
+                rows.reindex(columns=columns).to_csv(full_path, index=True)
+
+    def find_new_data_files(self, data_index: pd.DataFrame) -> Tuple[List[str], Dict[str, List[int]]]:
+        """
+        Looks for .html and .htm files in the data directory that are not listed in the index of the
+        data files. The index is not modified. Once the files have been added to the index, the returned
+        scan manifest should be passed to 'write_data_scan_manifest', so that unchanged subdirectories
+        are skipped next time.
+
+        data_index:
+        The index of the data files.
+
+        returns:
+        The paths of the new files relative to the data directory, and the updated scan manifest.
+        """
+        _, added, manifest = self._scan_for_new_files(
+            data_index, self.data_dir)
+        return (added, manifest)
+
+    def write_data_scan_manifest(self, manifest: Dict[str, List[int]]) -> None:
+        """
+        Writes the scan manifest of the data directory.
+
+        manifest:
+        The scan manifest as returned by 'find_new_data_files'.
+        """
+        self._write_scan_manifest(self.data_dir, manifest)
 
     def read_train_samples(self, file_data: pd.DataFrame) -> pd.Series:
         """
@@ -223,10 +569,11 @@ class Project():
         """
         return self._read_training_samples(keys.TEST, file_data)
 
-    def _read_training_samples(self, usage: str, file_data: pd.DataFrame) -> pd.Series:
+    def _read_training_samples(self, usage: str, file_data: pd.DataFrame, workers: int = 8) -> pd.Series:
         """
         Reads the training samples. A file is skipped if an I/O error occurs while the
-        file is read.
+        file is read. Texts present in the packed corpus are taken from there, the other
+        files are read by a pool of threads.
 
         usage:
         Read files of this usage.
@@ -234,6 +581,9 @@ class Project():
         file_data:
         The data frame indexing the sample files.
 
+        workers (default 8):
+        Number of threads reading the files.
+
         returns:
         List of training samples. The indices refers to the index in *file_data*.
         """
@@ -241,23 +591,97 @@ class Project():
         # get training samples with labels
         usage_idx = file_data[keys.USAGE] == usage
         label_idx = file_data[keys.RATING].notna()
-        idx = usage_idx & label_idx
+        return self._read_samples(usage_idx & label_idx, file_data, workers=workers)
+
+    def read_unlabeled_samples(self, file_data: pd.DataFrame, workers: int = 8) -> pd.Series:
+        """
+        Reads the prepared texts of the samples that have not been rated yet. A file is skipped if an
+        I/O error occurs while the file is read.
+
+        file_data:
+        The data frame indexing the sample files.
+
+        workers (default 8):
+        Number of threads reading the files.
+
+        returns:
+        The texts. The indices refer to the index in *file_data*.
+        """
+        idx = file_data[keys.RATING].isna() & file_data[keys.PREP_FILE].notna()
+        return self._read_samples(idx, file_data, workers=workers)
+
+    def _read_samples(self, idx: pd.Series, file_data: pd.DataFrame, workers: int = 8) -> pd.Series:
+        """
+        Reads the prepared texts of the selected samples. Texts present in the packed corpus are taken
+        from there, the other files are read by a pool of threads.
+
+        idx:
+        Boolean selection of the samples in *file_data*.
+
+        file_data:
+        The data frame indexing the sample files.
+
+        workers (default 8):
+        Number of threads reading the files.
+
+        returns:
+        The texts, in the order of *file_data*.
+        """
         file_names = file_data.loc[idx, keys.PREP_FILE].dropna()
 
-        contents: List[pd.Series] = []
-        for idx in file_names.index:
-            file_name = file_names.loc[idx]
-            full_path = Path(self.training_dir, file_name)
-            try:
-                with open(full_path, 'rt') as file:
-                    content = file.read().strip()
-                    data = pd.Series(content, index=[idx])
-                    contents.append(data)
-            except BaseException as be:
-                print(f'SKIPPING FILE {file_name}')
-                print(be)
+        # take what is there from the packed corpus, read the remaining files
+        corpus = self._get_packed_corpus()
+        if corpus.exists():
+            packed, file_names = corpus.read(file_names)
+        else:
+            packed = pd.Series([], dtype=object)
 
-        return pd.concat(contents)
+        paths = [Path(self.training_dir, file_name)
+                 for file_name in file_names]
+        contents = packed_corpus.read_text_files(paths, workers=workers)
+        loaded = pd.Series(contents, index=file_names.index, dtype=object)
+
+        samples = pd.concat([packed, loaded])
+        return samples.reindex(idx.index[idx]).dropna()
+
+    def pack_training_samples(self, file_data: pd.DataFrame, workers: int = 8) -> int:
+        """
+        Packs the texts of all prepared training files into a single corpus file with an offset table.
+        Afterwards, reading the training and test samples takes the texts from the corpus file rather
+        than from the many small prepared files. Samples prepared later, or prepared again, are read from
+        their files until the next packing.
+
+        file_data:
+        The data frame indexing the sample files.
+
+        workers (default 8):
+        Number of threads reading the prepared files.
+
+        returns:
+        The number of packed texts.
+        """
+        file_names = file_data[keys.PREP_FILE].dropna()
+        paths = [Path(self.training_dir, file_name)
+                 for file_name in file_names]
+        contents = packed_corpus.read_text_files(paths, workers=workers)
+        texts = pd.Series(contents, index=file_names.index,
+                          dtype=object).dropna()
+        self._get_packed_corpus().write(texts, file_names)
+        return len(texts)
+
+    def _get_packed_corpus(self) -> PackedCorpus:
+        """
+        returns:
+        The packed corpus of the training directory, which may or may not exist.
+        """
+        return PackedCorpus(Path(self.training_dir, _corpus), Path(self.training_dir, _corpus_table), self.training_dir)
+
+    def get_feature_cache(self) -> FeatureCache:
+        """
+        returns:
+        The cache of feature matrices of this project.
+        """
+        return FeatureCache(Path(self.root_dir, _feature_cache_dir))
 
     def read_sample_file(self, full_path: Path) -> str:
         with open(full_path, 'rt') as file:
@@ -268,13 +692,16 @@ class Project():
 
     def write_model_index(self, file_data: pd.DataFrame) -> None:
         """
-        Writes the model index as csv to the disk.
+        Writes the model index as csv to the disk. The file is written under a temporary name first
+        and then renamed, so an interruption never leaves a truncated index.
 
         file_data:
         Index list of the models within the project.
         """
         full_path = Path(self.model_dir, _model_index)
-        file_data.to_csv(full_path, index=True)
+        tmp_path = Path(self.model_dir, _model_index + '.tmp')
+        file_data.to_csv(tmp_path, index=True)
+        tmp_path.replace(full_path)
 
     def read_model_index(self) -> pd.DataFrame:
         """
@@ -294,7 +721,8 @@ class Project():
     def read_model(self, name: str) -> ModelWrapper:
         """
         Loads the model with the given name and wraps it into an approbiate wrapper. The file suffix
-        determines which wrapper is approbiate.
+        determines which wrapper is approbiate. The backend of the model, like tensorflow, is imported
+        when the first model of its kind is loaded. Recently used models are taken from memory.
 
         The model is taken from the model directory and only from the model directory.
 
@@ -314,22 +742,7 @@ class Project():
         raises RuntimeError:
         If the found file does not have a supported file suffix.
         """
-        files = [file for file in self.model_dir.iterdir(
-        ) if file.is_file() and file.stem == name]
-        if len(files) == 0:
-            raise FileNotFoundError('No model file with the provided name')
-
-        file = files[0]
-        if file.suffix == '.keras':
-            model = load_model(file)
-            wrap = TfKerasModel(name, model)
-            return wrap
-        elif file.suffix == '.sklearn':
-            model = load(file)
-            wrap = SklearnModel(name, model)
-            return wrap
-        else:
-            raise RuntimeError('Unsupported suffix')
+        return self.model_registry.get(name)
 
     def write_model(self, model: ModelWrapper) -> None:
         """
@@ -341,3 +754,4 @@ class Project():
         """
         dir = self.model_dir
         model.write_model(dir)
+        self.model_registry.put(model)
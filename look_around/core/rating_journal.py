@@ -0,0 +1,175 @@
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Condition, Lock, Thread
+from typing import Iterator, List, Optional
+import pandas as pd
+from look_around.tools import keys
+
+_ID = 'id'
+"""Key of the sample in a journal entry."""
+
+
+class RatingJournal():
+    """
+    Notes down ratings in a file next to the sample file index, one line per rating. Lines are only
+    ever appended, so a rating costs a few bytes of I/O no matter how large the index is. The ratings
+    are written in batches by a background thread, at least every 'flush_interval' seconds.
+
+    The journal is compacted into the sample file index from time to time, and emptied afterwards.
+    Replaying an entry twice does no harm, so an interruption between writing the index and emptying
+    the journal loses nothing.
+
+    There should be just one instance per journal file, as the file operations are serialized by the
+    instance. Use 'Project.get_rating_journal'.
+    """
+
+    path: Path
+    """The journal file."""
+    flush_interval: float
+    """Maximum time in seconds a rating waits in memory before it is written."""
+    batch_size: int
+    """Number of waiting ratings that are written right away, without waiting for the interval."""
+    _pending: List[str]
+    """Lines not written yet."""
+    _closed: bool
+    _cond: Condition
+    """Guards the waiting lines and the state of the background thread. Never held while writing."""
+    _write_lock: Lock
+    """Held for any operation on the file. Taken before the waiting lines, so batches are written in order."""
+    _thread: Optional[Thread]
+
+    def __init__(self, path: Path, flush_interval: float = 1.0, batch_size: int = 50) -> None:
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending = []
+        self._closed = False
+        self._cond = Condition()
+        self._write_lock = Lock()
+        self._thread = None
+
+    def record(self, id: str, rating: int, labeled_by: str) -> None:
+        """
+        Notes down the rating of a sample. The rating is written in the background.
+
+        id:
+        Index of the sample in the sample file index.
+
+        rating:
+        The rating.
+
+        labeled_by:
+        The entity that has labeled the sample.
+        """
+        line = json.dumps({_ID: str(id), keys.RATING: int(rating),
+                          keys.LABELED_BY: labeled_by})
+        with self._cond:
+            self._pending.append(line)
+            if self._thread is None:
+                self._closed = False
+                self._thread = Thread(target=self._flush_loop, daemon=True)
+                self._thread.start()
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify()
+
+    def flush(self) -> None:
+        """
+        Writes the waiting ratings right now.
+        """
+        with self._write_lock:
+            self._write(self._take_pending())
+
+    def close(self) -> None:
+        """
+        Writes the waiting ratings and stops the background thread. Recording again starts a new thread.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            thread.join()
+        self.flush()
+
+    def read(self) -> pd.DataFrame:
+        """
+        Reads the ratings noted down so far. A line that cannot be parsed, like the last line after a
+        crash while writing, is skipped.
+
+        returns:
+        The ratings in the order they have been given, with the columns rating and labeled by, indexed
+        by the sample. A sample may occur several times.
+        """
+        ids = []
+        ratings = []
+        labelers = []
+        try:
+            with open(self.path, 'rt') as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                        ids.append(entry[_ID])
+                        ratings.append(entry[keys.RATING])
+                        labelers.append(entry[keys.LABELED_BY])
+                    except BaseException:
+                        continue
+        except FileNotFoundError:
+            pass
+        return pd.DataFrame({keys.RATING: ratings, keys.LABELED_BY: labelers}, index=ids, dtype=object)
+
+    def clear(self) -> None:
+        """
+        Empties the journal, including the ratings recorded but not written yet.
+        """
+        with self._write_lock:
+            self._take_pending()
+            self.path.unlink(missing_ok=True)
+
+    @contextmanager
+    def compacting(self) -> Iterator[pd.DataFrame]:
+        """
+        Writes the waiting ratings and provides all ratings for being compacted into the index. The journal
+        is emptied if the block succeeds, and left as it is otherwise. Ratings recorded meanwhile wait
+        and are written after the journal has been emptied.
+
+        returns:
+        The ratings, see 'read'.
+        """
+        with self._write_lock:
+            self._write(self._take_pending())
+            yield self.read()
+            self.path.unlink(missing_ok=True)
+
+    def _take_pending(self) -> List[str]:
+        """Takes the waiting lines out of the queue."""
+        with self._cond:
+            lines = self._pending
+            self._pending = []
+            return lines
+
+    def _write(self, lines: List[str]) -> None:
+        """Appends the lines to the journal file and makes sure they are on disk."""
+        if len(lines) == 0:
+            return
+        try:
+            with open(self.path, 'at') as file:
+                file.write('\n'.join(lines) + '\n')
+                file.flush()
+                os.fsync(file.fileno())
+        except BaseException as be:
+            print('could not write the rating journal')
+            print(be)
+
+    def _flush_loop(self) -> None:
+        """Writes the waiting ratings in batches until the journal is closed."""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._closed or len(
+                    self._pending) >= self.batch_size, self.flush_interval)
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+_HEAVY = ['tensorflow', 'joblib', 'selenium', 'tkinterweb']
+"""Modules that are expected to be imported only when they are actually used."""
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+"""The directory holding the look_around package, put on the path of the measuring interpreters."""
+
+_SNIPPET = '''
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+print(','.join(name for name in {heavy} if name in sys.modules))
+'''
+
+
+def measure_import(module: str = 'look_around.core.look_around', repeats: int = 5) -> Dict:
+    """
+    Measures how long importing the module takes. Each measurement runs in a fresh interpreter, so
+    nothing is cached in memory. The interpreter finds this package, no matter the working directory.
+
+    module (default look_around.core.look_around):
+    The module that is imported.
+
+    repeats (default 5):
+    Number of measurements.
+
+    returns:
+    The single timings in seconds, their minimum and median, and the heavy backends that have been
+    imported along.
+    """
+    timings: List[float] = []
+    heavy: List[str] = []
+    code = _SNIPPET.format(module=module, heavy=repr(_HEAVY))
+    python_path = [str(_REPO_ROOT)] + \
+        [path for path in os.environ.get('PYTHONPATH', '').split(os.pathsep) if len(path) > 0]
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(python_path)}
+    for _ in range(repeats):
+        out = subprocess.run([sys.executable, '-c', code], env=env,
+                             capture_output=True, text=True, check=True).stdout.splitlines()
+        timings.append(float(out[0]))
+        heavy = [name for name in out[1].split(',') if len(name) > 0]
+
+    ordered = sorted(timings)
+    return {'timings': timings, 'min': ordered[0], 'median': ordered[len(ordered)//2], 'heavy': heavy}
+
+
+if __name__ == '__main__':
+    module = sys.argv[1] if len(sys.argv) > 1 else 'look_around.core.look_around'
+    result = measure_import(module)
+    print(f'import {module}')
+    print(f'min {result["min"]:.3f}s, median {result["median"]:.3f}s')
+    print(f'heavy backends imported: {", ".join(result["heavy"]) or "none"}')
@@ -0,0 +1,54 @@
+from look_around.doc_process import html_cleaning, lang_detection, stops_removal, stemming
+from typing import FrozenSet, List, Optional, Tuple
+
+
+class DocumentPipeline():
+    """
+    Prepares raw html documents for the analysis. The html is stripped and the text is split into its
+    words just once. Language detection, the removal of origin specific and language specific stop
+    words, and the stemming all work on the list of words then.
+
+    Instances carry nothing but their configuration, so they can be handed to worker processes.
+    """
+
+    search_langs: List[str]
+    """Languages the language detection chooses from."""
+    threshold: float
+    """Minimum fraction of stop words for a language to be detected."""
+
+    def __init__(self, search_langs: List[str], threshold: float = 0.1) -> None:
+        self.search_langs = search_langs
+        self.threshold = threshold
+
+    def process(self, html: str, lang: Optional[str] = None, origin_stopwords: FrozenSet[str] = frozenset()) -> Tuple[str, Optional[List[str]]]:
+        """
+        Runs the raw document through the pipeline.
+
+        html:
+        The raw document.
+
+        lang (default None):
+        The language of the document. The language is detected if None.
+
+        origin_stopwords (default empty):
+        Origin specific stop words. These are removed before the language is detected.
+
+        returns:
+        The language and the prepared words of the document. The words are None if the language
+        is unknown.
+        """
+        words = html_cleaning.html_to_words(html)
+        if len(origin_stopwords) > 0:
+            words = stops_removal.remove_given_stopwords_from_words(
+                words, origin_stopwords)
+
+        # which language?
+        if lang is None:
+            lang = lang_detection.detect_lang_of_words(
+                words, self.search_langs, threshold=self.threshold)
+        if lang == lang_detection.UNKNOWN:
+            return (lang, None)
+
+        words = stops_removal.remove_stop_words_from_words(words, lang=lang)
+        words = stemming.stem_words(words, lang=lang)
+        return (lang, words)
@@ -1,12 +1,68 @@
 import re
+from html.parser import HTMLParser
+from typing import List
+
+_SKIPPED_TAGS = frozenset(['style', 'script', 'title'])
+"""Tags whose content is dropped together with the tags themselves."""
+_PUNCTUATION = re.compile(r'[^ \w]')
+
+
+class _TextExtractor(HTMLParser):
+    """
+    Collects the text content of an html document in a single pass. Every tag, comment, and
+    declaration is replaced by a blank, so that words on both sides of a tag remain separated.
+    The content of the tags listed in '_SKIPPED_TAGS' is dropped.
+    """
+
+    parts: List[str]
+    """The pieces of text collected so far."""
+    skip_depth: int
+    """Number of currently open tags whose content is dropped."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag: str, attrs: List) -> None:
+        if tag in _SKIPPED_TAGS:
+            self.skip_depth += 1
+        self.parts.append(' ')
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIPPED_TAGS and self.skip_depth > 0:
+            self.skip_depth -= 1
+        self.parts.append(' ')
+
+    def handle_startendtag(self, tag: str, attrs: List) -> None:
+        # single tag syntax like <br/>, nothing is embraced
+        self.parts.append(' ')
+
+    def handle_data(self, data: str) -> None:
+        if self.skip_depth == 0:
+            self.parts.append(data)
+
+    def handle_comment(self, data: str) -> None:
+        self.parts.append(' ')
+
+    def handle_decl(self, decl: str) -> None:
+        self.parts.append(' ')
+
+    def handle_pi(self, data: str) -> None:
+        self.parts.append(' ')
+
+    def unknown_decl(self, data: str) -> None:
+        self.parts.append(' ')
 
 
 def clean_html(html: str) -> str:
     """
-    Strips an html source text from the html tags. Tags that come with an
-    opening and a closing tag are detected even when the text contains
-    custom tags. For custom singular tags, similar to <br>, this is
-    not the case. Also sets the text to LOWER CASE.
+    Strips an html source text from the html tags. The document is tokenized in a single
+    pass, so the run time grows linearly with the length of the text, regardless of how
+    deeply the tags are nested. Tags without a closing counterpart, like <br> or custom
+    singular tags, are removed as well. Style, script, and title tags are removed including
+    what they embrace. Character references like &amp; are resolved before the punctuation
+    is removed. Also sets the text to LOWER CASE.
 
     html:
     Text that may or may not contain html tags.
@@ -14,41 +70,25 @@ def clean_html(html: str) -> str:
     return:
     Processed lower case text without the html tags.
     """
-    text = html.lower()  # do not mess with upper case or lower case tags
-
-    # remove comments
-    pattern = r'<!--.*?-->'
-    while re.search(pattern, text) is not None:
-        text = re.sub(pattern, ' ', text)
-
-    # remove tags that do not come in pairs
-    list = [r'<!doctype.*?>', r'<[/]{0,1}br.*?>',
-            r'<[/]{0,1}hr.*?>', r'<[/]{0,1}wbr.*?>', r'<[/]{0,1}meta.*?>',
-            r'<[/]{0,1}noscript.*?>', r'<link .*?>']
-    for ex in list:
-        while re.search(ex, text) is not None:
-            text = re.sub(ex, ' ', text)
-
-    # remove tags in single tag syntax
-    pattern = r'<(\w+)[^>]*/>'
-    while re.search(pattern, text) is not None:
-        text = re.sub(pattern, ' ', text)
-
-    # remove style and script tags including what they embrace
-    pattern = r'<(style|script|title)[^>]*>((.|\n)*?)</\1>'
-    while re.search(pattern, text) is not None:
-        text = re.sub(pattern, ' ', text)
-
-    # remove tags that come in a pair, while keeping what is between the opening
-    # and the closing tag
-    pattern = r'<(\w+)[^>]*>((.|\n)*?)</\1>'
-    while re.search(pattern, text) is not None:
-        text = re.sub(pattern, r' \2 ', text)
+    return ' '.join(html_to_words(html))
 
-    # remove punctuation, replace by space for ensuring the separation of words
-    text = re.sub(r'[^ \w]', ' ', text)
 
-    # clean multiple white spaces that were introduced when they replaced the html tags
-    text = re.sub(r'\s{2,}', ' ', text)
+def html_to_words(html: str) -> List[str]:
+    """
+    Same as 'clean_html', but returns the words of the processed text instead of the text.
+
+    html:
+    Text that may or may not contain html tags.
+
+    return:
+    The lower case words of the text without the html tags.
+    """
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    text = ''.join(parser.parts).lower()
+
+    # remove punctuation, replace by space for ensuring the separation of words
+    text = _PUNCTUATION.sub(' ', text)
 
-    return text.strip()
+    return text.split()
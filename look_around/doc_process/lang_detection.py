@@ -1,5 +1,8 @@
-from nltk.corpus import stopwords
-from typing import List
+from look_around.doc_process import stopword_registry
+from typing import Iterable, List
+
+UNKNOWN = 'unknown'
+"""The language of a text whose language could not be detected."""
 
 
 def detect_lang(text: str, langs: List[str], threshold: float = 0) -> str:
@@ -18,21 +21,37 @@ def detect_lang(text: str, langs: List[str], threshold: float = 0) -> str:
     Assumed language. Returns 'unknown' if the fraction of stop words even for the assumed language does
     not exceeds 'threshold'... or if you show up with no text or no languages in the arguments.
     """
-    cur_lang: str = "unknown"
+    return detect_lang_of_words(text.split(), langs, threshold=threshold)
+
+
+def detect_lang_of_words(words: Iterable[str], langs: List[str], threshold: float = 0) -> str:
+    """
+    Same as 'detect_lang', but takes the words of the text instead of the text.
+
+    words:
+    The words of the text of yet unknown language.
+
+    threshold (default 0):
+    A number ranging from zero to unity. The fraction of stop words in the assumed language must exceeds
+    the given threshold, or 'unkown' is returned.
+
+    returns:
+    Assumed language.
+    """
+    cur_lang: str = UNKNOWN
     cur_freq: float = -1
-    words = set(text.split())
+    words = set(words)
     if len(words) == 0 or len(langs) == 0:
         return cur_lang
 
     for lang in langs:
-        stops = stopwords.words(lang)
-        stopped_words = [word for word in words if word in stops]
-        fraction = len(stopped_words) / len(words)
+        stops = stopword_registry.get_stopwords(lang)
+        fraction = len(words.intersection(stops)) / len(words)
         if fraction > cur_freq:
             cur_freq = fraction
             cur_lang = lang
 
     if cur_freq < threshold:
-        return "unknown"
+        return UNKNOWN
 
     return cur_lang
@@ -1,9 +1,133 @@
 import snowballstemmer
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, List
+
+_DEFAULT_CACHE_SIZE = 100000
+"""Default number of words whose stems are remembered."""
+
+
+class StemCache():
+    """
+    Remembers the stems of recently stemmed words, for each language. Once the cache is full, the stem
+    that has not been asked for for the longest time is forgotten. One snowball stemmer is kept for each
+    language, too.
+
+    Each process has its own cache. Worker processes can set up theirs by calling 'set_cache_size' in
+    their initializer.
+    """
+
+    max_size: int
+    """Maximum number of stems kept. With 0, no stems are kept at all."""
+    hits: int
+    """Number of words whose stems have been taken from the cache."""
+    misses: int
+    """Number of words that had to be stemmed by the stemmer."""
+    _stems: OrderedDict
+    """The stems, keyed by language and word, from least to most recently used."""
+    _stemmers: Dict
+    """The stemmers, by language."""
+    _lock: Lock
+
+    def __init__(self, max_size: int = _DEFAULT_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._stems = OrderedDict()
+        self._stemmers = {}
+        self._lock = Lock()
+
+    def get_stemmer(self, lang: str):
+        """
+        Gets the stemmer for the language. The stemmer is created on first demand.
+
+        lang:
+        Language of the stemmer.
+
+        returns:
+        The stemmer.
+
+        raises KeyError:
+        If 'lang' is not an available language.
+        """
+        try:
+            return self._stemmers[lang]
+        except KeyError:
+            stemmer = snowballstemmer.stemmer(lang)
+            self._stemmers[lang] = stemmer
+            return stemmer
+
+    def stem_words(self, words: List[str], lang: str) -> List[str]:
+        """
+        Stems the words. Stems already known are taken from the cache, the others are computed
+        and added to the cache.
+
+        words:
+        The words to be stemmed.
+
+        lang:
+        Language used for the stemming.
+
+        returns:
+        The stems, in the order of the words.
+        """
+        with self._lock:
+            stemmer = self.get_stemmer(lang)
+            stems = self._stems
+            stemmed = []
+            for word in words:
+                key = (lang, word)
+                try:
+                    stem = stems[key]
+                    stems.move_to_end(key)
+                    self.hits += 1
+                except KeyError:
+                    stem = stemmer.stemWord(word)
+                    self.misses += 1
+                    if self.max_size > 0:
+                        stems[key] = stem
+                        if len(stems) > self.max_size:
+                            stems.popitem(last=False)
+                stemmed.append(stem)
+            return stemmed
+
+    def resize(self, max_size: int) -> None:
+        """
+        Changes the maximum number of stems kept. Surplus stems are forgotten, least recently used first.
+
+        max_size:
+        The new maximum.
+        """
+        with self._lock:
+            self.max_size = max_size
+            while len(self._stems) > max(max_size, 0):
+                self._stems.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Forgets all stems and resets the counters.
+        """
+        with self._lock:
+            self._stems.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        """
+        returns:
+        The number of hits, misses, currently cached stems, and the maximum size.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._stems), 'max_size': self.max_size}
+
+
+_cache = StemCache()
+"""The stem cache of this process."""
 
 
 def stem(text: str, lang: str = 'english') -> str:
     """
-    Returns a stemmed version of 'text' using the snowballstemmer.
+    Returns a stemmed version of 'text' using the snowballstemmer. The stems are remembered by the
+    stem cache of this process.
 
     text:
     Text to be stemmed.
@@ -16,7 +140,49 @@ def stem(text: str, lang: str = 'english') -> str:
     """
     # may cause a key error if 'lang' is not an available language
     # may cause an AttributeError when 'lang' is not valid
-    stemmer = snowballstemmer.stemmer(lang)
-    stemmed = stemmer.stemWords(text.split())
+    stemmed = _cache.stem_words(text.split(), lang)
 
     return ' '.join(stemmed)
+
+
+def stem_words(words: List[str], lang: str = 'english') -> List[str]:
+    """
+    Same as 'stem', but takes and returns the words of the text instead of the text.
+
+    words:
+    Words to be stemmed.
+
+    lang (default english):
+    Language used for the stemming.
+
+    returns:
+    The stems, in the order of the words.
+    """
+    return _cache.stem_words(words, lang)
+
+
+def set_cache_size(max_size: int) -> None:
+    """
+    Sets the maximum number of stems remembered by the stem cache of this process. Suitable as
+    initializer for worker processes.
+
+    max_size:
+    The maximum number of stems. With 0, no stems are remembered.
+    """
+    _cache.resize(max_size)
+
+
+def get_cache_info() -> Dict[str, int]:
+    """
+    returns:
+    The number of hits, misses, currently cached stems, and the maximum size of the stem cache
+    of this process.
+    """
+    return _cache.info()
+
+
+def clear_cache() -> None:
+    """
+    Forgets all stems of the stem cache of this process and resets its counters.
+    """
+    _cache.clear()
@@ -1,5 +1,5 @@
-from nltk.corpus import stopwords
-from typing import List
+from look_around.doc_process import stopword_registry
+from typing import Collection, List
 
 
 def remove_stop_words(text: str, lang: str = 'english') -> str:
@@ -15,12 +15,57 @@ def remove_stop_words(text: str, lang: str = 'english') -> str:
     returns:
     Text without the stop words.
     """
-    sw = stopwords.words(lang)
-    # shortlist = [word for word in text.split() if word not in sw]
+    sw = stopword_registry.get_stopwords(lang)
     shortened_text = remove_given_stopwords(text, sw)
     return shortened_text
 
 
-def remove_given_stopwords(text: str, stopwords: List[str] = []) -> str:
-    shortlist = [word for word in text.split() if word not in stopwords]
-    return ' '.join(shortlist)
+def remove_stop_words_from_words(words: List[str], lang: str = 'english') -> List[str]:
+    """
+    Same as 'remove_stop_words', but takes and returns the words of the text instead of the text.
+
+    words:
+    Words from which the stop words are to be removed.
+
+    lang (default english):
+    Language from which the stop words are taken.
+
+    returns:
+    The words that are not stop words, in their original order.
+    """
+    sw = stopword_registry.get_stopwords(lang)
+    return remove_given_stopwords_from_words(words, sw)
+
+
+def remove_given_stopwords(text: str, stopwords: Collection[str] = frozenset()) -> str:
+    """
+    Removes the given stop words from the text.
+
+    text:
+    Text from which the stop words are to be removed.
+
+    stopwords (default empty):
+    The stop words. Lists are turned into a set before the text is processed.
+
+    returns:
+    Text without the stop words.
+    """
+    return ' '.join(remove_given_stopwords_from_words(text.split(), stopwords))
+
+
+def remove_given_stopwords_from_words(words: List[str], stopwords: Collection[str] = frozenset()) -> List[str]:
+    """
+    Same as 'remove_given_stopwords', but takes and returns the words of the text instead of the text.
+
+    words:
+    Words from which the stop words are to be removed.
+
+    stopwords (default empty):
+    The stop words. Lists are turned into a set before the words are processed.
+
+    returns:
+    The words that are not stop words, in their original order.
+    """
+    if not isinstance(stopwords, (set, frozenset)):
+        stopwords = frozenset(stopwords)
+    return [word for word in words if word not in stopwords]
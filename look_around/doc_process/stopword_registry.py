@@ -0,0 +1,92 @@
+from threading import Lock
+from typing import Dict, FrozenSet, Iterable, List
+
+_registry: Dict[str, FrozenSet[str]] = {}
+"""Stop word sets of this process, by language or by the name they have been registered with."""
+_lock = Lock()
+
+
+def get_stopwords(lang: str) -> FrozenSet[str]:
+    """
+    Gets the stop words of the given language. The nltk corpus of a language is loaded just once per
+    process, subsequent calls return the very same set.
+
+    lang:
+    The language, as named by nltk. Names given to 'register_stopwords' work as well.
+
+    returns:
+    The stop words.
+
+    raises LookupError:
+    If the nltk stop word corpus is not installed.
+
+    raises OSError:
+    If nltk does not know the language.
+    """
+    try:
+        return _registry[lang]
+    except KeyError:
+        pass
+
+    # nltk takes a while to import, so it is imported on first demand
+    from nltk.corpus import stopwords
+    with _lock:
+        if lang not in _registry:
+            _registry[lang] = frozenset(stopwords.words(lang))
+        return _registry[lang]
+
+
+def register_stopwords(name: str, words: Iterable[str]) -> FrozenSet[str]:
+    """
+    Registers a custom list of stop words, like the stop words of an origin, under the given name.
+    An already registered set of the same name is replaced.
+
+    name:
+    The name of the stop word set.
+
+    words:
+    The stop words.
+
+    returns:
+    The stop words as set.
+    """
+    sw = frozenset(words)
+    with _lock:
+        _registry[name] = sw
+    return sw
+
+
+def get_registered(name: str) -> FrozenSet[str]:
+    """
+    Gets a set of stop words that has been loaded or registered before. Does not load anything.
+
+    name:
+    The language or the name of the stop word set.
+
+    returns:
+    The stop words.
+
+    raises KeyError:
+    If nothing is registered under this name.
+    """
+    return _registry[name]
+
+
+def warm_up(langs: List[str]) -> None:
+    """
+    Loads the stop words of all the given languages in advance. Processes that are forked afterwards
+    inherit the loaded sets.
+
+    langs:
+    The languages.
+    """
+    for lang in langs:
+        get_stopwords(lang)
+
+
+def clear() -> None:
+    """
+    Forgets all stop word sets.
+    """
+    with _lock:
+        _registry.clear()
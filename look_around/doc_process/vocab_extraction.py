@@ -1,9 +1,17 @@
 from typing import List, Tuple
 from sklearn.feature_extraction.text import TfidfVectorizer
+from scipy.sparse import spmatrix, csr_matrix
 import numpy as np
+import numpy.typing as npt
 
+_BYTES_PER_PAIR = 20
+"""
+Memory held per pair of words of a block: 8 bytes in the dense block of correlations, and up to 12 bytes in the
+sparse co-occurrences it is filled from.
+"""
 
-def extract_vocab(docs: List[str], min_df=1, ngram_range: Tuple[int, int] = (1, 1), threshold: float = 0.98, verbose: bool = True, skip_dropping: bool = False):
+
+def extract_vocab(docs: List[str], min_df=1, ngram_range: Tuple[int, int] = (1, 1), threshold: float = 0.98, verbose: bool = True, skip_dropping: bool = False, max_memory: int = 2**28):
     """
     Extracts the vocabulary from the list of documents. The appearance or non appearance of the
     words from this vocabulary in a document are the features that are eventually analyzed.
@@ -31,6 +39,9 @@ def extract_vocab(docs: List[str], min_df=1, ngram_range: Tuple[int, int] = (1,
     skip_dropping (default False):
     Determines if the dropping of words thats appearance strongly (anti)correlates with another words
     shall be omitted.
+
+    max_memory (default 2**28):
+    Approximate upper limit, in bytes, for the memory taken by the block of pairwise correlations held at once.
     """
     vect = TfidfVectorizer(min_df=min_df, use_idf=False,
                            binary=True, norm=None, ngram_range=ngram_range)
@@ -41,58 +52,88 @@ def extract_vocab(docs: List[str], min_df=1, ngram_range: Tuple[int, int] = (1,
     vocab = vect.get_feature_names_out()
 
     # drop strongly correlated words
-    droplist = []
-
-    # statistics on each word
     if verbose:
         print('\rpreparing stats', end='')
-    means = np.zeros(len(vocab))
-    vars = np.zeros(len(vocab))
-    for word in range(len(vocab)):
-        x = matrix.getcol(word).toarray().T[0]
-        means[word] = np.mean(x)
-        vars[word] = np.var(x)
+    drop = _find_correlated_words(matrix, threshold, max_memory, verbose)
+
+    print()
+    shortlist = vocab[np.logical_not(drop)]
+    return shortlist
+
+
+def _find_correlated_words(matrix: spmatrix, threshold: float, max_memory: int, verbose: bool) -> npt.NDArray[np.bool_]:
+    """
+    Finds the words that are dropped from the vocabulary. A word is dropped if it appears in all documents,
+    or if the magnitude of the correlation of its appearances with the appearances of any later word in the
+    vocabulary exceeds the threshold. So of each pair of correlated words, the earlier one is dropped. The last
+    word of the vocabulary is always kept.
+
+    As the columns of the document-word matrix consist of zeros and ones only, the covariances follow from the
+    co-occurrence counts XᵀX and the means. The co-occurrences are computed for a block of words at a time
+    against the entire vocabulary, so memory consumption is bound by 'max_memory'. The dense block is allocated
+    once and updated in place, row by row where a full temporary would be needed otherwise.
+
+    matrix:
+    The binary document-word matrix, one row per document and one column per word.
 
+    threshold:
+    Words of a pair whose correlation magnitude exceeds this value are considered correlated.
+
+    max_memory:
+    Approximate upper limit, in bytes, for the memory taken by a block of correlations.
+
+    verbose:
+    If and only if, a progress indicator is printed to sout.
+
+    returns:
+    Boolean array that is True for each word that is dropped.
+    """
+    # both factors of the products in compressed rows, so that scipy does not convert a copy for each block
+    matrix = csr_matrix(matrix, dtype=np.float64)
+    num_docs, num_words = matrix.shape
+    drop = np.zeros(num_words, dtype=bool)
+    if num_words == 0 or num_docs == 0:
+        return drop
+
+    # statistics on each word. For zeros and ones, the variance is p(1-p)
+    counts = np.asarray(matrix.sum(axis=0)).ravel()
+    means = counts / num_docs
+    vars = means * (1 - means)
     sqrtvars = np.sqrt(vars)
     consts = np.absolute(vars) < .00001
 
-    for word in range(len(vocab)-1):
+    # word appears in all documents
+    drop[:-1] = counts[:-1] >= num_docs
+
+    trans = matrix.T.tocsr()
+    block_size = int(max(1, min(num_words - 1, max_memory // (_BYTES_PER_PAIR * num_words))))
+    block = np.empty((block_size, num_words))
+    for start in range(0, num_words - 1, block_size):
+        stop = min(start + block_size, num_words - 1)
         if verbose:
             print(
-                f'\rchecking word {word+1} of {len(vocab)-1}, dropped {len(droplist)} words so far', end='')
-        x = matrix.getcol(word).toarray().T[0]
-        if np.min(x) >= 1:
-            # word appears in all documents
-            droplist.append(word)
-            continue
-
-        xcen = x - means[word]
-        for other in range(word+1, len(vocab)):
-            # check if all values in an array are the same
-            if not consts[word] and not consts[other]:
-                z = matrix.getcol(other).toarray().T[0]
-                # could also take the confidence interval into account
-                # TODO: x and z consists just of 0s and 1s each. This might gives rise for further
-                # optimization of the computation of the mutual correlation
-                cov = np.mean(xcen * (z - means[other]))
-                c = cov / (sqrtvars[word] * sqrtvars[other])
-                c = np.absolute(c)
-            elif consts[word] and consts[other]:
-                # either one is zeros and one is unities, or both are zeros, or both are unities
-                # anyway, both are (anti)correlated
-                c = 1
-            else:
-                # assume no correlation
-                c = 0
-
-            # drop this word?
-            if c > threshold:
-                droplist.append(word)
-                break  # go on in outer loop
-
-    print()
-    arr = np.array([True for _ in range(len(vocab))])
-    arr[droplist] = False
-
-    shortlist = vocab[arr]
-    return shortlist
+                f'\rchecking word {stop} of {num_words-1}, dropped {np.count_nonzero(drop[:start])} words so far', end='')
+
+        # computed in place for keeping just one dense block in memory
+        c = block[:stop-start]
+        (trans[start:stop] @ matrix).toarray(out=c)
+        c /= num_docs
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for row in range(stop - start):
+                c[row] -= means[start + row] * means
+                c[row] /= sqrtvars[start + row] * sqrtvars
+        np.absolute(c, out=c)
+
+        # either one is zeros and one is unities, or both are zeros, or both are unities
+        # anyway, both are (anti)correlated. Assume no correlation if just one is constant
+        block_consts = consts[start:stop]
+        c[np.ix_(block_consts, consts)] = 1
+        c[np.ix_(block_consts, np.logical_not(consts))] = 0
+        c[np.ix_(np.logical_not(block_consts), consts)] = 0
+
+        # only later words are compared against
+        for row in range(stop - start):
+            if (c[row, start+row+1:] > threshold).any():
+                drop[start + row] = True
+
+    return drop
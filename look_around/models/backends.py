@@ -0,0 +1,70 @@
+from pathlib import Path
+from typing import Callable, Dict
+from look_around.models.model_wrapper import ModelWrapper
+
+_loaders: Dict[str, Callable[[str, Path], ModelWrapper]] = {}
+"""Functions that load a model file and wrap the model, by file suffix."""
+
+
+def register_loader(suffix: str, loader: Callable[[str, Path], ModelWrapper]) -> None:
+    """
+    Registers a loader for model files with the given suffix. A loader already registered for the
+    suffix is replaced. Loaders should import their backend when called, not when registered.
+
+    suffix:
+    The file suffix including the dot, like '.keras'.
+
+    loader:
+    Function that takes the name of the model and the path to the file, and returns the wrapped model.
+    """
+    _loaders[suffix] = loader
+
+
+def is_supported(suffix: str) -> bool:
+    """
+    returns:
+    True if a loader is registered for the file suffix.
+    """
+    return suffix in _loaders
+
+
+def load_model(name: str, file: Path) -> ModelWrapper:
+    """
+    Loads the model from the file with the loader registered for the suffix of the file.
+
+    name:
+    Name of the model.
+
+    file:
+    The model file.
+
+    returns:
+    The wrapped model.
+
+    raises RuntimeError:
+    If no loader is registered for the file suffix.
+    """
+    try:
+        loader = _loaders[file.suffix]
+    except KeyError:
+        raise RuntimeError('Unsupported suffix')
+    return loader(name, file)
+
+
+def _load_keras(name: str, file: Path) -> ModelWrapper:
+    # importing tensorflow takes seconds, so it is done on first use only
+    from tensorflow.keras.models import load_model
+    from look_around.models.tfkeras_model import TfKerasModel
+    return TfKerasModel(name, load_model(file))
+
+
+def _load_sklearn(name: str, file: Path) -> ModelWrapper:
+    from joblib import load
+    from look_around.models.sklearn_model import SklearnModel
+    # large arrays are mapped read-only instead of copied, so processes loading the same
+    # model share them through the page cache
+    return SklearnModel(name, load(file, mmap_mode='r'))
+
+
+register_loader('.keras', _load_keras)
+register_loader('.sklearn', _load_sklearn)
@@ -0,0 +1,84 @@
+import math
+from typing import Optional, Tuple, Union
+import numpy as np
+import numpy.typing as npt
+from scipy.sparse import csr_matrix, spmatrix
+
+
+class CsrBatches():
+    """
+    Cuts a sparse feature matrix into batches of rows, and densifies one batch at a time. So a dense
+    copy of the entire matrix is never made, and the memory needed scales with the batch size rather
+    than the number of samples.
+    """
+
+    features: csr_matrix
+    """The feature matrix, in compressed rows so that slicing rows is cheap."""
+    targets: Optional[npt.NDArray]
+    """The targets of the samples, row by row, or None if just the features are batched."""
+    batch_size: int
+    """Number of rows per batch. The last batch may be smaller."""
+    sparse: bool
+    """Hand out the batches as sparse matrices instead of densifying them?"""
+    shuffle: bool
+    """Draw the rows of the batches in a random order, which changes with each epoch?"""
+    _order: Optional[npt.NDArray[np.int_]]
+    """The rows in the order they are handed out, or None for the order of the matrix."""
+    _rng: np.random.Generator
+
+    def __init__(self, features: spmatrix, targets: Optional[npt.NDArray] = None, batch_size: int = 32, sparse: bool = False, shuffle: bool = False, seed: Optional[int] = None) -> None:
+        self.features = csr_matrix(features)
+        self.targets = targets
+        self.batch_size = max(1, batch_size)
+        self.sparse = sparse
+        self.shuffle = shuffle
+        self._rng = np.random.default_rng(seed)
+        self._order = None
+        self.on_epoch_end()
+
+    def __len__(self) -> int:
+        return math.ceil(self.features.shape[0] / self.batch_size)
+
+    def __getitem__(self, idx: int) -> Union[npt.NDArray, csr_matrix, Tuple]:
+        """
+        idx:
+        The number of the batch.
+
+        returns:
+        The features of the batch, and also the targets if there are targets.
+
+        raises IndexError:
+        If there is no batch with that number.
+        """
+        if idx < 0 or idx >= len(self):
+            raise IndexError('batch index out of range')
+        start = idx * self.batch_size
+        end = min(start + self.batch_size, self.features.shape[0])
+        rows = slice(start, end) if self._order is None else self._order[start:end]
+        batch = self.convert(self.features[rows])
+        if self.targets is None:
+            return batch
+        return (batch, self.targets[rows])
+
+    def on_epoch_end(self) -> None:
+        """
+        Draws a new order of the rows if shuffling, so that each epoch mixes the samples into
+        other batches. Keras calls this after each epoch.
+        """
+        if self.shuffle:
+            self._order = self._rng.permutation(self.features.shape[0])
+
+    def convert(self, batch: csr_matrix) -> Union[npt.NDArray, csr_matrix]:
+        """
+        Converts the features of a batch into what the model takes as input. Override for handing
+        out other types, like sparse tensors.
+
+        batch:
+        The rows of the batch.
+
+        returns:
+        The dense rows, or the sparse rows if 'sparse' is set.
+        """
+        if self.sparse:
+            return batch
+        return batch.toarray().astype(np.float32)
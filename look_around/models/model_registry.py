@@ -0,0 +1,158 @@
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional
+from look_around.models.model_wrapper import ModelWrapper
+from look_around.models import backends
+
+_DEFAULT_MAX_MODELS = 4
+"""Default number of models kept in memory."""
+
+
+class ModelRegistry():
+    """
+    Hands out the models of a model directory and keeps the most recently used ones in memory. Once
+    more than 'max_models' models are held, the model that has not been asked for for the longest time
+    is dropped, and loaded again from its file when needed.
+
+    The files are located by a name to file index instead of a scan of the directory for every model.
+    The index is built on first demand, and built anew when a name is not found in it.
+
+    The same wrapper object is handed out for each request of a model until it is dropped, so changes
+    to a model, like fitting it again, are seen by all holders of the model.
+    """
+
+    model_dir: Path
+    """The directory the model files are in."""
+    max_models: int
+    """Maximum number of models kept in memory. With 0, every request loads the model from its file."""
+    loads: int
+    """Number of models that have been loaded from their files."""
+    _models: OrderedDict
+    """The models in memory, by name, from least to most recently used."""
+    _files: Optional[Dict[str, Path]]
+    """The model files, by model name. None until the directory has been scanned."""
+    _lock: Lock
+
+    def __init__(self, model_dir: Path, max_models: int = _DEFAULT_MAX_MODELS) -> None:
+        self.model_dir = model_dir
+        self.max_models = max_models
+        self.loads = 0
+        self._models = OrderedDict()
+        self._files = None
+        self._lock = Lock()
+
+    def get(self, name: str) -> ModelWrapper:
+        """
+        Gets the model with the given name, from memory if possible and from its file otherwise.
+
+        name:
+        Name of the model. This is also the file name without suffix.
+
+        returns:
+        The wrapped model.
+
+        raises FileNotFoundError:
+        If no file with 'name' as stem is found.
+
+        raises RuntimeError:
+        If the found file does not have a supported file suffix.
+        """
+        with self._lock:
+            try:
+                self._models.move_to_end(name)
+                return self._models[name]
+            except KeyError:
+                pass
+
+            file = self._find_file(name)
+            model = backends.load_model(name, file)
+            self.loads += 1
+            self._keep(model)
+            return model
+
+    def put(self, model: ModelWrapper) -> None:
+        """
+        Puts the model into memory, replacing a model of the same name. To be called when a model is
+        written, so that it is not loaded again from its file. As the suffix of the written file is up
+        to the model, the file of the model is looked up anew once the model has been dropped.
+
+        model:
+        The model.
+        """
+        # the model may stay in memory for long, without holding on to remembered predictions
+        model.clear_predictions()
+        with self._lock:
+            self._models.pop(model.name, None)
+            self._keep(model)
+            if self._files is not None:
+                self._files.pop(model.name, None)
+
+    def forget(self, name: str) -> None:
+        """
+        Drops the model from memory and from the file index, for instance after its file has been
+        removed or replaced from outside.
+
+        name:
+        Name of the model.
+        """
+        with self._lock:
+            self._models.pop(name, None)
+            if self._files is not None:
+                self._files.pop(name, None)
+
+    def clear(self) -> None:
+        """
+        Drops all models from memory and forgets the file index.
+        """
+        with self._lock:
+            self._models.clear()
+            self._files = None
+
+    def info(self) -> Dict:
+        """
+        returns:
+        The names of the models in memory, from least to most recently used, the maximum number of
+        models, and the number of models loaded from files.
+        """
+        with self._lock:
+            return {'models': list(self._models.keys()), 'max_models': self.max_models, 'loads': self.loads}
+
+    def _keep(self, model: ModelWrapper) -> None:
+        """Adds the model as the most recently used one and drops the least recently used ones beyond the limit."""
+        if self.max_models <= 0:
+            return
+        self._models[model.name] = model
+        while len(self._models) > self.max_models:
+            self._models.popitem(last=False)
+
+    def _find_file(self, name: str) -> Path:
+        """
+        Looks the model file up in the file index. The index is built anew if the name is missing,
+        as the model may have been written after the index was built.
+        """
+        if self._files is not None:
+            try:
+                return self._files[name]
+            except KeyError:
+                pass
+
+        self._files = self._scan()
+        try:
+            return self._files[name]
+        except KeyError:
+            raise FileNotFoundError('No model file with the provided name')
+
+    def _scan(self) -> Dict[str, Path]:
+        """
+        Lists the files of the model directory by stem. If there are several files with the same stem,
+        a file with a supported suffix is preferred.
+        """
+        files: Dict[str, Path] = {}
+        for file in self.model_dir.iterdir():
+            if not file.is_file():
+                continue
+            known = files.get(file.stem)
+            if known is None or (not backends.is_supported(known.suffix) and backends.is_supported(file.suffix)):
+                files[file.stem] = file
+        return files
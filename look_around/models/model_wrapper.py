@@ -1,11 +1,37 @@
+import hashlib
 import pandas as pd
 import numpy as np
 import numpy.typing as npt
-from sklearn.metrics import precision_score, accuracy_score, recall_score, f1_score
-from scipy.sparse import spmatrix
+from scipy.sparse import issparse, spmatrix
 from pathlib import Path
+from typing import List, Tuple
 from look_around.tools import keys
 
+_CACHED_PREDICTIONS = 2
+"""Number of feature matrices whose predictions are remembered, enough for training and validation data."""
+
+
+def _fingerprint(features: spmatrix) -> Tuple:
+    """
+    Identifies a feature matrix by its shape, number of stored values, and a checksum of its content.
+    Unlike the identity of the object, this keeps no reference to the matrix and cannot be handed on
+    to another matrix.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if issparse(features):
+        matrix = features.tocsr()
+        for array in [matrix.data, matrix.indices, matrix.indptr]:
+            digest.update(np.ascontiguousarray(array).tobytes())
+        return (features.shape, matrix.nnz, digest.hexdigest())
+    array = np.ascontiguousarray(features)
+    digest.update(array.tobytes())
+    return (array.shape, array.size, str(array.dtype), digest.hexdigest())
+
+
+def _divide(numerator: npt.NDArray, denominator: npt.NDArray) -> npt.NDArray[np.float_]:
+    """Element-wise division that yields 0 where the denominator is 0."""
+    return np.divide(numerator, denominator, out=np.zeros(len(numerator)), where=denominator > 0)
+
 
 class ModelWrapper():
 
@@ -17,9 +43,12 @@ class ModelWrapper():
     """A spreadsheet with the training scores"""
     val_scores: pd.DataFrame
     """A spreadsheet with the validation scores"""
+    _predictions: List[Tuple[Tuple, npt.NDArray]]
+    """Fingerprints of the last feature matrices predicted along with their predictions, latest first."""
 
     def __init__(self, name: str) -> None:
         self.name = name
+        self._predictions = []
         self.train_scores = pd.DataFrame([], columns=[
             keys.ACCURACY, keys.PRECISION, keys.RECALL, keys.F1], index=[0, 1, 2, 3, 4, 5, 'avg'])
         self.val_scores = pd.DataFrame([], columns=[
@@ -32,27 +61,87 @@ class ModelWrapper():
         """
         Computes the accuracies, precisions, recalls, and f1 scores for the training data.
 
+        features:
+        The feature matrix.
+
         labels:
         The true labels.
-
-        pred:
-        The predicted labels.
         """
-        pred = self.predict(features)
-        acc = self.compute_accuracy(labels, pred)
-        self.train_scores[keys.ACCURACY] = acc
-        prec = self.compute_precision(labels, pred)
-        self.train_scores[keys.PRECISION] = prec
-        rec = self.compute_recall(labels, pred)
-        self.train_scores[keys.RECALL] = rec
-        f1 = self.compute_f1(labels, pred)
-        self.train_scores[keys.F1] = f1
-
+        pred = self.predict_cached(features)
+        self.train_scores = self.compute_scores(labels, pred)
         return self.train_scores
 
     def predict(self, features: spmatrix) -> npt.NDArray:
         return np.array([])
 
+    def predict_proba(self, features: spmatrix, categories: int = 6) -> npt.NDArray[np.float_]:
+        """
+        Estimates how likely each label is for each sample. Models that do not provide probabilities
+        are certain about their predicted label.
+
+        features:
+        The feature matrix.
+
+        categories (default 6):
+        The number of categories.
+
+        returns:
+        Matrix with one row per sample and one column per label.
+        """
+        pred = np.asarray(self.predict(features)).astype(int)
+        proba = np.zeros((len(pred), categories))
+        valid = (pred >= 0) & (pred < categories)
+        proba[np.arange(len(pred))[valid], pred[valid]] = 1.
+        return proba
+
+    def partial_fit(self, features: spmatrix, labels: pd.Series, categories: int = 6) -> bool:
+        """
+        Updates the model with a few more samples, without training it from scratch. The model is
+        changed in memory only.
+
+        features:
+        The feature matrix of the new samples.
+
+        labels:
+        The labels of the new samples.
+
+        categories (default 6):
+        The number of categories.
+
+        returns:
+        False if the model does not support updates, in which case it remains unchanged.
+        """
+        return False
+
+    def predict_cached(self, features: spmatrix) -> npt.NDArray:
+        """
+        Predicts the labels like 'predict', but remembers the predictions of the last few feature
+        matrices. Scoring the same matrix again then takes the remembered predictions. The matrices are
+        recognized by a fingerprint of their content, so the matrices themselves are not kept alive.
+        The remembered predictions are dropped when the model is fitted again.
+
+        features:
+        The feature matrix.
+
+        returns:
+        The predicted labels.
+        """
+        fingerprint = _fingerprint(features)
+        for cached_fingerprint, pred in self._predictions:
+            if cached_fingerprint == fingerprint:
+                return pred
+
+        pred = self.predict(features)
+        self._predictions = [(fingerprint, pred)] + \
+            self._predictions[:_CACHED_PREDICTIONS-1]
+        return pred
+
+    def clear_predictions(self) -> None:
+        """
+        Forgets the remembered predictions. To be called whenever the model changes.
+        """
+        self._predictions = []
+
     def validate(self, features: spmatrix, labels: pd.Series) -> pd.DataFrame:
         """
         Applies the validation data. The predictions are computed for the validation samples
@@ -65,18 +154,88 @@ class ModelWrapper():
         labels:
         The correct labels.
         """
-        pred = self.predict(features)
-        acc = self.compute_accuracy(labels, pred)
-        self.val_scores[keys.ACCURACY] = acc
-        prec = self.compute_precision(labels, pred)
-        self.val_scores[keys.PRECISION] = prec
-        rec = self.compute_recall(labels, pred)
-        self.val_scores[keys.RECALL] = rec
-        f1 = self.compute_f1(labels, pred)
-        self.val_scores[keys.F1] = f1
-
+        pred = self.predict_cached(features)
+        self.val_scores = self.compute_scores(labels, pred)
         return self.val_scores
 
+    def compute_confusion_matrix(self, labels: pd.Series, pred: npt.NDArray, categories: int = 6) -> npt.NDArray[np.int_]:
+        """
+        Counts how often each label is predicted as each label. Labels and predictions outside the range
+        of the categories are not counted.
+
+        ---
+
+        labels:
+        The true labels.
+
+        pred:
+        The predicted labels.
+
+        categories (default 6):
+        The number of categories.
+
+        ---
+
+        returns:
+        Matrix with the true labels along the first axis and the predicted labels along the second one.
+        """
+        labels = np.asarray(labels).astype(int)
+        pred = np.asarray(pred).astype(int)
+        valid = (labels >= 0) & (labels < categories) & (
+            pred >= 0) & (pred < categories)
+        counts = np.bincount(labels[valid] * categories + pred[valid],
+                             minlength=categories * categories)
+        return counts.reshape((categories, categories))
+
+    def compute_scores(self, labels: pd.Series, pred: npt.NDArray, categories: int = 6) -> pd.DataFrame:
+        """
+        Computes the accuracy, precision, recall, and f1 score for each label, and their averages, from a
+        single confusion matrix. The averages are unweighted, except for the accuracy, whose average is
+        the fraction of correct classifications among all samples. A precision, recall, or f1 score
+        without any positive sample or prediction is 0.
+
+        ---
+
+        labels:
+        The true labels.
+
+        pred:
+        The predicted labels.
+
+        categories (default 6):
+        The number of categories.
+
+        ---
+
+        returns:
+        The scores, with the scores of 0 star ratings in row 0, of 5 star ratings in row 5, and the
+        averages in row 'avg' (if categories=6).
+        """
+        labels = np.asarray(labels).astype(int)
+        pred = np.asarray(pred).astype(int)
+        confusion = self.compute_confusion_matrix(labels, pred, categories)
+        true_pos = np.diag(confusion).astype(float)
+        # counted from all samples, as the accuracy of a label takes samples of other labels into account
+        label_count = np.bincount(labels[(labels >= 0) & (
+            labels < categories)], minlength=categories)
+        pred_count = np.bincount(pred[(pred >= 0) & (
+            pred < categories)], minlength=categories)
+        total = len(pred)
+
+        true_neg = total - label_count - pred_count + true_pos
+        acc = (true_pos + true_neg) / total
+        prec = _divide(true_pos, pred_count)
+        rec = _divide(true_pos, label_count)
+        f1 = _divide(2 * true_pos, pred_count + label_count)
+
+        scores = pd.DataFrame({
+            keys.ACCURACY: np.append(acc, np.mean(labels == pred)),
+            keys.PRECISION: np.append(prec, np.mean(prec)),
+            keys.RECALL: np.append(rec, np.mean(rec)),
+            keys.F1: np.append(f1, np.mean(f1))
+        }, index=list(range(categories)) + ['avg'])
+        return scores
+
     def compute_precision(self, labels: pd.Series, pred: npt.NDArray, categories: int = 6) -> npt.NDArray[np.float_]:
         """
         Computes the precision (true positives over all positive classifications) for each label.
@@ -99,10 +258,7 @@ class ModelWrapper():
         The label-specific precisions, with the precision of 0 star ratings at index 0, of 5 star ratings
         at index 5, and the average precision at index 6.
         """
-        label_prec = precision_score(
-            labels, pred, labels=np.arange(categories), average=None)
-        avg = np.mean(label_prec)
-        return np.concatenate([label_prec, [avg]])
+        return self.compute_scores(labels, pred, categories)[keys.PRECISION].values
 
     def compute_accuracy(self, labels: pd.Series, pred: npt.NDArray, categories: int = 6) -> npt.NDArray[np.float_]:
         """
@@ -127,17 +283,7 @@ class ModelWrapper():
         at index 5, and the overall accuracy at index 6 (if categories=6).
 
         """
-        acc = []
-        for label in range(categories):
-            idx1 = labels == label
-            idx2 = pred == label
-            idxTP = idx1 & idx2
-            idxTN = np.logical_not(idx1) & np.logical_not(idx2)
-            acc_label = (len(pred[idxTP]) + len(pred[idxTN])) / len(pred)
-            acc.append(acc_label)
-        acc_mean = accuracy_score(labels, pred)
-        acc.append(acc_mean)
-        return np.array(acc)
+        return self.compute_scores(labels, pred, categories)[keys.ACCURACY].values
 
     def compute_recall(self, labels: pd.Series, pred: npt.NDArray, categories: int = 6) -> npt.NDArray[np.float_]:
         """
@@ -161,10 +307,7 @@ class ModelWrapper():
         The label-specific recalls, with the recall of 0 star ratings at index 0, of 5 star ratings
         at index 5, and the average recall at index 6 (if categories=6).
         """
-        label_rec = recall_score(
-            labels, pred, labels=np.arange(categories), average=None)
-        avg = np.mean(label_rec)
-        return np.concatenate([label_rec, [avg]])
+        return self.compute_scores(labels, pred, categories)[keys.RECALL].values
 
     def compute_f1(self, labels: pd.Series, pred: npt.NDArray, categories: int = 6) -> npt.NDArray[np.float_]:
         """
@@ -188,10 +331,7 @@ class ModelWrapper():
         The label-specific f1s, with the f1 of 0 star ratings at index 0, of 5 star ratings
         at index 5, and the average f1 at index 6 (if categories=6).
         """
-        label_f1 = f1_score(
-            labels, pred, labels=np.arange(categories), average=None)
-        avg = np.mean(label_f1)
-        return np.concatenate([label_f1, [avg]])
+        return self.compute_scores(labels, pred, categories)[keys.F1].values
 
     def write_model(self, dir: Path) -> None:
         """
@@ -17,6 +17,7 @@ class SklearnModel(ModelWrapper):
         self.model = model
 
     def fit(self, features: spmatrix, labels: pd.Series) -> None:
+        self.clear_predictions()
         self.model.fit(features, labels)
         super().compute_training_scores(features, labels)
 
@@ -24,6 +25,29 @@ class SklearnModel(ModelWrapper):
         pred = self.model.predict(features)
         return pred
 
+    def predict_proba(self, features: spmatrix, categories: int = 6) -> npt.NDArray[np.float_]:
+        if not hasattr(self.model, 'predict_proba'):
+            return super().predict_proba(features, categories)
+        model_proba = self.model.predict_proba(features)
+        # the estimator has columns just for the labels it has seen
+        proba = np.zeros((model_proba.shape[0], categories))
+        classes = np.asarray(self.model.classes_).astype(int)
+        valid = (classes >= 0) & (classes < categories)
+        proba[:, classes[valid]] = model_proba[:, valid]
+        return proba
+
+    def partial_fit(self, features: spmatrix, labels: pd.Series, categories: int = 6) -> bool:
+        if not hasattr(self.model, 'partial_fit'):
+            return False
+        # arrays of a model loaded from a file are mapped read-only, but are updated in place
+        for attr, value in vars(self.model).items():
+            if isinstance(value, np.memmap):
+                setattr(self.model, attr, np.array(value))
+        self.clear_predictions()
+        self.model.partial_fit(features, np.asarray(labels).astype(int),
+                               classes=np.arange(categories))
+        return True
+
     def write_model(self, dir: Path) -> None:
         path = Path(dir, f'{self.name}.sklearn')
         dump(self.model, path)
@@ -0,0 +1,196 @@
+import itertools
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from scipy.sparse import load_npz, save_npz, spmatrix
+from look_around.models.model_wrapper import ModelWrapper
+
+_shared: Optional[Tuple[spmatrix, pd.Series, spmatrix, pd.Series]] = None
+"""The training and test data of the sweep, loaded once in each worker process."""
+
+
+def make_grid(prefix: str, estimator: Any, param_grid: Dict[str, List]) -> Dict[str, Any]:
+    """
+    Makes a job of the sweep for each combination of parameters of a sklearn estimator.
+
+    prefix:
+    The names of the models are this prefix followed by the number of the combination.
+
+    estimator:
+    The sklearn estimator. It is cloned for each combination.
+
+    param_grid:
+    The values to be tried, by parameter name.
+
+    returns:
+    The estimators with their parameters set, by model name.
+    """
+    from sklearn.base import clone
+    names = list(param_grid.keys())
+    grid = {}
+    for num, values in enumerate(itertools.product(*[param_grid[name] for name in names])):
+        params = dict(zip(names, values))
+        grid[f'{prefix}_{num}'] = clone(estimator).set_params(**params)
+    return grid
+
+
+class SweepRunner():
+    """
+    Trains and validates many models in a pool of processes. Each job of the sweep is either a sklearn
+    estimator, or a function that takes the model name and returns a wrapped model, like a
+    'TfKerasModel' around a compiled keras model. Such a function must be defined at module level,
+    so that it can be handed to the worker processes.
+
+    The feature matrices are written to disk once and read once by each worker, rather than being
+    sent along with every job. Each model is written to the model directory by the worker that has
+    trained it. Only the scores are sent back.
+    """
+
+    model_dir: Path
+    """The directory the models are written to."""
+    workers: int
+    """Number of processes training models at the same time. With 1, the models are trained in this process."""
+
+    def __init__(self, model_dir: Path, workers: int = 2) -> None:
+        self.model_dir = model_dir
+        self.workers = workers
+
+    def run(self, jobs: Dict[str, Any], train_data: Tuple[spmatrix, pd.Series], test_data: Tuple[spmatrix, pd.Series], skip: Iterable[str] = [], on_done: Callable[[ModelWrapper], None] = None) -> List[str]:
+        """
+        Runs the jobs of the sweep. A job that fails is reported and left out, so it is run again
+        by the next sweep.
+
+        jobs:
+        The sklearn estimators or the functions building the wrapped models, by model name.
+
+        train_data:
+        The training features and labels.
+
+        test_data:
+        The validation features and labels.
+
+        skip (default []):
+        Names of models that have been trained before. Their jobs are not run, so that an interrupted
+        sweep can be resumed.
+
+        on_done (default None):
+        Called in this process once a job has finished. It gets a model wrapper that carries the name,
+        the description, and the training and validation scores of the model, but not the model itself.
+
+        returns:
+        The names of the models that have been trained.
+        """
+        skip = set(skip)
+        todo = [(name, job) for name, job in jobs.items() if name not in skip]
+        if len(todo) == 0:
+            print('no models left to train')
+            return []
+
+        finished = []
+        if self.workers <= 1:
+            global _shared
+            _shared = (train_data[0], train_data[1],
+                       test_data[0], test_data[1])
+            try:
+                for name, job in todo:
+                    result = self._try(name, lambda: _run_job(
+                        name, job, self.model_dir))
+                    self._finish(result, finished, on_done, len(todo))
+            finally:
+                _shared = None
+            return finished
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = _write_shared(Path(tmp_dir), train_data, test_data)
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_load_shared, initargs=(paths,)) as executor:
+                futures = {executor.submit(_run_job, name, job, self.model_dir): name
+                           for name, job in todo}
+                try:
+                    for future in as_completed(futures):
+                        result = self._try(futures[future], future.result)
+                        self._finish(result, finished, on_done, len(todo))
+                except BaseException:
+                    # stopped by the user: jobs not yet started are dropped rather than waited for
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+        return finished
+
+    def _try(self, name: str, get_result: Callable[[], Tuple]) -> Optional[Tuple]:
+        """
+        Gets the result of a job, or prints the error and returns None if the job has failed.
+        Interrupts like KeyboardInterrupt are not caught, so the user can stop the sweep.
+        """
+        try:
+            return get_result()
+        except Exception as ex:
+            print()
+            print(f'could not train model {name}:')
+            print(ex)
+            return None
+
+    def _finish(self, result: Optional[Tuple], finished: List[str], on_done: Optional[Callable[[ModelWrapper], None]], total: int) -> None:
+        """Hands the scores of a finished job to 'on_done'."""
+        if result is None:
+            return
+        name, desc, train_scores, val_scores = result
+        finished.append(name)
+        print(f'\rtrained model {len(finished)} of {total}:', end='')
+        if on_done is not None:
+            scores = ModelWrapper(name)
+            scores.desc = desc
+            scores.train_scores = train_scores
+            scores.val_scores = val_scores
+            on_done(scores)
+
+
+def _build_model(name: str, job: Any) -> ModelWrapper:
+    """Wraps the sklearn estimator, or calls the function that builds the wrapped model."""
+    if hasattr(job, 'get_params'):
+        from sklearn.base import clone
+        from look_around.models.sklearn_model import SklearnModel
+        model = SklearnModel(name, clone(job))
+        model.desc = str(job)
+        return model
+    return job(name)
+
+
+def _run_job(name: str, job: Any, model_dir: Path) -> Tuple[str, Optional[str], pd.DataFrame, pd.DataFrame]:
+    """
+    Trains, validates, and writes a single model. Runs in a worker process.
+
+    returns:
+    The name, the description, the training scores, and the validation scores of the model.
+    """
+    train_features, train_labels, test_features, test_labels = _shared
+    model = _build_model(name, job)
+    model.fit(train_features, train_labels)
+    model.validate(test_features, test_labels)
+    model.write_model(model_dir)
+    desc = getattr(model, 'desc', None)
+    return (name, desc, model.train_scores, model.val_scores)
+
+
+def _write_shared(dir: Path, train_data: Tuple[spmatrix, pd.Series], test_data: Tuple[spmatrix, pd.Series]) -> List[Path]:
+    """
+    Writes the features and labels into the directory, for the workers to read.
+
+    returns:
+    The paths of the training features, training labels, test features, and test labels.
+    """
+    paths = [Path(dir, name) for name in [
+        'train_features.npz', 'train_labels.npy', 'test_features.npz', 'test_labels.npy']]
+    save_npz(paths[0], train_data[0], compressed=False)
+    np.save(paths[1], np.asarray(train_data[1]))
+    save_npz(paths[2], test_data[0], compressed=False)
+    np.save(paths[3], np.asarray(test_data[1]))
+    return paths
+
+
+def _load_shared(paths: List[Path]) -> None:
+    """Initializer of the worker processes: reads the features and labels once per process."""
+    global _shared
+    _shared = (load_npz(paths[0]), pd.Series(np.load(paths[1], allow_pickle=True)),
+               load_npz(paths[2]), pd.Series(np.load(paths[3], allow_pickle=True)))
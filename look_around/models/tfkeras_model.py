@@ -1,6 +1,8 @@
+import tensorflow as tf
 from tensorflow.keras import Model
-from tensorflow.keras.utils import to_categorical
+from tensorflow.keras.utils import Sequence, to_categorical
 from look_around.models.model_wrapper import ModelWrapper
+from look_around.models.csr_batches import CsrBatches
 from scipy.sparse import spmatrix
 import pandas as pd
 from pathlib import Path
@@ -8,29 +10,76 @@ import numpy as np
 import numpy.typing as npt
 
 
+_DEFAULT_BATCH_SIZE = 32
+"""Batch size if none is given, the same as the default of keras."""
+
+
+class _KerasBatches(CsrBatches, Sequence):
+    """
+    Feeds a sparse feature matrix to keras batch by batch. The batches are either densified one
+    at a time, or handed out as sparse tensors for models with a sparse input layer.
+    """
+
+    def __init__(self, features: spmatrix, targets: npt.NDArray = None, batch_size: int = _DEFAULT_BATCH_SIZE, sparse: bool = False, shuffle: bool = False) -> None:
+        CsrBatches.__init__(self, features, targets=targets,
+                            batch_size=batch_size, sparse=sparse, shuffle=shuffle)
+        Sequence.__init__(self)
+
+    def convert(self, batch):
+        if not self.sparse:
+            return CsrBatches.convert(self, batch)
+        coo = batch.tocoo()
+        indices = np.stack([coo.row, coo.col], axis=1).astype(np.int64)
+        tensor = tf.SparseTensor(indices=indices, values=coo.data.astype(
+            np.float32), dense_shape=coo.shape)
+        return tf.sparse.reorder(tensor)
+
+
 class TfKerasModel(ModelWrapper):
 
     model: Model
     batch_size: int
     epochs: int
+    sparse_input: bool
+    """Does the model take sparse tensors? Otherwise, the features are densified batch by batch."""
 
-    def __init__(self, name: str, model: Model, batch_size: int = None, epochs: int = 1) -> None:
+    def __init__(self, name: str, model: Model, batch_size: int = None, epochs: int = 1, sparse_input: bool = False) -> None:
         super().__init__(name)
         self.model = model
         self.batch_size = batch_size
         self.epochs = epochs
+        self.sparse_input = sparse_input
 
     def fit(self, features: spmatrix, labels: pd.Series) -> None:
+        self.clear_predictions()
         cat_labels = to_categorical(labels)
-        self.model.fit(features, cat_labels,
-                       batch_size=self.batch_size, epochs=self.epochs)
+        # the samples are shuffled anew in each epoch, as keras does for arrays
+        self.model.fit(self._make_batches(features, cat_labels, shuffle=True),
+                       epochs=self.epochs)
         super().compute_training_scores(features, labels)
 
     def predict(self, features: spmatrix) -> npt.NDArray:
-        cat_pred = self.model.predict(features)
+        cat_pred = self.model.predict(self._make_batches(features))
         pred = np.argmax(cat_pred, axis=1)  # inverts to_categorical
         return pred
 
+    def predict_proba(self, features: spmatrix, categories: int = 6) -> npt.NDArray[np.float_]:
+        model_proba = self.model.predict(self._make_batches(features))
+        # the output layer may have fewer units than there are categories, if the model has been
+        # built for the labels seen
+        proba = np.zeros((model_proba.shape[0], categories))
+        width = min(model_proba.shape[1], categories)
+        proba[:, :width] = model_proba[:, :width]
+        return proba
+
+    def _make_batches(self, features: spmatrix, targets: npt.NDArray = None, shuffle: bool = False) -> _KerasBatches:
+        """
+        Wraps the features, and the targets if given, so that keras gets them batch by batch. A dense
+        copy of all features is never made.
+        """
+        batch_size = self.batch_size if self.batch_size is not None else _DEFAULT_BATCH_SIZE
+        return _KerasBatches(features, targets=targets, batch_size=batch_size, sparse=self.sparse_input, shuffle=shuffle)
+
     def write_model(self, dir: Path) -> None:
         path = Path(dir, f'{self.name}.keras')
         self.model.save(path)
@@ -0,0 +1,211 @@
+from threading import Condition, Thread
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from scipy.sparse import spmatrix
+from look_around.models.model_wrapper import ModelWrapper
+
+ENTROPY = 'entropy'
+"""Uncertainty: entropy of the predicted label distribution, the expected information of a rating."""
+MARGIN = 'margin'
+"""Uncertainty: one minus the gap between the two most likely labels."""
+LEAST_CONFIDENT = 'least confident'
+"""Uncertainty: one minus the probability of the most likely label."""
+_CHUNK = 10000
+"""Number of samples scored at a time, which bounds the memory for the dense probabilities."""
+
+
+def compute_uncertainty(proba: npt.NDArray[np.float_], method: str = ENTROPY) -> npt.NDArray[np.float_]:
+    """
+    Computes how uncertain the model is about each sample.
+
+    proba:
+    The predicted probabilities, with one row per sample and one column per label.
+
+    method (default entropy):
+    One of 'entropy', 'margin', or 'least confident'.
+
+    returns:
+    The uncertainties, higher for more uncertain samples.
+
+    raises ValueError:
+    If the method is unknown.
+    """
+    if proba.shape[0] == 0:
+        return np.zeros(0)
+    if method == ENTROPY:
+        safe = np.where(proba > 0, proba, 1.)
+        return -np.sum(proba * np.log(safe), axis=1)
+    if method == MARGIN:
+        top_two = -np.partition(-proba, 1, axis=1)[:, :2]
+        return 1. - (top_two[:, 0] - top_two[:, 1])
+    if method == LEAST_CONFIDENT:
+        return 1. - np.max(proba, axis=1)
+    raise ValueError(f'unknown uncertainty method {method}')
+
+
+class ActiveOrder():
+    """
+    Orders unlabeled samples by how uncertain a model is about them, so that ratings are spent on the
+    samples the model learns the most from.
+
+    As ratings arrive, the rated samples leave the order at once. Every 'refit_every' ratings, a model
+    that supports updates is updated with the new ratings in a background thread, and the remaining
+    samples are scored anew. The new scores replace the old ones once all are computed, so the order
+    can be asked for at any time.
+    """
+
+    model: ModelWrapper
+    """The model, which is updated in memory as ratings arrive if it supports updates."""
+    features: spmatrix
+    """The features of the samples, one row per sample."""
+    ids: pd.Index
+    """The samples, in the order of the rows of 'features'."""
+    method: str
+    """How the uncertainty is computed."""
+    refit_every: int
+    """Number of new ratings that trigger an update of the model."""
+    updates: int
+    """Number of times the model has been updated and the samples have been scored anew."""
+    _scores: npt.NDArray[np.float_]
+    """Uncertainty of each sample."""
+    _rated: npt.NDArray[np.bool_]
+    """Has a sample been rated?"""
+    _rows: Dict[str, int]
+    """The row of each sample."""
+    _new_ratings: Dict[str, int]
+    """Ratings not used for an update yet."""
+    _busy: bool
+    """Is an update running?"""
+    _closed: bool
+    _cond: Condition
+    _thread: Optional[Thread]
+
+    def __init__(self, model: ModelWrapper, features: spmatrix, ids: Iterable, method: str = ENTROPY, refit_every: int = 10) -> None:
+        self.model = model
+        self.features = features
+        self.ids = pd.Index(ids)
+        self.method = method
+        self.refit_every = max(1, refit_every)
+        self.updates = 0
+        self._rows = {str(id): row for row, id in enumerate(self.ids)}
+        self._rated = np.zeros(len(self.ids), dtype=bool)
+        self._scores = self._score(np.arange(len(self.ids)))
+        self._new_ratings = {}
+        self._busy = False
+        self._closed = False
+        self._cond = Condition()
+        self._thread = None
+
+    def top(self, count: int, exclude: Iterable = ()) -> List:
+        """
+        Gets the most uncertain samples that have not been rated yet.
+
+        count:
+        Maximum number of samples.
+
+        exclude (default ()):
+        Samples that are left out, like the one shown right now.
+
+        returns:
+        The samples, most uncertain first.
+        """
+        with self._cond:
+            scores = self._scores
+            rated = self._rated.copy()
+        for id in exclude:
+            row = self._rows.get(str(id))
+            if row is not None:
+                rated[row] = True
+        candidates = np.flatnonzero(~rated)
+        if len(candidates) == 0 or count <= 0:
+            return []
+        if len(candidates) > count:
+            best = np.argpartition(-scores[candidates], count - 1)[:count]
+            candidates = candidates[best]
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return list(self.ids[candidates])
+
+    def add_rating(self, id, rating: int) -> None:
+        """
+        Takes note of a new rating. The sample leaves the order right away.
+
+        id:
+        The sample.
+
+        rating:
+        Its rating.
+        """
+        row = self._rows.get(str(id))
+        if row is None:
+            return
+        with self._cond:
+            self._rated[row] = True
+            self._new_ratings[str(id)] = int(rating)
+            if len(self._new_ratings) >= self.refit_every:
+                if self._thread is None:
+                    self._thread = Thread(
+                        target=self._update_loop, daemon=True)
+                    self._thread.start()
+                self._cond.notify()
+
+    def close(self) -> None:
+        """
+        Stops the background thread. Ratings not used for an update yet are dropped.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def wait_idle(self, timeout: float = None) -> bool:
+        """
+        Waits until no update is due anymore.
+
+        returns:
+        True if no update is due.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: (not self._busy and len(self._new_ratings) < self.refit_every) or self._closed, timeout)
+
+    def _score(self, rows: npt.NDArray[np.int_]) -> npt.NDArray[np.float_]:
+        """Computes the uncertainties of the samples in the given rows, in chunks."""
+        scores = np.zeros(len(self.ids))
+        for start in range(0, len(rows), _CHUNK):
+            chunk = rows[start:start+_CHUNK]
+            proba = self.model.predict_proba(self.features[chunk])
+            scores[chunk] = compute_uncertainty(proba, self.method)
+        return scores
+
+    def _update_loop(self) -> None:
+        """Updates the model and scores the samples anew whenever enough ratings have arrived."""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._closed or len(
+                    self._new_ratings) >= self.refit_every)
+                if self._closed:
+                    return
+                new_ratings = self._new_ratings
+                self._new_ratings = {}
+                self._busy = True
+                unrated = np.flatnonzero(~self._rated)
+
+            rows = np.array([self._rows[id] for id in new_ratings.keys()])
+            try:
+                updated = self.model.partial_fit(
+                    self.features[rows], np.array(list(new_ratings.values())))
+                if updated:
+                    scores = self._score(unrated)
+                    with self._cond:
+                        self._scores = scores
+                        self.updates += 1
+            except BaseException as be:
+                print('could not update the model for ordering the samples')
+                print(be)
+
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
@@ -0,0 +1,145 @@
+from collections import OrderedDict
+from threading import Condition, Thread
+from typing import Callable, Iterable, List
+
+_DEFAULT_MAX_PAGES = 32
+"""Default number of pages kept in memory."""
+
+
+class PageCache():
+    """
+    Keeps recently loaded pages in memory and loads pages that are likely to be shown next in a
+    background thread. Once the cache is full, the page that has not been asked for for the longest
+    time is dropped.
+
+    Pages are identified by a key, usually the path of the file, and loaded by a loader function. The
+    loader runs in the background thread for prefetched pages, so it must not touch the GUI.
+    """
+
+    loader: Callable[[str], str]
+    """Loads the page with the given key."""
+    max_pages: int
+    """Maximum number of pages kept."""
+    _pages: OrderedDict
+    """The pages, by key, from least to most recently used."""
+    _pending: List[str]
+    """Keys of the pages to be prefetched, in the order they are loaded."""
+    _closed: bool
+    _cond: Condition
+    _thread: Thread
+
+    def __init__(self, loader: Callable[[str], str], max_pages: int = _DEFAULT_MAX_PAGES) -> None:
+        self.loader = loader
+        self.max_pages = max(1, max_pages)
+        self._pages = OrderedDict()
+        self._pending = []
+        self._closed = False
+        self._cond = Condition()
+        self._thread = Thread(target=self._prefetch_loop, daemon=True)
+        self._thread.start()
+
+    def get(self, key: str) -> str:
+        """
+        Gets the page, from memory if it is there and from the loader otherwise.
+
+        key:
+        The key of the page.
+
+        returns:
+        The page.
+
+        raises BaseException:
+        Whatever the loader raises if the page cannot be loaded.
+        """
+        with self._cond:
+            try:
+                self._pages.move_to_end(key)
+                return self._pages[key]
+            except KeyError:
+                pass
+
+        page = self.loader(key)
+        with self._cond:
+            self._keep(key, page)
+        return page
+
+    def prefetch(self, keys: Iterable[str]) -> None:
+        """
+        Loads the pages in the background, in the given order. Pages of an earlier call that have not
+        been loaded yet are not loaded anymore, as they are probably not needed soon.
+
+        keys:
+        The keys of the pages.
+        """
+        with self._cond:
+            self._pending = [key for key in keys if key not in self._pages]
+            self._cond.notify()
+
+    def contains(self, key: str) -> bool:
+        """
+        returns:
+        True if the page is in memory.
+        """
+        with self._cond:
+            return key in self._pages
+
+    def clear(self) -> None:
+        """
+        Drops all pages and all pending prefetches.
+        """
+        with self._cond:
+            self._pages.clear()
+            self._pending = []
+
+    def close(self) -> None:
+        """
+        Stops the background thread. The cache still works afterwards, but does not prefetch anymore.
+        """
+        with self._cond:
+            self._closed = True
+            self._pending = []
+            self._cond.notify()
+        self._thread.join()
+
+    def wait_idle(self, timeout: float = None) -> bool:
+        """
+        Waits until all pending prefetches are done.
+
+        timeout (default None):
+        Maximum time to wait in seconds, or None for waiting as long as it takes.
+
+        returns:
+        True if nothing is pending anymore.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: len(self._pending) == 0 or self._closed, timeout)
+
+    def _keep(self, key: str, page: str) -> None:
+        """Adds the page as the most recently used one, dropping the least recently used ones beyond the limit."""
+        self._pages[key] = page
+        self._pages.move_to_end(key)
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+
+    def _prefetch_loop(self) -> None:
+        """Loads the pending pages, one after the other, until the cache is closed."""
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: len(self._pending) > 0 or self._closed)
+                if self._closed:
+                    return
+                key = self._pending[0]
+
+            try:
+                page = self.loader(key)
+            except BaseException:
+                # reported when the page is actually shown
+                page = None
+
+            with self._cond:
+                if page is not None and key not in self._pages:
+                    self._keep(key, page)
+                if len(self._pending) > 0 and self._pending[0] == key:
+                    self._pending.pop(0)
+                self._cond.notify_all()
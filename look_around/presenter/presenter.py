@@ -1,12 +1,21 @@
 from random import randint
+from html import escape
+from typing import List
 from look_around.presenter.rating_window import RatingWindow
 from look_around.presenter.rating_controller import RatingController
+from look_around.presenter.page_cache import PageCache
+from look_around.core.rating_journal import RatingJournal
+from look_around.presenter.active_order import ActiveOrder
 from pandas import DataFrame
 import numpy as np
 from look_around.core.project import Project
 from look_around.tools import keys
 from pathlib import Path
 from numpy import isnan
+import pandas as pd
+
+_PREFETCH = 5
+"""Default number of samples loaded ahead in each direction."""
 
 
 class Presenter(RatingController):
@@ -21,21 +30,56 @@ class Presenter(RatingController):
     rat_win: RatingWindow
     data: DataFrame
     cur_idx: int
+    prefetch: int
+    """Number of samples loaded in the background ahead of and behind the current sample."""
+    cleaned: bool
+    """Show the prepared text instead of the raw html, where there is a prepared file?"""
+    pages: PageCache
+    """The recently shown and the prefetched pages."""
+    journal: RatingJournal
+    """Where the ratings are noted down as they are given. None if they are kept in memory only."""
+    order: ActiveOrder
+    """
+    If given, 'next' moves to the unrated sample the model is most uncertain about, and 'prev' moves
+    back along the samples shown. If None, the samples are shown in the order of 'data'.
+    """
+    history: List[int]
+    """Positions of the samples shown in the order of the model, the current one last."""
 
-    def __init__(self, data: DataFrame, dir: Path) -> None:
+    def __init__(self, data: DataFrame, dir: Path, prefetch: int = _PREFETCH, cleaned: bool = False, journal: RatingJournal = None, order: ActiveOrder = None) -> None:
         self.data = data
         self.dir = dir
         if len(data) > 0:
             self.cur_idx = 0
         else:
             self.cur_idx = -1
+        self.prefetch = prefetch
+        self.cleaned = cleaned
+        # room for the prefetched samples on both sides plus those just seen
+        self.pages = PageCache(self._load_page, max_pages=4 * prefetch + 2)
+        self.journal = journal
+        self.order = order
+        self.history = []
+        if order is not None:
+            # nothing has been shown yet, so the first sample is as good a pick as any other
+            self._move_to_most_uncertain(exclude_current=False)
 
     def show(self) -> None:
         self.rat_win = RatingWindow(self)
         self._update_view()
         self.rat_win.mainloop()
+        self.pages.close()
+        if self.journal is not None:
+            self.journal.close()
+        if self.order is not None:
+            self.order.close()
 
     def prev(self) -> None:
+        if self.order is not None and len(self.history) > 1:
+            self.history.pop()
+            self.cur_idx = self.history[-1]
+            self._update_view()
+            return
         self.cur_idx -= 1
         if self.cur_idx < 0:
             # luckily, this ends up at -1 if there is no data in 'data'
@@ -43,6 +87,9 @@ class Presenter(RatingController):
         self._update_view()
 
     def next(self) -> None:
+        if self.order is not None and self._move_to_most_uncertain():
+            self._update_view()
+            return
         self.cur_idx += 1
         if self.cur_idx >= len(self.data):
             if len(self.data) > 0:
@@ -55,8 +102,16 @@ class Presenter(RatingController):
         idx = self.data.index[self.cur_idx]
         self.data.loc[idx, keys.RATING] = rating
         self.data.loc[idx, keys.LABELED_BY] = 'me'  # TODO: localize
+        if self.journal is not None:
+            self.journal.record(idx, rating, 'me')
+        if self.order is not None:
+            self.order.add_rating(idx, rating)
         self.rat_win.set_rating(rating)
 
+    def toggle_cleaned(self) -> None:
+        self.cleaned = not self.cleaned
+        self._update_html()
+
     def _update_view(self) -> None:
         """
         Updates all sample-specific GUI elements: the html panel and the rating.
@@ -75,13 +130,83 @@ class Presenter(RatingController):
             self.rat_win.load_html(html)
             return
 
-        sub_path = self.data[keys.RAW_FILE][self.cur_idx]
-        full_path = Path(self.dir, sub_path)
+        full_path = self._get_page_path(self.cur_idx)
         try:
-            self.rat_win.load_file(str(full_path))
+            html = self.pages.get(str(full_path))
         except:
             html = '<html><head></head><body><h1>Exception</h1></body></html>'
-            self.rat_win.load_html(html)
+        self.rat_win.load_html(html)
+        self.pages.prefetch([str(path) for path in self._get_neighbour_paths()])
+
+    def _get_page_path(self, pos: int) -> Path:
+        """
+        Gets the file shown for the sample at the given position: the prepared file if the cleaned text
+        is to be shown and the sample has been prepared, and the raw file otherwise.
+        """
+        if self.cleaned:
+            try:
+                prep_file = self.data[keys.PREP_FILE].iloc[pos]
+                if pd.notna(prep_file):
+                    return Path(self.dir, str(prep_file))
+            except KeyError:
+                pass  # no sample prepared yet
+        return Path(self.dir, str(self.data[keys.RAW_FILE].iloc[pos]))
+
+    def _move_to_most_uncertain(self, exclude_current: bool = True) -> bool:
+        """
+        Moves to the unrated sample the model is most uncertain about, other than the current one.
+
+        exclude_current (default True):
+        Skip the current sample? False for the very first pick, when no sample has been shown yet.
+
+        returns:
+        False if there is no such sample, in which case the current sample remains.
+        """
+        exclude = [self.data.index[self.cur_idx]
+                   ] if exclude_current and self.cur_idx >= 0 else []
+        ids = self.order.top(1, exclude=exclude)
+        if len(ids) == 0:
+            return False
+        self.cur_idx = self.data.index.get_loc(ids[0])
+        self.history.append(self.cur_idx)
+        return True
+
+    def _get_neighbour_paths(self) -> List[Path]:
+        """
+        returns:
+        The files of the next and previous samples, alternating and starting with the next one, as
+        these are likely to be shown soon. In the order of the model, the next samples are the most
+        uncertain ones.
+        """
+        if self.order is not None:
+            ids = self.order.top(
+                self.prefetch, exclude=[self.data.index[self.cur_idx]])
+            return [self._get_page_path(self.data.index.get_loc(id)) for id in ids]
+
+        count = len(self.data)
+        positions = []
+        for step in range(1, min(self.prefetch, count // 2) + 1):
+            positions += [(self.cur_idx + step) % count,
+                          (self.cur_idx - step) % count]
+        return [self._get_page_path(pos) for pos in positions]
+
+    def _load_page(self, key: str) -> str:
+        """
+        Reads the file of a sample as html. A prepared file is plain text and becomes wrapped into
+        html. Runs in the background thread of the page cache for prefetched samples.
+
+        key:
+        The path of the file.
+
+        returns:
+        The html.
+        """
+        path = Path(key)
+        with open(path, 'rt') as file:
+            text = file.read()
+        if path.suffix == '.txt':
+            return f'<html><head></head><body><p>{escape(text)}</p></body></html>'
+        return text
 
     def _get_rating(self) -> int:
         """
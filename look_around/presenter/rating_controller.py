@@ -21,3 +21,9 @@ class RatingController():
         The rating in stars.
         """
         pass
+
+    def toggle_cleaned(self) -> None:
+        """
+        Switches between showing the raw html and the smaller, cleaned text of the samples.
+        """
+        pass
@@ -52,8 +52,10 @@ class RatingWindow(Tk):
             column=7, row=1, rowspan=2)
         Button(frm, text="5", command=self._rate_5).grid(
             column=8, row=1, rowspan=2)
+        Button(frm, text="Text", command=self._toggle_cleaned).grid(
+            column=9, row=1, rowspan=2)  # TODO: localize
         Button(frm, text="Quit", command=self.destroy).grid(
-            column=0, row=3, columnspan=9)
+            column=0, row=3, columnspan=10)
         self.web.pack(fill="both", expand=True)
 
     def _prev(self) -> None:
@@ -62,6 +64,9 @@ class RatingWindow(Tk):
     def _next(self) -> None:
         self.controller.next()
 
+    def _toggle_cleaned(self) -> None:
+        self.controller.toggle_cleaned()
+
     def _rate_0(self) -> None:
         self.controller.rate(0)
 
@@ -2,7 +2,8 @@ from pathlib import Path
 from look_around.run import run_gen
 import pandas as pd
 from look_around.dev_tools.sample_gen import SampleGen as SG
-from look_around.doc_process import html_cleaning, stops_removal, stemming, vocab_extraction
+from look_around.doc_process import vocab_extraction
+from look_around.doc_process.document_pipeline import DocumentPipeline
 from sklearn.model_selection import train_test_split
 from look_around.core.project import Project
 from look_around.tools import keys
@@ -15,11 +16,12 @@ def create_dev_project(size: int, name: str, parent: Path) -> Project:
     file_data = []
     docs = []
     successes = 0
+    lang = 'english'
+    pipeline = DocumentPipeline([lang])
     train_dir = Path(prj.root_dir, prj.training_dir).absolute()
     print('writing to '+str(train_dir))
 
     for _ in range(size):
-        lang = 'english'
         # generate labeled sample
         sg.new_req(print_ranking=False, print_req=False)
 
@@ -43,9 +45,8 @@ def create_dev_project(size: int, name: str, parent: Path) -> Project:
             ok = False
 
         # generate preprocessed and prepared document
-        prepared = html_cleaning.clean_html(html)
-        prepared = stops_removal.remove_stop_words(prepared, lang=lang)
-        prepared = stemming.stem(prepared, lang=lang)
+        _, words = pipeline.process(html, lang=lang)
+        prepared = ' '.join(words)
         full_path = Path(train_dir, prep_sub_path)
         try:
             with open(full_path, 'wt') as file:
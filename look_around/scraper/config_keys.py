@@ -8,9 +8,19 @@ REPEAT = 'repeat'
 """The repeat mode."""
 CHILD = 'child'
 """A special child the follow up actions are applied to."""
+UNTIL = 'until'
+"""The condition a wait action waits for."""
+IDLE = 'idle'
+"""Seconds without a new network request before the network counts as idle."""
 
 # _______________  values  _______________
 NO = 'no'
 """do not repeat the action"""
 AS_LONG_AS_POSSIBLE = 'as long as possible'
 """Repeat as long as possible."""
+DOM_READY = 'dom ready'
+"""Wait until the document has been loaded completely."""
+ELEMENT = 'element'
+"""Wait until the element described by the children is present."""
+NETWORK_IDLE = 'network idle'
+"""Wait until the document has been loaded and no further resources have been requested for a while."""
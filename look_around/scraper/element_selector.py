@@ -0,0 +1,149 @@
+from typing import List, Optional, Union
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.shadowroot import ShadowRoot
+from selenium.webdriver.remote.webelement import WebElement
+
+
+def get_by(type: str) -> str:
+    """
+    Gets the literal of the instance of 'By' that relates to the type given in the argument.
+    The 'type' originates from your 'look_around_config.json' and is part of an entry in a
+    'children' array.
+
+    type:
+    The type. This is not stripped. So make sure there are no blanks around.
+
+    returns:
+    The By depending on the type. Values allowed for 'type' are id, tag, class, css, and name. These relate to
+    By.ID, By.TAG_NAME, By.CLASS_NAME, By.CSS_SELECTOR, and By.NAME, respectively.
+
+    raises:
+    ValueError if passing an invalid argument.
+    """
+    if type == 'id':
+        return By.ID
+    elif type == 'tag':
+        return By.TAG_NAME
+    elif type == 'class':
+        return By.CLASS_NAME
+    elif type == 'css':
+        return By.CSS_SELECTOR
+    elif type == 'name':
+        return By.NAME
+    else:
+        raise ValueError('Invalid By Finder provided')
+
+
+class Selector():
+    """
+    Describes how to find a child element, parsed from an entry like 'class=item' or 'tag=li[2]' in the
+    'children' of an action configuration. Without an index, the first match is the child.
+    """
+
+    by: str
+    """The element finder, one of the values of 'By'."""
+    value: str
+    """The value the finder looks for."""
+    index: Optional[int]
+    """Position of the child among all matches, or None for the first match."""
+    shadow: bool
+    """Look within the shadow root of the parent instead of the parent itself?"""
+
+    def __init__(self, by: str, value: str, index: Optional[int] = None, shadow: bool = False) -> None:
+        self.by = by
+        self.value = value
+        self.index = index
+        self.shadow = shadow
+
+    def find(self, parent: Union[WebElement, ShadowRoot]) -> WebElement:
+        """
+        Finds the child.
+
+        parent:
+        Element to look from.
+
+        returns:
+        The child.
+
+        raises:
+        NoSuchElementException if there is no match.
+
+        IndexError if there are fewer matches than the index requires.
+        """
+        root = parent.shadow_root if self.shadow else parent
+        if self.index is None:
+            return root.find_element(self.by, self.value)
+        return root.find_elements(self.by, self.value)[self.index]
+
+    def find_all(self, parent: Union[WebElement, ShadowRoot]) -> List[WebElement]:
+        """
+        Finds all matches, regardless of the index.
+
+        parent:
+        Element to look from.
+
+        returns:
+        The matches.
+        """
+        root = parent.shadow_root if self.shadow else parent
+        return root.find_elements(self.by, self.value)
+
+    def with_index(self, index: int) -> 'Selector':
+        """
+        returns:
+        A selector for the match at the given position.
+        """
+        return Selector(self.by, self.value, index, self.shadow)
+
+    def within_shadow_root(self) -> 'Selector':
+        """
+        returns:
+        The same selector, looking within the shadow root of the parent.
+        """
+        return Selector(self.by, self.value, self.index, True)
+
+    def __repr__(self) -> str:
+        text = f'{self.by}={self.value}'
+        if self.index is not None:
+            text += f'[{self.index}]'
+        return text
+
+
+def parse_selector(child: str, indexed: bool = True) -> Selector:
+    """
+    Parses an entry of 'children'. The entry is a =-separated key value pair. The key names the
+    element finder, see 'get_by'. The value may end with an index in square brackets, like [3].
+
+    child:
+    The entry.
+
+    indexed (default True):
+    Is an index allowed?
+
+    returns:
+    The selector.
+
+    raises:
+    ValueError if the entry is badly formatted.
+    """
+    kvp = child.strip().split('=')
+    if len(kvp) != 2 or len(kvp[0].strip()) == 0 or len(kvp[1].strip()) == 0:
+        raise ValueError(
+            f'key value pair {child.strip()} does not have exactly one non-empty key and one non-empty value separated by an equal sign (=), aborting.')
+    by = get_by(kvp[0].strip())
+    val = kvp[1].strip()
+    if not val.endswith(']'):
+        return Selector(by, val)
+
+    if not indexed:
+        raise ValueError(f'{child.strip()} must not have an index')
+    # the [x], x a number, is the index in an array and must be stripped from val and parsed
+    opn = val.rfind('[') + 1
+    try:
+        idx = int(val[opn:len(val)-1])
+    except ValueError:
+        raise ValueError(f'{child.strip()} does not end with a valid index')
+    val = val[:opn-1].strip()
+    if opn == 0 or len(val) == 0:
+        raise ValueError(f'{child.strip()} does not end with a valid index')
+    return Selector(by, val, idx)
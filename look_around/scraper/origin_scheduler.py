@@ -0,0 +1,103 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+from look_around.scraper.page_handlers.page_handler import PageHandler
+from look_around.scraper.rate_limiter import HostRateLimiter
+from look_around.scraper.selenium_scraper import SeleniumScraper
+from look_around.scraper.session_pool import SessionPool
+
+
+def group_by_host(origins: List[Dict]) -> List[List[Dict]]:
+    """
+    Groups the origins by the host of their base url. Origins without a base url are left out.
+
+    origins:
+    The configurations of the origins.
+
+    returns:
+    The groups, in the order the hosts first occur.
+    """
+    groups: Dict[str, List[Dict]] = OrderedDict()
+    for origin in origins:
+        try:
+            host = urlparse(origin['base_url']).netloc.lower()
+        except KeyError:
+            print('Cannot scrape origin: no base url')
+            continue
+        groups.setdefault(host, []).append(origin)
+    return list(groups.values())
+
+
+class OriginScheduler():
+    """
+    Scrapes many origins at the same time, each on a browser session lent from a session pool.
+
+    Origins on different hosts run concurrently. Origins on the same host run one after the other,
+    and the requests to a host are paced by the rate limiter, so running origins concurrently does
+    not make the scraping of a single host any faster.
+    """
+
+    pool: SessionPool
+    """The browser sessions."""
+    browser: str
+    make_handlers: Callable[[Dict], Dict[str, PageHandler]]
+    """Creates the page handlers of a scraper, by name, for the given origin."""
+    rate_limiter: Optional[HostRateLimiter]
+    """Shared by all scrapers. Requests are not delayed if None."""
+
+    def __init__(self, pool: SessionPool, browser: str, make_handlers: Callable[[Dict], Dict[str, PageHandler]], rate_limiter: Optional[HostRateLimiter] = None) -> None:
+        self.pool = pool
+        self.browser = browser
+        self.make_handlers = make_handlers
+        self.rate_limiter = rate_limiter
+
+    def run(self, origins: List[Dict]) -> Dict[str, bool]:
+        """
+        Scrapes the origins and waits until all are done.
+
+        origins:
+        The configurations of the origins.
+
+        returns:
+        By name of the origin, or by base url if the origin has no name, whether the origin has been
+        scraped without being aborted.
+        """
+        groups = group_by_host(origins)
+        results: Dict[str, bool] = {}
+        if len(groups) == 0:
+            return results
+
+        workers = min(len(groups), self.pool.max_sessions)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for group_results in executor.map(self._run_group, groups):
+                results.update(group_results)
+        return results
+
+    def _run_group(self, group: List[Dict]) -> Dict[str, bool]:
+        """Scrapes the origins of one host, one after the other."""
+        results = {}
+        for origin in group:
+            name = str(origin.get('origin', origin['base_url']))
+            results[name] = self._run_origin(origin)
+        return results
+
+    def _run_origin(self, origin: Dict) -> bool:
+        """Scrapes a single origin on a lent session."""
+        try:
+            actions = origin['actions']
+        except KeyError:
+            print('Cannot scrape origin: no actions')
+            return False
+
+        scraper = SeleniumScraper(
+            origin['base_url'], self.browser, rate_limiter=self.rate_limiter)
+        for name, handler in self.make_handlers(origin).items():
+            scraper.register_page_handler(name, handler)
+        try:
+            with self.pool.session() as driver:
+                return scraper.run(actions, driver=driver)
+        except BaseException as be:
+            print(f'could not scrape {origin["base_url"]}:')
+            print(be)
+            return False
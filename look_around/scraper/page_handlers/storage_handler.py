@@ -0,0 +1,159 @@
+from pathlib import Path
+from queue import Empty, Queue
+from threading import Thread
+from typing import List, Optional
+import pandas as pd
+from selenium.webdriver.remote.webdriver import WebDriver
+from look_around.core.dedup_index import DedupIndex
+from look_around.core.project import Project
+from look_around.doc_process.html_cleaning import html_to_words
+from look_around.scraper.page_handlers.page_handler import PageHandler
+from look_around.tools import keys
+
+_FLUSH = object()
+"""Queued for requesting the background thread to update the file index right away."""
+
+
+class StorageHandler(PageHandler):
+    """
+    Stores the scraped pages as raw sample files of a project, in the training directory or in the data
+    directory. Each page gets an id and a subdirectory from 'Project.create_sample_id', and is written
+    to 'NNNN/id-raw.html'.
+
+    The browser just takes the page source and goes on. Writing the files is left to a background
+    thread, which also adds the new files to the file index in batches. Call 'close' once scraping is
+    done, so that all pages are written.
+
+    With a dedup index, pages whose cleaned text is the same as or similar to a known sample are not
+    stored, but linked to the known sample in the dedup index.
+    """
+
+    prj: Project
+    """The project the pages are stored in."""
+    origin: str
+    """Noted down as origin of the samples."""
+    training: bool
+    """Store into the training directory? Otherwise, the pages are stored into the data directory."""
+    batch_size: int
+    """Number of new files that are added to the file index at once."""
+    flush_interval: float
+    """Maximum time in seconds a written file waits for being added to the file index."""
+    dedup: Optional[DedupIndex]
+    """Fingerprints of the known samples. Duplicates are stored as well if None."""
+    stored: int
+    """Number of pages written so far."""
+    duplicates: int
+    """Number of pages not stored for being duplicates."""
+    _queue: Queue
+    """Pages waiting for being written, as path relative to the mode directory and page source."""
+    _thread: Thread
+
+    def __init__(self, prj: Project, origin: str, training: bool = True, batch_size: int = 50, flush_interval: float = 2.0, dedup: Optional[DedupIndex] = None) -> None:
+        self.prj = prj
+        self.dedup = dedup
+        self.origin = origin
+        self.training = training
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.stored = 0
+        self.duplicates = 0
+        self._queue = Queue()
+        self._thread = Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+
+    def handle_page(self, driver: WebDriver) -> None:
+        sample = self.prj.create_sample_id()
+        raw_file = f'{sample["path"]}-raw.html'
+        self._queue.put((raw_file, driver.page_source, driver.current_url))
+
+    def flush(self) -> None:
+        """
+        Waits until all pages handled so far are written and listed in the file index.
+        """
+        self._queue.put(_FLUSH)
+        self._queue.join()
+
+    def close(self) -> None:
+        """
+        Writes the remaining pages and stops the background thread.
+        """
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _write_loop(self) -> None:
+        """
+        Writes the pages as they come in. The written files are added to the file index when a batch is
+        full, when no page has come in for 'flush_interval' seconds, or on request.
+        """
+        raw_files: List[str] = []
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except Empty:
+                self._add_to_index(raw_files)
+                raw_files = []
+                continue
+
+            if isinstance(item, tuple):
+                raw_file = self._write_page(*item)
+                if raw_file is not None:
+                    raw_files.append(raw_file)
+            if item is None or item is _FLUSH or len(raw_files) >= self.batch_size:
+                self._add_to_index(raw_files)
+                raw_files = []
+            self._queue.task_done()
+            if item is None:
+                return
+
+    def _write_page(self, raw_file: str, source: str, url: str) -> Optional[str]:
+        """
+        Writes the page. The url is noted down in the dedup index if the page is a duplicate.
+
+        returns:
+        The path relative to the mode directory, or None if the page is a duplicate or could not be written.
+        """
+        if self.dedup is not None:
+            try:
+                known = self.dedup.find_or_add(
+                    raw_file, html_to_words(source), self.origin, url)
+            except BaseException as be:
+                print('could not look for duplicates, storing the page anyway')
+                print(be)
+                known = None
+            if known is not None:
+                self.duplicates += 1
+                return None
+
+        full_path = Path(self._get_mode_dir(), raw_file)
+        try:
+            full_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(full_path, 'wt') as file:
+                file.write(source)
+            self.stored += 1
+            return raw_file
+        except BaseException as be:
+            print(f'could not store page {raw_file}:')
+            print(be)
+            if self.dedup is not None:
+                self.dedup.remove(raw_file)
+            return None
+
+    def _add_to_index(self, raw_files: List[str]) -> None:
+        """Adds the written files to the file index."""
+        if len(raw_files) == 0:
+            return
+        rows = pd.DataFrame({keys.RAW_FILE: raw_files, keys.ORIGIN: self.origin},
+                            index=raw_files)
+        try:
+            if self.training:
+                self.prj.append_training_index_rows(rows)
+            else:
+                self.prj.append_data_index_rows(rows)
+        except BaseException as be:
+            # the files are found by the next scan for new files anyway
+            print('could not add the stored pages to the file index')
+            print(be)
+
+    def _get_mode_dir(self) -> Path:
+        return self.prj.training_dir if self.training else self.prj.data_dir
@@ -0,0 +1,89 @@
+import time
+from threading import Lock
+from typing import Dict
+from urllib.parse import urlparse
+
+
+class TokenBucket():
+    """
+    Lets requests pass at a steady rate, with short bursts. Each request takes a token, and tokens
+    refill at 'rate' per second up to 'capacity'. Without a token, the caller waits until one is due.
+    """
+
+    rate: float
+    """Tokens added per second."""
+    capacity: float
+    """Maximum number of tokens, the size of a burst."""
+    _tokens: float
+    """Tokens available. Negative when tokens have been promised to waiting callers."""
+    _last: float
+    _lock: Lock
+
+    def __init__(self, rate: float, capacity: float = 1) -> None:
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = Lock()
+
+    def acquire(self) -> float:
+        """
+        Takes a token, waiting until it is due if necessary. Callers are served in order.
+
+        returns:
+        The time waited in seconds.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens +
+                               (now - self._last) * self.rate)
+            self._last = now
+            # the token is reserved right now, so callers coming later queue behind
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class HostRateLimiter():
+    """
+    Keeps a token bucket per host, so that scraping a site never exceeds a polite rate of requests,
+    no matter how many browser sessions are open. Different hosts do not slow each other down.
+
+    All methods can be called from several threads.
+    """
+
+    rate: float
+    """Requests per second allowed for a single host."""
+    burst: int
+    """Requests allowed in a row before the rate applies."""
+    _buckets: Dict[str, TokenBucket]
+    _lock: Lock
+
+    def __init__(self, rate: float = 1.0, burst: int = 3) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = Lock()
+
+    def acquire(self, url: str) -> float:
+        """
+        Waits until a request to the host of the url is allowed.
+
+        url:
+        The url requested, or any other url on the same host.
+
+        returns:
+        The time waited in seconds.
+        """
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            try:
+                bucket = self._buckets[host]
+            except KeyError:
+                bucket = TokenBucket(self.rate, self.burst)
+                self._buckets[host] = bucket
+        return bucket.acquire()
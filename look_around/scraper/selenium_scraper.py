@@ -1,16 +1,71 @@
 from selenium import webdriver
-from selenium.common.exceptions import StaleElementReferenceException
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException, WebDriverException
 from selenium.webdriver import ActionChains
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.remote.shadowroot import ShadowRoot
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.wait import WebDriverWait
 import time
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional, Tuple
+from urllib.parse import urljoin, urlparse
 import random
 from look_around.scraper.page_handlers.page_handler import PageHandler
 from look_around.scraper import config_keys as ck
+from look_around.scraper.element_selector import Selector, get_by, parse_selector
+from look_around.scraper.rate_limiter import HostRateLimiter
+
+Lineage = List[Tuple[Selector, WebElement]]
+"""The path from the html element to an element: each step with the selector used and the element found."""
+
+_ACTION_TYPES = ['list', 'click', 'sleep', 'wait', 'back',
+                 'handle', 'simple cookie dialog', 'shadow child']
+"""The types of actions known."""
+_CONDITIONS = [ck.DOM_READY, ck.ELEMENT, ck.NETWORK_IDLE]
+"""What a wait action can wait for."""
+_DEFAULT_TIMEOUT = 10
+"""Seconds waited for a condition unless configured otherwise."""
+_DEFAULT_IDLE = 0.5
+"""Seconds without new requests for the network idle condition unless configured otherwise."""
+_MIN_POLL = 0.05
+"""Shortest time in seconds between two checks of the state of the page."""
+_NAVIGATION_TIMEOUT = 2
+"""Seconds waited for a click to leave the page. A click that does not navigate changes the page in place."""
+_PAGE_ERRORS = [WebDriverException]
+"""Errors of scripts run while the browser is between two pages, like a JavascriptException. They are retried while waiting."""
+
+
+def make_driver(browser: str, headless: bool = False) -> Optional[WebDriver]:
+    """
+    Starts a browser session.
+
+    browser:
+    One of chrome, firefox, edge, and safari.
+
+    headless (default False):
+    Start the browser without a window? Safari has no headless mode and always opens a window.
+
+    returns:
+    The web driver, or None if the browser is not supported.
+    """
+    if browser == 'chrome':
+        options = webdriver.ChromeOptions()
+        if headless:
+            options.add_argument('--headless=new')
+        return webdriver.Chrome(options=options)
+    elif browser == 'firefox':
+        options = webdriver.FirefoxOptions()
+        if headless:
+            options.add_argument('-headless')
+        return webdriver.Firefox(options=options)
+    elif browser == 'edge':
+        options = webdriver.EdgeOptions()
+        if headless:
+            options.add_argument('--headless=new')
+        return webdriver.Edge(options=options)
+    elif browser == 'safari':
+        return webdriver.Safari()
+    return None
 
 
 class SeleniumScraper():
@@ -18,34 +73,154 @@ class SeleniumScraper():
     base_url: str
     browser: str
     handlers: Dict[str, PageHandler]
+    readiness: Optional[str]
+    """Condition waited for after each navigation, like opening the base url, a click, or going back. No waiting if None."""
+    rate_limiter: Optional[HostRateLimiter]
+    """Delays requests for not exceeding a polite rate per host. Requests are not delayed if None."""
 
-    def __init__(self, base_url: str, browser: str) -> None:
+    def __init__(self, base_url: str, browser: str, readiness: Optional[str] = ck.DOM_READY, rate_limiter: Optional[HostRateLimiter] = None) -> None:
         self.base_url = base_url
         self.browser = browser
         self.handlers = {}
+        self.readiness = readiness
+        self.rate_limiter = rate_limiter
 
-    def run(self, actions: List):
-        if self.browser == 'chrome':
-            driver = webdriver.Chrome()
-        elif self.browser == 'firefox':
-            driver = webdriver.Firefox()
-        elif self.browser == 'edge':
-            driver = webdriver.Edge()
-        elif self.browser == 'safari':
-            driver = webdriver.Safari()
-        else:
-            print('Unsupported browser for now')
-            return
+    def run(self, actions: List, driver: WebDriver = None) -> bool:
+        """
+        Opens the base url and applies the actions.
+
+        actions:
+        The configurations of the actions.
+
+        driver (default None):
+        A browser session to run in, which is left open afterwards. If None, a session of the
+        browser of this scraper is started and quit in the end.
+
+        returns:
+        False if the run has been aborted. This includes invalid action configurations, which are
+        reported before the browser is started.
+        """
+        actions, errors = self.compile_actions(actions)
+        if len(errors) > 0:
+            for error in errors:
+                print(error)
+            print('invalid actions, not scraping ' + self.base_url)
+            return False
 
+        own_driver = driver is None
+        if own_driver:
+            driver = make_driver(self.browser)
+            if driver is None:
+                print('Unsupported browser for now')
+                return False
+
+        done = True
         try:
+            self._be_polite(self.base_url)
             driver.get(self.base_url)
+            self._wait_until_ready(driver)
             for action in actions:
                 self._apply_action_to_driver(driver, action)
         except BaseException as be:
             print(be)
             print('quitting')  # TODO: localize
+            done = False
+
+        if own_driver:
+            driver.quit()
+        return done
+
+    def compile_actions(self, actions: List, path: str = 'actions') -> Tuple[List[Dict], List[str]]:
+        """
+        Validates the action configurations and parses the entries of 'children' and 'child' into
+        selectors, including those of the follow up actions. The configurations are not changed, the
+        compiled actions are copies.
+
+        actions:
+        The configurations of the actions.
 
-        driver.quit()
+        path (default 'actions'):
+        Where the actions are located in the configuration, used in the error messages.
+
+        returns:
+        The compiled actions and the errors found. The compiled actions are incomplete if there are errors.
+        """
+        compiled: List[Dict] = []
+        errors: List[str] = []
+        if not isinstance(actions, list):
+            return compiled, [f'{path}: must be a list of actions']
+
+        for num, config in enumerate(actions):
+            where = f'{path}[{num}]'
+            if not isinstance(config, dict):
+                errors.append(f'{where}: action must be an object')
+                continue
+            try:
+                type = config['type'].strip()
+            except BaseException:
+                errors.append(f'{where}: action does not have a type')
+                continue
+            if type not in _ACTION_TYPES:
+                errors.append(f'{where}: unknown action type {type}')
+                continue
+
+            action = dict(config)
+            action['type'] = type
+            try:
+                if type in ['list', 'click', 'simple cookie dialog', 'shadow child']:
+                    action[ck.CHILDREN] = self._compile_children(
+                        config[ck.CHILDREN], type == 'list')
+                if type == 'shadow child':
+                    action[ck.CHILD] = parse_selector(
+                        config[ck.CHILD]).within_shadow_root()
+                elif type == 'handle':
+                    action['name'] = config['name'].strip()
+                elif type == 'sleep':
+                    for key in ['min', 'max']:
+                        if key in config and not isinstance(config[key], (int, float)):
+                            raise ValueError(f'{key} must be a number')
+                elif type == 'wait':
+                    until = config.get(ck.UNTIL, ck.DOM_READY).strip()
+                    if until not in _CONDITIONS:
+                        raise ValueError(f'cannot wait until {until}')
+                    action[ck.UNTIL] = until
+                    if until == ck.ELEMENT:
+                        action[ck.CHILDREN] = self._compile_children(
+                            config[ck.CHILDREN], False)
+                    for key in [ck.WAIT_FOR, ck.IDLE]:
+                        if key in config and (not isinstance(config[key], (int, float)) or config[key] <= 0):
+                            raise ValueError(f'{key} must be a positive number')
+            except KeyError as ke:
+                errors.append(f'{where}: missing {ke}')
+                continue
+            except BaseException as be:
+                errors.append(f'{where}: {be}')
+                continue
+
+            if 'actions' in config:
+                action['actions'], follow_up_errors = self.compile_actions(
+                    config['actions'], f'{where}.actions')
+                errors.extend(follow_up_errors)
+            compiled.append(action)
+
+        return compiled, errors
+
+    def _compile_children(self, children: List[str], listing: bool) -> List[Selector]:
+        """
+        Parses the entries of 'children'.
+
+        listing:
+        Do the children describe a list? Then there must be at least one entry, and the last must not
+        have an index.
+        """
+        if not isinstance(children, list):
+            raise ValueError(f'{ck.CHILDREN} must be a list')
+        if listing and len(children) == 0:
+            raise ValueError(f'{ck.CHILDREN} must not be empty')
+        selectors = [parse_selector(child) for child in children[:-1]]
+        if len(children) > 0:
+            selectors.append(parse_selector(children[-1], not listing))
+        return selectors
 
     def register_page_handler(self, name: str, handler: PageHandler) -> None:
         """
@@ -71,13 +246,13 @@ class SeleniumScraper():
         The web driver.
 
         config:
-        The json with the configuration for the action.
+        The compiled configuration for the action.
         """
         elem = driver.find_element(By.TAG_NAME, 'html')
         ancestors = []
         self._apply_action_to_elem(elem, ancestors, config, driver)
 
-    def _apply_action_to_elem(self, parent: WebElement, ancestors: List[str], config: Dict, driver: WebDriver) -> None:
+    def _apply_action_to_elem(self, parent: WebElement, ancestors: Lineage, config: Dict, driver: WebDriver) -> None:
         """
         Applies the action, which is described and configured in 'config', to the given element. The method returns if
         the configuration does not contain a key 'type'. The method call for the action is surrounded by a try/except block
@@ -89,10 +264,10 @@ class SeleniumScraper():
         this element here.
 
         ancestors:
-        List of =-separated key value pairs that describe the path from the html element to 'parent'.
+        The path from the html element to 'parent'.
 
         config:
-        Json containing the configuration for the action.
+        The compiled configuration for the action.
 
         driver:
         The web driver.
@@ -110,6 +285,8 @@ class SeleniumScraper():
                 self._click_action(parent, config, driver)
             elif type == 'sleep':
                 self._sleep_action(config, driver)
+            elif type == 'wait':
+                self._wait_action(parent, config, driver)
             elif type == 'back':
                 self._back_action(driver)
             elif type == 'handle':
@@ -124,27 +301,30 @@ class SeleniumScraper():
 
     # _______________  default actions  _______________
 
-    def _list_action(self, parent: WebElement, ancestors: List[str], config: Dict, driver: WebDriver) -> None:
+    def _list_action(self, parent: WebElement, ancestors: Lineage, config: Dict, driver: WebDriver) -> None:
         """
         The 'list elements' action. Finds a list of elements and applies the actions as defined in config['actions'] to
         each. The search for the elements is started at the 'parent'. It descends in the steps
         given in config['children'].
 
+        When an element has been rendered stale by a previous action, it is found again from its
+        nearest ancestor that is still valid.
+
         parent:
         Parent element where the quest for the list of elements starts.
 
-        config:
-        Configuration of this action. It must be a dict. Needs an array 'children' with =-separated key value pairs
-        like 'class=highlighted'. Also may have an array 'actions'. These continuation actions, if present, are
-        applied to each element listed by this actions.
+        ancestors:
+        The path from the html element to 'parent'.
 
-        raises:
-        Value error for invalid entries in 'children'
-        KeyError for missing 'children'
+        config:
+        Compiled configuration of this action. Has a list 'children' of selectors. Also may have an array 'actions'.
+        These continuation actions, if present, are applied to each element listed by this actions.
         """
-        children = config["children"]
-        elems = self._build_element_list(parent, children)
-        num_elems = len(elems)
+        children = config[ck.CHILDREN]
+        path = self._traverse_path(parent, children[:-1])
+        base = ancestors + path
+        list_parent = path[-1][1] if len(path) > 0 else parent
+        elems = children[-1].find_all(list_parent)
 
         # actions to be called on these elements
         try:
@@ -153,44 +333,16 @@ class SeleniumScraper():
             # no further actions
             return
 
-        for idx in range(num_elems):
-            lineage = ancestors + children[:-1]
-            lineage.append(children[-1]+f'[{idx}]')
+        for idx in range(len(elems)):
+            lineage = base + [(children[-1].with_index(idx), elems[idx])]
             for action in actions:
-                elem = elems[idx]
-                try:
-                    # just checking if elem has been rendered stale
-                    elem.is_enabled()
-                except StaleElementReferenceException:
-                    elem = self._traverse_children(
-                        driver.find_element(By.TAG_NAME, 'html'), lineage)
-                self._apply_action_to_elem(elem, lineage, action, driver)
-
-    def _build_element_list(self, parent: WebElement, children: List[str]) -> List[WebElement]:
-        """
-        Gets all elements that fullfill the description in the last entry of 'children'. At the same time, for all
-        other entries only the first match is taken, though. Consequently, all elements returns have the same parent.
-
-        ----
-        parent:
-        Element the search starts from.
-
-        children:
-        Description how to look for children after children, generation for generation.
-        """
-        # descent the lineage of descendants
-        elem = self._traverse_children(parent, children[:-1])
-
-        # from final descendant, we want all elements
-        child = children[-1].strip()
-        kvp = child.strip().split('=')
-        if len(kvp) != 2 or len(kvp[0].strip()) == 0 or len(kvp[1].strip()) == 1:
-            raise ValueError(
-                f'key value pair {child} does not have exactly one non-empty key and one non-empty value separated by an equal sign (=), aborting.')
-        by = self._get_by(kvp[0].strip())
-        elems = elem.find_elements(by, kvp[1].strip())
-
-        return elems
+                elem = lineage[-1][1]
+                if self._is_stale(elem):
+                    elem = self._resolve_lineage(lineage, driver)
+                    # later elements of the list share the renewed ancestors
+                    base[:] = lineage[:-1]
+                self._apply_action_to_elem(
+                    elem, list(lineage), action, driver)
 
     def _click_action(self, parent: WebElement, config: Dict, driver: WebDriver) -> None:
         """
@@ -206,11 +358,12 @@ class SeleniumScraper():
         driver:
         The web driver.
         """
-        children = config["children"]
+        children = config[ck.CHILDREN]
         repeat = self._get_repeating(config)
         # while repeat == ck.AS_LONG_AS_POSSIBLE:
         elem = self._traverse_children(parent, children)
-        elem.click()  # may raise exception once it is not possible anymore
+        # may raise exception once it is not possible anymore
+        self._navigate(driver, self._link_target(elem, driver), elem.click)
         # actions to be called on these elements
         try:
             actions = config['actions']
@@ -222,7 +375,8 @@ class SeleniumScraper():
 
     def _sleep_action(self, config: Dict, driver: WebDriver) -> None:
         """
-        Let the script rest for a few seconds.
+        Let the script rest for a few seconds. If the scraper has a rate limiter, the limiter spaces out the
+        requests instead, and the action does nothing.
 
         config:
         Action configuration. Should define a number 'min' and a number 'max'. The script sleeps
@@ -231,6 +385,9 @@ class SeleniumScraper():
         driver:
         The web driver.
         """
+        if self.rate_limiter is not None:
+            return
+
         try:
             min_time = config['min']
         except KeyError:
@@ -254,7 +411,142 @@ class SeleniumScraper():
         driver:
         The web driver.
         """
-        driver.back()
+        # the page left is the one linking here, at least when it has been left by a click
+        referrer = driver.execute_script('return document.referrer')
+        target = referrer if self._is_web_url(referrer) else driver.current_url
+        self._navigate(driver, target, driver.back)
+
+    def _wait_action(self, parent: WebElement, config: Dict, driver: WebDriver) -> None:
+        """
+        Waits until the page is ready in the sense of config['until'], which is one of 'dom ready' (the default),
+        'element', and 'network idle'. For 'element', the 'children' describe the element starting from 'parent'.
+        The optional 'wait_for' is the timeout in seconds, and the optional 'idle' is how many seconds the network
+        must be quiet for 'network idle'.
+
+        parent:
+        Element to look from for the element.
+
+        config:
+        Compiled configuration of the action.
+
+        driver:
+        The web driver.
+
+        raises:
+        TimeoutException if the condition has not been met in time.
+        """
+        timeout = config.get(ck.WAIT_FOR, _DEFAULT_TIMEOUT)
+        until = config[ck.UNTIL]
+        if until == ck.ELEMENT:
+            children = config[ck.CHILDREN]
+            WebDriverWait(driver, timeout=timeout, ignored_exceptions=[NoSuchElementException, IndexError]).until(
+                lambda _: self._traverse_children(parent, children))
+        else:
+            self._wait_for_page(driver, until, timeout,
+                                config.get(ck.IDLE, _DEFAULT_IDLE))
+
+    def _wait_for_page(self, driver: WebDriver, until: str, timeout: float, idle: float = _DEFAULT_IDLE) -> None:
+        """
+        Waits until the document is loaded completely, and for 'network idle' also until no further resources have
+        been requested for 'idle' seconds.
+
+        raises:
+        TimeoutException if the condition has not been met in time.
+        """
+        if until == ck.DOM_READY:
+            WebDriverWait(driver, timeout=timeout, poll_frequency=0.1, ignored_exceptions=_PAGE_ERRORS).until(
+                lambda drv: drv.execute_script('return document.readyState') == 'complete')
+            return
+
+        # the number of resources loaded so far, and since when it has not changed
+        last = [-1, time.monotonic()]
+
+        def is_idle(drv: WebDriver) -> bool:
+            state, count = drv.execute_script(
+                "return [document.readyState, performance.getEntriesByType('resource').length]")
+            now = time.monotonic()
+            if count != last[0]:
+                last[0] = count
+                last[1] = now
+                return False
+            return state == 'complete' and now - last[1] >= idle
+
+        WebDriverWait(driver, timeout=timeout, poll_frequency=max(_MIN_POLL, min(0.1, idle/2)),
+                      ignored_exceptions=_PAGE_ERRORS).until(is_idle)
+
+    def _navigate(self, driver: WebDriver, target: str, go: Callable[[], None]) -> None:
+        """
+        Leaves the current page, politely towards the host of the target, and waits until the new page is ready.
+
+        driver:
+        The web driver.
+
+        target:
+        The url requested, as far as known, for the rate limiter.
+
+        go:
+        Starts the navigation, like a click.
+        """
+        old_page = driver.find_element(By.TAG_NAME, 'html')
+        old_url = driver.current_url
+        self._be_polite(target)
+        go()
+        self._wait_until_ready(driver, old_page, old_url)
+
+    def _wait_until_ready(self, driver: WebDriver, old_page: Optional[WebElement] = None, old_url: Optional[str] = None) -> None:
+        """
+        Waits for the readiness condition of this scraper after a navigation. A page that does not become
+        ready in time is used as it is.
+
+        driver:
+        The web driver.
+
+        old_page (default None):
+        The html element of the page left. If given, the new page must have replaced it or changed the url,
+        before the readiness counts. Otherwise, the old page could pass as ready.
+
+        old_url (default None):
+        The url of the page left.
+        """
+        if self.readiness is None:
+            return
+        if old_page is not None:
+            try:
+                WebDriverWait(driver, timeout=_NAVIGATION_TIMEOUT, poll_frequency=_MIN_POLL, ignored_exceptions=_PAGE_ERRORS).until(
+                    EC.any_of(EC.staleness_of(old_page), EC.url_changes(old_url)))
+            except TimeoutException:
+                pass  # the page has not been left
+        try:
+            self._wait_for_page(driver, self.readiness, _DEFAULT_TIMEOUT)
+        except TimeoutException:
+            print(f'page not {self.readiness} in time, going on')
+
+    def _link_target(self, elem: WebElement, driver: WebDriver) -> str:
+        """
+        returns:
+        The url the element links to, or the current url if it is not a link. Clicks on other elements
+        mostly stay on the host.
+        """
+        href = elem.get_attribute('href')
+        if href:
+            target = urljoin(driver.current_url, href)
+            if self._is_web_url(target):
+                return target
+        return driver.current_url
+
+    def _is_web_url(self, url: Optional[str]) -> bool:
+        """Is the url an absolute http or https url?"""
+        if not url:
+            return False
+        parsed = urlparse(url)
+        return parsed.scheme in ['http', 'https'] and len(parsed.netloc) > 0
+
+    def _be_polite(self, url: str) -> None:
+        """
+        Waits until the rate limiter allows a request to the host of the url.
+        """
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(url)
 
     def _handling_action(self, config: Dict, driver: WebDriver) -> None:
         """
@@ -281,7 +573,7 @@ class SeleniumScraper():
         except BaseException:
             pass  # just return
 
-    def _shadow_root_child_action(self, parent: WebElement, ancestors: List, config: Dict, driver: WebDriver) -> None:
+    def _shadow_root_child_action(self, parent: WebElement, ancestors: Lineage, config: Dict, driver: WebDriver) -> None:
         """
         Gets the child of a shadow root.
 
@@ -290,10 +582,10 @@ class SeleniumScraper():
         Element to look from.
 
         ancestors:
-        ...
+        The path from the html element to 'parent'.
 
         config:
-        Configuration of the action. The 'children' within the configuration must lead to the immediate parent of the shadow root.
+        Compiled configuration of the action. The 'children' within the configuration must lead to the immediate parent of the shadow root.
         The 'child' is the descendant of the shadow root (not necessarly a direct child) the follow up actions are applied to.
 
         driver:
@@ -301,9 +593,10 @@ class SeleniumScraper():
         """
         children = config[ck.CHILDREN]
         child = config[ck.CHILD]
-        shadow_parent = self._traverse_children(parent, children)
-        shadow_root = shadow_parent.shadow_root
-        elem = self._get_shadow_root_child(shadow_root, child)
+        path = self._traverse_path(parent, children)
+        shadow_parent = path[-1][1] if len(path) > 0 else parent
+        elem = child.find(shadow_parent)
+        lineage = ancestors + path + [(child, elem)]
 
         # actions to be called on the child
         try:
@@ -313,7 +606,7 @@ class SeleniumScraper():
             return
 
         for action in actions:
-            self._apply_action_to_elem(elem, ancestors, action, driver)
+            self._apply_action_to_elem(elem, list(lineage), action, driver)
 
     # _______________  fun with cookie banners  _______________
 
@@ -331,7 +624,7 @@ class SeleniumScraper():
 
         elem.click()
 
-    def _is_interactible(self, parent: WebElement, children: List[str], driver) -> bool:
+    def _is_interactible(self, parent: WebElement, children: List[Selector], driver) -> bool:
         try:
             elem = self._traverse_children(parent, children)
             interactable = elem.is_displayed() and elem.is_enabled()
@@ -348,38 +641,18 @@ class SeleniumScraper():
 
     def _get_by(self, type: str) -> str:
         """
-        Gets the literal of the instance of 'By' that relates to the type given in the argument.
-        The 'type' originates from your 'look_around_config.json' and is part of an entry in a
-        'children' array.
-
-        type:
-        The type. This is not stripped. So make sure there are no blanks around.
-
-        returns:
-        The By depending on the type. Values allowed for 'type' are id, tag, class, css, and name. These relate to
-        By.ID, By.TAG_NAME, By.CLASS_NAME, By.CSS_SELECTOR, and By.NAME, respectively.
+        Gets the literal of the instance of 'By' that relates to the type given in the argument, see
+        'element_selector.get_by'.
 
         raises:
         ValueError if passing an invalid argument.
         """
-        if type == 'id':
-            return By.ID
-        elif type == 'tag':
-            return By.TAG_NAME
-        elif type == 'class':
-            return By.CLASS_NAME
-        elif type == 'css':
-            return By.CSS_SELECTOR
-        elif type == 'name':
-            return By.NAME
-        else:
-            raise ValueError('Invalid By Finder provided')
+        return get_by(type)
 
-    def _traverse_children(self, parent: WebElement, children: List[str]) -> WebElement:
+    def _traverse_children(self, parent: WebElement, children: List[Selector]) -> WebElement:
         """
-        Traverse the children as described in 'children', starting from 'parent'. The list 'children'
-        contains of =-separated key value pairs. The entries describe which element finder is used alongside
-        which value. Always the first child is returned each step, including the final one.
+        Traverse the children as described in 'children', starting from 'parent'. Always the first child
+        is returned each step, including the final one, unless the selector has an index.
 
         parent:
         Element to start from.
@@ -391,72 +664,63 @@ class SeleniumScraper():
         The final element that follows from the arguments.
 
         raises:
-        ValueError if an antry in 'children' is badly formatted.
-
         NoSuchElementException if a single child cannot be found.
         """
         elem = parent
-        # descent the lineage of descendants
         for child in children:
-            kvp = child.strip().split('=')
-            if len(kvp) != 2 or len(kvp[0].strip()) == 0 or len(kvp[1].strip()) == 0:
-                raise ValueError(
-                    f'key value pair {child.strip()} does not have exactly one non-empty key and one non-empty value separated by an equal sign (=), aborting.')
-            key = kvp[0].strip()
-            val = kvp[1].strip()
-            by = self._get_by(key)
-            if not val.endswith(']'):
-                # get first element
-                elem = elem.find_element(by, val)
-            else:
-                # the [x], x a number, is the index in an array and must be stripped from val and parsed
-                opn = val.rfind('[') + 1
-                cls = len(val) - 1
-                idx = int(val[opn:cls])
-                val = val[:opn-1].strip()
-                elems = elem.find_elements(by, val)
-                elem = elems[idx]
+            elem = child.find(elem)
         return elem
 
-    def _get_shadow_root_child(self, parent: ShadowRoot, child: str) -> WebElement:
+    def _traverse_path(self, parent: WebElement, children: List[Selector]) -> Lineage:
         """
-        Gets a descendant from the shadow root. The child is described as a =-separated key value pair in 'child'.
-        The syntax is the same as for the 'children' in '_traverse_children'.
-
-        parent:
-        Shadow root of interest.
+        Same as '_traverse_children', but returns each step along with the element found.
+        """
+        path = []
+        elem = parent
+        for child in children:
+            elem = child.find(elem)
+            path.append((child, elem))
+        return path
 
-        children:
-        Describes how to find the descendant.
+    def _resolve_lineage(self, lineage: Lineage, driver: WebDriver) -> WebElement:
+        """
+        Finds the elements of the lineage again, starting from the deepest element that is still
+        valid. If none is, the search starts from the html element. The lineage is updated in place.
 
-        returns:
-        The descendant.
+        lineage:
+        The path from the html element to the element of interest.
 
-        raises:
-        ValueError if an antry in 'children' is badly formatted.
+        driver:
+        The web driver.
 
-        NoSuchElementException if a single child cannot be found.
+        returns:
+        The element at the end of the lineage.
         """
-        kvp = child.strip().split('=')
-        if len(kvp) != 2 or len(kvp[0].strip()) == 0 or len(kvp[1].strip()) == 0:
-            raise ValueError(
-                f'key value pair {child.strip()} does not have exactly one non-empty key and one non-empty value separated by an equal sign (=), aborting.')
-        key = kvp[0].strip()
-        val = kvp[1].strip()
-        by = self._get_by(key)
-        if not val.endswith(']'):
-            # get first element
-            elem = parent.find_element(by, val)
+        valid = len(lineage) - 1
+        while valid >= 0 and self._is_stale(lineage[valid][1]):
+            valid -= 1
+
+        if valid >= 0:
+            elem = lineage[valid][1]
         else:
-            # the [x], x a number, is the index in an array and must be stripped from val and parsed
-            opn = val.rfind('[') + 1
-            cls = len(val) - 1
-            idx = int(val[opn:cls])
-            val = val[:opn-1].strip()
-            elems = parent.find_elements(by, val)
-            elem = elems[idx]
+            elem = driver.find_element(By.TAG_NAME, 'html')
+        for step in range(valid + 1, len(lineage)):
+            selector = lineage[step][0]
+            elem = selector.find(elem)
+            lineage[step] = (selector, elem)
         return elem
 
+    def _is_stale(self, elem: WebElement) -> bool:
+        """
+        returns:
+        True if the element is no longer attached to the page.
+        """
+        try:
+            elem.is_enabled()
+            return False
+        except StaleElementReferenceException:
+            return True
+
     def _get_repeating(self, config: Dict) -> str:
         """
         Extracts the value of the key 'repeat' from the configuration.
@@ -0,0 +1,121 @@
+from contextlib import contextmanager
+from threading import Condition
+from typing import Callable, Iterator, List
+from selenium.webdriver.remote.webdriver import WebDriver
+from look_around.scraper.selenium_scraper import make_driver
+
+
+class SessionPool():
+    """
+    Lends browser sessions to scrapers running at the same time. Up to 'max_sessions' sessions are
+    started, on demand, and a session is reused once it has been given back. Starting a browser takes
+    a few seconds, which is saved for all but the first scraper on each session.
+
+    A session that has failed is quit rather than handed out again.
+    """
+
+    max_sessions: int
+    """Maximum number of sessions open at the same time."""
+    factory: Callable[[], WebDriver]
+    """Starts a new session."""
+    _idle: List[WebDriver]
+    """Sessions ready to be handed out."""
+    _count: int
+    """Number of sessions open, idle or lent."""
+    _cond: Condition
+
+    def __init__(self, browser: str, max_sessions: int = 2, factory: Callable[[], WebDriver] = None) -> None:
+        """
+        browser:
+        The browser the sessions are started in. Ignored if a factory is given.
+
+        max_sessions (default 2):
+        Maximum number of sessions open at the same time.
+
+        factory (default None):
+        Starts a new session, like a remote web driver. If None, headless sessions of 'browser' are
+        started.
+        """
+        self.max_sessions = max(1, max_sessions)
+        if factory is None:
+            def factory(): return self._start_headless(browser)
+        self.factory = factory
+        self._idle = []
+        self._count = 0
+        self._cond = Condition()
+
+    @contextmanager
+    def session(self) -> Iterator[WebDriver]:
+        """
+        Lends a session for the duration of the block. Waits if all sessions are lent.
+
+        raises RuntimeError:
+        If the browser is not supported.
+        """
+        driver = self._acquire()
+        healthy = False
+        try:
+            yield driver
+            healthy = True
+        finally:
+            self._release(driver, healthy)
+
+    def close(self) -> None:
+        """
+        Quits all idle sessions. Sessions still lent are quit when they are given back.
+        """
+        with self._cond:
+            idle = self._idle
+            self._idle = []
+            self._count -= len(idle)
+            self.max_sessions = 0
+            self._cond.notify_all()
+        for driver in idle:
+            self._quit(driver)
+
+    def _acquire(self) -> WebDriver:
+        with self._cond:
+            self._cond.wait_for(lambda: len(self._idle) > 0 or self._count < max(
+                1, self.max_sessions))
+            if len(self._idle) > 0:
+                return self._idle.pop()
+            self._count += 1
+
+        try:
+            return self.factory()
+        except BaseException:
+            with self._cond:
+                self._count -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, driver: WebDriver, healthy: bool) -> None:
+        if healthy:
+            try:
+                # the next origin shall not see the cookies of the previous one
+                driver.delete_all_cookies()
+            except BaseException:
+                healthy = False
+
+        with self._cond:
+            keep = healthy and self._count <= self.max_sessions
+            if keep:
+                self._idle.append(driver)
+            else:
+                self._count -= 1
+            self._cond.notify()
+        if not keep:
+            self._quit(driver)
+
+    def _start_headless(self, browser: str) -> WebDriver:
+        driver = make_driver(browser, headless=True)
+        if driver is None:
+            raise RuntimeError('Unsupported browser for now')
+        return driver
+
+    def _quit(self, driver: WebDriver) -> None:
+        try:
+            driver.quit()
+        except BaseException as be:
+            print('could not quit browser session')
+            print(be)
@@ -0,0 +1,151 @@
+import hashlib
+from pathlib import Path
+from typing import Dict, Tuple
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from scipy.sparse import csr_matrix, spmatrix, vstack
+
+
+def _digest(text: str) -> int:
+    """Short, persistent fingerprint of a document."""
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class FeatureCache():
+    """
+    Keeps the feature vectors of documents on disk, as .npz files in a directory. There is one file
+    for each combination of vocabulary and ngram range. Each file holds a sparse matrix with one row
+    per document, together with the index of the document and a fingerprint of its text.
+
+    When features are requested, the rows of known and unchanged documents are taken from the cache.
+    Just the other documents are vectorized, and then added to the cache.
+    """
+
+    dir: Path
+    """Directory the cache files are stored in."""
+    _loaded: Dict[str, Tuple[npt.NDArray, npt.NDArray[np.uint64], csr_matrix]]
+    """Cache files that have been read or written already, by key."""
+
+    def __init__(self, dir: Path) -> None:
+        self.dir = dir
+        self._loaded = {}
+
+    def get_features(self, vocab: npt.NDArray[np.str_], docs: pd.Series, ngram_range: Tuple[int, int] = (1, 1)) -> csr_matrix:
+        """
+        Gets the feature matrix of the documents, vectorizing only documents that are not in the cache.
+
+        vocab:
+        Vocabulary taken into account. These are the features.
+
+        docs:
+        The texts the features are extracted from. The index identifies the documents.
+
+        ngram_range (default (1,1)):
+        The ngram range passed to the TfidfVectorizer.
+
+        returns:
+        The feature matrix, with the rows in the order of 'docs'.
+        """
+        key = self._make_key(vocab, ngram_range)
+        ids, digests, matrix = self._load(key, len(vocab))
+
+        doc_ids = np.array([str(idx) for idx in docs.index])
+        doc_digests = np.array([_digest(doc)
+                               for doc in docs], dtype=np.uint64)
+
+        # locate the documents in the cache
+        row_of = {id: row for row, id in enumerate(ids)}
+        rows = np.array([row_of.get(id, -1) for id in doc_ids], dtype=int)
+        cached = rows >= 0
+        cached[cached] = digests[rows[cached]] == doc_digests[cached]
+
+        if cached.all():
+            return matrix[rows]
+
+        # vectorize what is new or has changed
+        new = np.logical_not(cached)
+        from sklearn.feature_extraction.text import TfidfVectorizer as TFV
+        vect = TFV(use_idf=False, binary=True, norm=None,
+                   vocabulary=vocab, ngram_range=ngram_range)
+        new_features = csr_matrix(vect.fit_transform(docs[new]))
+
+        # add to the cache, replacing outdated rows
+        keep = np.ones(len(ids), dtype=bool)
+        keep[rows[rows >= 0]] = False
+        keep[rows[cached]] = True
+        ids = np.concatenate([ids[keep], doc_ids[new]])
+        digests = np.concatenate([digests[keep], doc_digests[new]])
+        matrix = csr_matrix(vstack([matrix[keep], new_features]))
+        self._save(key, ids, digests, matrix)
+
+        row_of = {id: row for row, id in enumerate(ids)}
+        return matrix[[row_of[id] for id in doc_ids]]
+
+    def clear(self) -> None:
+        """
+        Deletes all cache files.
+        """
+        self._loaded.clear()
+        if self.dir.exists():
+            for file in self.dir.glob('features_*.npz'):
+                file.unlink()
+
+    def _make_key(self, vocab: npt.NDArray[np.str_], ngram_range: Tuple[int, int]) -> str:
+        """
+        returns:
+        A key that changes whenever the vocabulary, its order, or the ngram range changes.
+        """
+        hash = hashlib.sha1()
+        hash.update(f'{ngram_range[0]},{ngram_range[1]}\n'.encode('utf-8'))
+        hash.update('\n'.join([str(word) for word in vocab]).encode('utf-8'))
+        return hash.hexdigest()
+
+    def _get_path(self, key: str) -> Path:
+        return Path(self.dir, f'features_{key}.npz')
+
+    def _load(self, key: str, num_features: int) -> Tuple[npt.NDArray, npt.NDArray[np.uint64], csr_matrix]:
+        """
+        Loads the cache file with the given key. An empty cache is returned if the file does not
+        exist or cannot be read.
+        """
+        try:
+            return self._loaded[key]
+        except KeyError:
+            pass
+
+        path = self._get_path(key)
+        try:
+            with np.load(path, allow_pickle=False) as file:
+                matrix = csr_matrix((file['data'], file['indices'], file['indptr']), shape=tuple(
+                    file['shape']))
+                entry = (file['ids'], file['digests'], matrix)
+        except FileNotFoundError:
+            entry = (np.array([], dtype=str), np.array([], dtype=np.uint64),
+                     csr_matrix((0, num_features)))
+        except BaseException as be:
+            print('could not read the feature cache, starting over')
+            print(be)
+            entry = (np.array([], dtype=str), np.array([], dtype=np.uint64),
+                     csr_matrix((0, num_features)))
+
+        self._loaded[key] = entry
+        return entry
+
+    def _save(self, key: str, ids: npt.NDArray, digests: npt.NDArray[np.uint64], matrix: csr_matrix) -> None:
+        """
+        Writes the cache file with the given key. The file is replaced just when writing has succeeded.
+        Failing to write the cache is not fatal, the features are computed again next time.
+        """
+        self._loaded[key] = (ids, digests, matrix)
+        path = self._get_path(key)
+        tmp_path = Path(path.parent, path.name + '.tmp')
+        try:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'wb') as file:
+                np.savez(file, data=matrix.data, indices=matrix.indices, indptr=matrix.indptr,
+                         shape=np.array(matrix.shape), ids=ids, digests=digests)
+            tmp_path.replace(path)
+        except BaseException as be:
+            print('could not write the feature cache')
+            print(be)
@@ -30,6 +30,14 @@ LABELED_BY = 'labeled by'
 """
 Column in the sample file index: holds the entity that has labeled the sample.
 """
+PREDICTION = 'prediction'
+"""
+Column in the data file index: holds the label predicted by a model.
+"""
+PREDICTED_BY = 'predicted by'
+"""
+Column in the data file index: holds the name of the model that has predicted the label.
+"""
 
 DESC = 'description'
 """Column in the model index: holds a description of the model"""
@@ -1,13 +1,18 @@
 import pandas as pd
 import numpy as np
 import numpy.typing as npt
-from sklearn.feature_extraction.text import TfidfVectorizer as TFV
 from look_around.tools import keys
-from typing import Tuple, List
+from typing import Iterable, Optional, Tuple, List
 from scipy.sparse import spmatrix
+from look_around.tools.feature_cache import FeatureCache
 
+_SCORES = [keys.ACCURACY, keys.PRECISION, keys.RECALL, keys.F1]
+"""The scores noted down in the model index, in the order of the columns below."""
+_TRAIN_COLUMNS = [keys.TRAIN_ACC, keys.TRAIN_PREC, keys.TRAIN_REC, keys.TRAIN_F1]
+_VAL_COLUMNS = [keys.VAL_ACC, keys.VAL_PREC, keys.VAL_REC, keys.VAL_F1]
 
-def get_features_labels(vocab: npt.NDArray[np.str_], docs: pd.Series, file_data: pd.DataFrame, ngram_range: Tuple[int, int] = (1, 1)) -> Tuple[spmatrix, pd.Series]:
+
+def get_features_labels(vocab: npt.NDArray[np.str_], docs: pd.Series, file_data: pd.DataFrame, ngram_range: Tuple[int, int] = (1, 1), cache: Optional[FeatureCache] = None) -> Tuple[spmatrix, pd.Series]:
     """
     Transforms the input documents into a feature matrix with their associated labels. The indices of 'docs' also
     appear in 'file_data'. This way, a label is linked to a sample.
@@ -23,14 +28,85 @@ def get_features_labels(vocab: npt.NDArray[np.str_], docs: pd.Series, file_data:
 
     ngram_range:
     The ngram range passed to the TfidfVectorizer
+
+    cache (default None):
+    If given, the features of documents already vectorized with the same vocabulary and ngram range
+    are taken from this cache, and the features of the other documents are added to it. The labels
+    are always taken from 'file_data', as ratings may have changed.
     """
-    vect = TFV(use_idf=False, binary=True, norm=None,
-               vocabulary=vocab, ngram_range=ngram_range)
-    features = vect.fit_transform(docs)
+    if cache is not None:
+        features = cache.get_features(vocab, docs, ngram_range=ngram_range)
+    else:
+        features = get_features(vocab, docs, ngram_range=ngram_range)
     labels = file_data.loc[docs.index, keys.RATING]
     return (features, labels)
 
 
+def get_features(vocab: npt.NDArray[np.str_], docs: Iterable[str], ngram_range: Tuple[int, int] = (1, 1)) -> spmatrix:
+    """
+    Transforms the documents into a feature matrix. As the vocabulary is fixed, documents can be
+    vectorized in chunks, and the chunks yield the same rows as vectorizing all documents at once.
+
+    vocab:
+    Vocabulary taken into account. These are the features.
+
+    docs:
+    The texts the features are extracted from.
+
+    ngram_range:
+    The ngram range passed to the TfidfVectorizer
+
+    returns:
+    The feature matrix, with one row per document.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer as TFV
+    vect = TFV(use_idf=False, binary=True, norm=None,
+               vocabulary=vocab, ngram_range=ngram_range)
+    return vect.fit_transform(docs)
+
+
+def make_model_index_rows(models: Iterable) -> pd.DataFrame:
+    """
+    Makes the rows of the model index for the given models, all at once. If a name occurs several
+    times, the last model of that name is taken.
+
+    models:
+    The wrapped models, with their training and validation scores computed.
+
+    returns:
+    The rows, indexed by the model names, with the columns of the model index.
+    """
+    names = []
+    descs = []
+    train_avgs = []
+    val_avgs = []
+    for model in models:
+        names.append(model.name)
+        desc = getattr(model, 'desc', None)
+        descs.append(desc if desc is not None else pd.NA)
+        train_avgs.append(_get_avg_scores(model.train_scores))
+        val_avgs.append(_get_avg_scores(model.val_scores))
+
+    rows = make_model_index(index=names)
+    if len(names) == 0:
+        return rows
+    rows[keys.DESC] = descs
+    rows[_TRAIN_COLUMNS] = np.array(train_avgs, dtype=float)
+    rows[_VAL_COLUMNS] = np.array(val_avgs, dtype=float)
+    return rows[~rows.index.duplicated(keep='last')]
+
+
+def _get_avg_scores(scores: pd.DataFrame) -> npt.NDArray[np.float_]:
+    """
+    returns:
+    The scores in the row 'avg', in the order of '_SCORES'. Positional access, as label based access on
+    the mixed index of the score frames is slow.
+    """
+    row = scores.index.get_loc('avg')
+    cols = scores.columns.get_indexer(_SCORES)
+    return scores.to_numpy()[row, cols].astype(float)
+
+
 def make_model_index(index: List = []) -> pd.DataFrame:
     """
     Creates a new, empty model index.
@@ -0,0 +1,86 @@
+import sqlite3
+import tempfile
+from contextlib import closing
+import unittest
+from pathlib import Path
+import sys
+sys.path.append('..')
+sys.path.append('../..')
+sys.path.append('../../look_around')
+# autopep8: off
+from look_around.core.dedup_index import DedupIndex, make_signature
+# autopep8: on
+
+_POSTING = ('we are looking for a python developer with experience in databases and web '
+            'scraping who enjoys working in a small team on data pipelines and machine '
+            'learning models for text classification in a friendly remote environment').split()
+
+
+class TestDedupIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.index = DedupIndex(Path(self.tmp_dir.name, 'dedup.sqlite'))
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_signature(self):
+        sig = make_signature(_POSTING)
+        self.assertEqual(64, len(sig))
+        self.assertTrue((sig == make_signature(_POSTING)).all())
+        other = make_signature(['completely', 'different', 'words', 'here'])
+        self.assertLess((sig == other).mean(), 0.2)
+
+    def test_exact_duplicate(self):
+        self.assertIsNone(self.index.find_or_add('0000/a', _POSTING, 'one'))
+        self.assertEqual('0000/a', self.index.find_or_add(
+            '0000/b', list(_POSTING), 'two', 'https://two.example.com/b'))
+        links = self.index.get_links('0000/a')
+        self.assertEqual(['two'], list(links['origin']))
+        self.assertEqual(['https://two.example.com/b'], list(links['url']))
+        self.assertEqual([1.0], list(links['similarity']))
+
+    def test_near_duplicate(self):
+        self.index.find_or_add('0000/a', _POSTING)
+        changed = _POSTING[:-1] + ['office']
+        self.assertEqual('0000/a', self.index.find(changed))
+        self.assertIsNone(self.index.find(_POSTING[:12]))
+        self.index.find_or_add('0000/b', changed, 'two', 'https://two.example.com/b')
+        similarity = self.index.get_links('0000/a').loc[0, 'similarity']
+        self.assertGreaterEqual(similarity, 0.8)
+        self.assertLess(similarity, 1.0)
+
+    def test_persistent(self):
+        self.index.find_or_add('0000/a', _POSTING)
+        index = DedupIndex(Path(self.tmp_dir.name, 'dedup.sqlite'))
+        self.assertEqual('0000/a', index.find(_POSTING))
+
+    def test_remove(self):
+        self.index.find_or_add('0000/a', _POSTING)
+        self.index.remove('0000/a')
+        self.assertIsNone(self.index.find(_POSTING))
+
+    def test_seed(self):
+        self.assertFalse(self.index.is_seeded())
+        self.index.find_or_add('0000/a', _POSTING)
+        other = ['another', 'posting', 'for', 'a', 'java', 'developer']
+        added = self.index.seed([('0000/a', _POSTING), ('0000/b', other), ('0000/c', list(other))])
+        # known samples are skipped, but the seeds are not checked against each other
+        self.assertEqual(2, added)
+        self.assertTrue(self.index.is_seeded())
+        self.assertIn(self.index.find(other), ['0000/b', '0000/c'])
+
+    def test_links_of_older_index(self):
+        with closing(sqlite3.connect(self.index.path)) as con, con:
+            con.execute('CREATE TABLE links (sample TEXT, origin TEXT)')
+            con.execute("INSERT INTO links VALUES ('0000/a', 'one')")
+        self.index.find_or_add('0000/a', _POSTING)
+        self.index.find_or_add('0000/b', _POSTING, 'two', 'https://two.example.com/b')
+        links = self.index.get_links('0000/a')
+        self.assertEqual(['one', 'two'], list(links['origin']))
+        self.assertEqual('https://two.example.com/b', links.loc[1, 'url'])
+
+
+if __name__ == '__main__':
+    unittest.main()
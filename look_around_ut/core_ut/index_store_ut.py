@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import sqlite3
+import tempfile
+from contextlib import closing
+import unittest
+from pathlib import Path
+import sys
+sys.path.append('..')
+sys.path.append('../..')
+sys.path.append('../../look_around')
+# autopep8: off
+from look_around.core.index_store import DATA_SCHEMA, SqliteIndexStore
+from look_around.tools import keys
+# autopep8: on
+
+
+class TestSqliteIndexStore(unittest.TestCase):
+
+    tmp_dir: tempfile.TemporaryDirectory
+    store: SqliteIndexStore
+    file_data: pd.DataFrame
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = SqliteIndexStore(
+            Path(self.tmp_dir.name, 'document_index.sqlite'))
+        self.file_data = pd.DataFrame({
+            keys.RAW_FILE: ['0000/a-raw.html', '0000/b-raw.html', '0000/c-raw.html'],
+            keys.PREP_FILE: ['0000/a-raw-cleaned.txt', np.nan, np.nan],
+            keys.ORIGIN: ['req_gen', 'req_gen', np.nan],
+            keys.LANGUAGE: ['english', 'german', np.nan],
+            keys.RATING: [3.0, np.nan, 5.0],
+            keys.LABELED_BY: ['me', np.nan, 'me'],
+            keys.USAGE: ['train', 'test', np.nan]
+        }, index=['a', 'b', 'c'])
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_empty(self):
+        file_data = self.store.read()
+        self.assertEqual(0, len(file_data))
+        self.assertIn(keys.RATING, file_data.columns)
+
+    def test_round_trip(self):
+        self.store.write(self.file_data)
+        file_data = self.store.read()
+        self.assertEqual(list(self.file_data.index), list(file_data.index))
+        self.assertEqual(3, file_data.loc['a', keys.RATING])
+        self.assertTrue(pd.isna(file_data.loc['b', keys.RATING]))
+        self.assertTrue(pd.isna(file_data.loc['c', keys.LANGUAGE]))
+        self.assertEqual('german', file_data.loc['b', keys.LANGUAGE])
+
+    def test_integer_rating(self):
+        self.store.write(self.file_data)
+        with closing(sqlite3.connect(self.store.path)) as con:
+            types = [row[0] for row in con.execute(
+                f'SELECT typeof("{keys.RATING}") FROM samples WHERE "{keys.RATING}" IS NOT NULL')]
+        self.assertEqual(['integer', 'integer'], types)
+
+    def test_upsert(self):
+        self.store.write(self.file_data)
+        self.file_data.loc['b', keys.RATING] = 1
+        self.file_data.loc['a', keys.RATING] = 0  # not written
+        new_row = pd.DataFrame({keys.RAW_FILE: ['0000/d-raw.html']}, index=['d'])
+        self.file_data = pd.concat([self.file_data, new_row])
+        self.store.upsert(self.file_data, ['b', 'd'])
+
+        file_data = self.store.read()
+        self.assertEqual(4, len(file_data))
+        self.assertEqual(3, file_data.loc['a', keys.RATING])
+        self.assertEqual(1, file_data.loc['b', keys.RATING])
+        self.assertEqual('0000/d-raw.html', file_data.loc['d', keys.RAW_FILE])
+
+    def test_write_replaces(self):
+        self.store.write(self.file_data)
+        self.store.write(self.file_data.loc[['a']])
+        file_data = self.store.read()
+        self.assertEqual(['a'], list(file_data.index))
+
+    def test_extra_column(self):
+        self.file_data['extra'] = ['x', 'y', 'z']
+        self.store.write(self.file_data)
+        file_data = self.store.read()
+        self.assertEqual('y', file_data.loc['b', 'extra'])
+
+    def test_data_schema(self):
+        store = SqliteIndexStore(Path(self.tmp_dir.name, 'data_index.sqlite'), DATA_SCHEMA)
+        rows = pd.DataFrame({keys.RAW_FILE: ['0000/a-raw.html'], keys.PREDICTION: [4.0]},
+                            index=['0000/a-raw.html'])
+        store.upsert(rows)
+        file_data = store.read()
+        self.assertEqual(sorted(DATA_SCHEMA.keys()), sorted(file_data.columns))
+        self.assertNotIn(keys.RATING, file_data.columns)
+        self.assertEqual(4, file_data.loc['0000/a-raw.html', keys.PREDICTION])
+
+    def test_integer_index(self):
+        file_data = self.file_data.reset_index(drop=True)
+        self.store.write(file_data)
+        self.store.upsert(file_data, [1])
+        read = self.store.read()
+        self.assertEqual([0, 1, 2], list(read.index))
+        self.assertTrue(pd.api.types.is_integer_dtype(read.index))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,237 @@
+import numpy as np
+import pandas as pd
+import tempfile
+from scipy.sparse import csr_matrix
+import unittest
+from pathlib import Path
+from unittest import mock
+import sys
+sys.path.append('..')
+sys.path.append('../..')
+sys.path.append('../../look_around')
+# autopep8: off
+from look_around.core.look_around import LookAround
+from look_around.core.project import Project
+from look_around.models.model_wrapper import ModelWrapper
+from look_around.scraper.selenium_scraper import SeleniumScraper
+from look_around.tools import keys
+# autopep8: on
+
+
+class CountingModel(ModelWrapper):
+    """Predicts the number of vocabulary words in a document and notes the batch sizes."""
+
+    batch_sizes: list
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self.batch_sizes = []
+
+    def predict(self, features):
+        self.batch_sizes.append(features.shape[0])
+        return np.asarray(features.sum(axis=1)).ravel().astype(int)
+
+
+class TestRateData(unittest.TestCase):
+
+    tmp_dir: tempfile.TemporaryDirectory
+    la: LookAround
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.la = LookAround()
+        self.la.default_langs = ['english']
+        self.la.prj = Project('unit_test', Path(self.tmp_dir.name))
+        self.la.prj.make_missing_dirs()
+        self.la.vocab = np.array(['python', 'develop', 'databas'])
+        for dir, count in [('0000', 3), ('0001', 2)]:
+            sub_dir = Path(self.la.prj.data_dir, dir)
+            sub_dir.mkdir()
+            for num in range(count):
+                Path(sub_dir, f'{num}-raw.html').write_text(
+                    '<html><body><p>We are looking for a python developer.</p></body></html>')
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_rate_in_batches(self):
+        model = CountingModel('counter')
+        self.assertEqual(5, self.la.rate_data(model, batch_size=2))
+        self.assertEqual([2, 2, 1], model.batch_sizes)
+        data_index = self.la.read_data_index()
+        self.assertEqual(5, len(data_index))
+        self.assertEqual([2] * 5, list(data_index[keys.PREDICTION]))
+        self.assertEqual(['counter'] * 5, list(data_index[keys.PREDICTED_BY]))
+        self.assertTrue(data_index[keys.PREP_FILE].notna().all())
+
+    def test_rate_new_files_only(self):
+        model = CountingModel('counter')
+        self.la.rate_data(model, batch_size=2)
+        Path(self.la.prj.data_dir, '0001', 'new-raw.html').write_text(
+            '<html><body><p>Our databases need a python developer.</p></body></html>')
+        self.assertEqual(1, self.la.rate_data(model, batch_size=2))
+        data_index = self.la.read_data_index()
+        self.assertEqual(6, len(data_index))
+        self.assertEqual(3, data_index.loc['0001/new-raw.html', keys.PREDICTION])
+
+
+
+class TestPrepareUncleanSamples(unittest.TestCase):
+
+    tmp_dir: tempfile.TemporaryDirectory
+    la: LookAround
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.la = LookAround()
+        self.la.training_mode = True
+        self.la.default_langs = ['english']
+        self.la.prj = Project('unit_test', Path(self.tmp_dir.name))
+        self.la.prj.make_missing_dirs()
+        sub_dir = Path(self.la.prj.training_dir, '0000')
+        sub_dir.mkdir()
+        raw_files = []
+        for num in range(3):
+            raw_file = f'0000/sample{num}-raw.html'
+            with open(Path(self.la.prj.training_dir, raw_file), 'wt') as file:
+                file.write(
+                    f'<html><body><p>Developing databases {num}</p><p>with Python</p></body></html>')
+            raw_files.append(raw_file)
+        # listed, but not on disk
+        raw_files.append('0000/missing-raw.html')
+        self.la.file_data = pd.DataFrame({keys.RAW_FILE: raw_files, keys.PREP_FILE: [None] * 4,
+                                          keys.LANGUAGE: ['english', 'english', 'english', None]},
+                                         index=raw_files)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _check_prepared(self) -> None:
+        file_data = self.la.file_data
+        for num in range(3):
+            row = f'0000/sample{num}-raw.html'
+            self.assertEqual(f'0000/sample{num}-raw-cleaned.txt',
+                             file_data.loc[row, keys.PREP_FILE])
+            with open(Path(self.la.prj.training_dir, file_data.loc[row, keys.PREP_FILE]), 'rt') as file:
+                self.assertEqual(f'develop databas {num} python', file.read())
+        # an unreadable raw file leaves the row as it is
+        self.assertTrue(pd.isna(file_data.loc['0000/missing-raw.html', keys.PREP_FILE]))
+        self.assertTrue(pd.isna(file_data.loc['0000/missing-raw.html', keys.LANGUAGE]))
+        self.assertEqual(4, len(self.la.prj.read_training_index()))
+
+    def test_serial(self):
+        self.la.prepare_unclean_samples(workers=1)
+        self._check_prepared()
+
+    def test_worker_processes(self):
+        self.la.prepare_unclean_samples(workers=2)
+        self._check_prepared()
+
+
+class TestModelIndex(unittest.TestCase):
+
+    tmp_dir: tempfile.TemporaryDirectory
+    la: LookAround
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.la = LookAround()
+        self.la.prj = Project('unit_test', Path(self.tmp_dir.name))
+        self.la.prj.make_missing_dirs()
+        self.la.read_model_index()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _make_model(self, name: str, score: float) -> ModelWrapper:
+        model = ModelWrapper(name)
+        model.desc = f'model {name}'
+        model.train_scores.loc['avg'] = score
+        model.val_scores.loc['avg'] = score / 2
+        return model
+
+    def test_add_many(self):
+        models = [self._make_model(f'm{num}', num / 10) for num in range(5)]
+        self.la.add_models_to_index(models)
+        model_data = self.la.prj.read_model_index()
+        self.assertEqual([f'm{num}' for num in range(5)], list(model_data.index))
+        self.assertAlmostEqual(0.3, model_data.loc['m3', keys.TRAIN_F1])
+        self.assertAlmostEqual(0.15, model_data.loc['m3', keys.VAL_ACC])
+        self.assertEqual('model m3', model_data.loc['m3', keys.DESC])
+
+    def test_upsert(self):
+        self.la.add_models_to_index([self._make_model('a', 0.2), self._make_model('b', 0.4)])
+        self.la.add_models_to_index([self._make_model('b', 0.8), self._make_model('c', 0.6)])
+        model_data = self.la.prj.read_model_index()
+        self.assertEqual(['a', 'b', 'c'], list(model_data.index))
+        self.assertAlmostEqual(0.8, model_data.loc['b', keys.TRAIN_ACC])
+
+    def test_update_unlisted(self):
+        self.la.update_model_in_index(self._make_model('a', 0.2))
+        self.assertEqual(0, len(self.la.model_data))
+
+
+
+    def test_sweep_replaces_model_in_memory(self):
+        from sklearn.naive_bayes import MultinomialNB
+        rng = np.random.default_rng(3)
+        labels = pd.Series(rng.integers(0, 6, 30))
+        features = csr_matrix(rng.integers(0, 3, (30, 8)))
+        self.la.train_data = (features[:20], labels[:20])
+        self.la.test_data = (features[20:], labels[20:])
+        outdated = ModelWrapper('nb')
+        self.la.prj.model_registry.put(outdated)
+
+        self.assertEqual(['nb'], self.la.sweep_models({'nb': MultinomialNB()}, workers=1))
+        self.assertIn('nb', self.la.model_data.index)
+        model = self.la.prj.read_model('nb')
+        self.assertIsNot(outdated, model)
+        self.assertEqual(20, model.model.class_count_.sum())
+
+
+class _Page():
+    """Stands in for a web driver, just the page source and the url are read."""
+
+    page_source = '<p>a scraped posting</p>'
+    current_url = 'http://localhost/posting'
+
+
+def _run_handlers(scraper: SeleniumScraper, actions, driver=None) -> bool:
+    """Replaces the browser run: every registered handler handles a single page."""
+    for handler in scraper.handlers.values():
+        handler.handle_page(_Page())
+    return True
+
+
+class TestScrape(unittest.TestCase):
+
+    origin = {'origin': 'unit test', 'base_url': 'http://localhost/', 'actions': []}
+
+    @mock.patch.object(SeleniumScraper, 'run', _run_handlers)
+    def test_scrape_without_project(self):
+        la = LookAround()
+        self.assertIsNone(la.prj)
+        handlers = la._make_page_handlers(self.origin, [])
+        self.assertEqual(['print_handler'], list(handlers.keys()))
+        la.scrape_single_origin(self.origin, 'chrome')
+
+
+    @mock.patch.object(SeleniumScraper, 'run', _run_handlers)
+    def test_stored_pages_survive_full_write(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            la = LookAround()
+            la.training_mode = True
+            la.prj = Project('unit_test', Path(tmp_dir))
+            la.prj.make_missing_dirs()
+            la.file_data = la.prj.read_training_index()
+
+            la.scrape_single_origin(self.origin, 'chrome')
+            self.assertEqual(1, len(la.file_data))
+            self.assertEqual('unit test', la.file_data[keys.ORIGIN].iloc[0])
+
+            la.prj.write_training_index(la.file_data)
+            self.assertEqual(1, len(la.prj.read_training_index()))
+
+
+if __name__ == '__main__':
+    unittest.main()
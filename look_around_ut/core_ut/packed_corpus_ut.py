@@ -0,0 +1,74 @@
+import os
+import pandas as pd
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+sys.path.append('..')
+sys.path.append('../..')
+sys.path.append('../../look_around')
+# autopep8: off
+from look_around.core.packed_corpus import PackedCorpus
+# autopep8: on
+
+
+class TestPackedCorpus(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp_dir.name)
+        self.corpus = PackedCorpus(Path(self.dir, 'corpus.txt'), Path(self.dir, 'corpus.csv'), self.dir)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _write(self, texts: pd.Series) -> pd.Series:
+        """Writes the texts into prepared files and packs them."""
+        file_names = pd.Series([f'{id}-cleaned.txt' for id in texts.index], index=texts.index)
+        for id, text in texts.items():
+            Path(self.dir, file_names[id]).write_text(text, encoding='utf-8')
+        self.corpus.write(texts, file_names)
+        return file_names
+
+    def test_read_subset(self):
+        texts = pd.Series(['first', 'zweiter größer', '', 'last'], index=['a', 'b', 'c', 'd'])
+        self._write(texts)
+        self.assertTrue(self.corpus.exists())
+
+        # asked out of storage order, with a sample that is not in the corpus
+        wanted = pd.Series(['d-cleaned.txt', 'b-cleaned.txt', 'c-cleaned.txt', 'e-cleaned.txt'],
+                           index=['d', 'b', 'c', 'e'])
+        found, missing = self.corpus.read(wanted)
+        self.assertEqual({'d': 'last', 'b': 'zweiter größer', 'c': ''}, found.to_dict())
+        self.assertEqual(['e'], list(missing.index))
+
+    def test_read_empty_corpus(self):
+        self._write(pd.Series([''], index=['a']))
+        found, missing = self.corpus.read(pd.Series(['a-cleaned.txt'], index=['a']))
+        self.assertEqual([''], list(found))
+        self.assertEqual(0, len(missing))
+
+    def test_changed_files_are_not_taken(self):
+        file_names = self._write(pd.Series(['first', 'second', 'third'], index=['a', 'b', 'c']))
+        # same size, but written later
+        path = Path(self.dir, 'a-cleaned.txt')
+        path.write_text('fresh', encoding='utf-8')
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        Path(self.dir, 'b-cleaned.txt').write_text('second, longer', encoding='utf-8')
+        Path(self.dir, 'c-cleaned.txt').unlink()
+        found, missing = self.corpus.read(file_names)
+        self.assertEqual(0, len(found))
+        self.assertEqual(['a', 'b', 'c'], list(missing.index))
+
+    def test_old_table_is_ignored(self):
+        file_names = self._write(pd.Series(['first'], index=['a']))
+        table = pd.read_csv(self.corpus.table_path, index_col=0)
+        table.drop(columns=['mtime_ns', 'size']).to_csv(self.corpus.table_path)
+        found, missing = self.corpus.read(file_names)
+        self.assertEqual(0, len(found))
+        self.assertEqual(['a'], list(missing.index))
+
+
+if __name__ == '__main__':
+    unittest.main()
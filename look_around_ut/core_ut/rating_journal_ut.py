@@ -0,0 +1,106 @@
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+import sys
+sys.path.append('..')
+sys.path.append('../..')
+sys.path.append('../../look_around')
+# autopep8: off
+from look_around.core.rating_journal import RatingJournal
+from look_around.tools import keys
+# autopep8: on
+
+
+class TestRatingJournal(unittest.TestCase):
+
+    tmp_dir: tempfile.TemporaryDirectory
+    path: Path
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name, 'journal.jsonl')
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_close_writes_all(self):
+        journal = RatingJournal(self.path, flush_interval=60)
+        for num in range(5):
+            journal.record(f's{num}', num, 'me')
+        journal.close()
+        ratings = RatingJournal(self.path).read()
+        self.assertEqual([f's{num}' for num in range(5)], list(ratings.index))
+        self.assertEqual([0, 1, 2, 3, 4], list(ratings[keys.RATING]))
+
+    def test_written_in_background(self):
+        journal = RatingJournal(self.path, flush_interval=0.05)
+        journal.record('a', 3, 'me')
+        deadline = time.time() + 5
+        while not self.path.exists() and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(['a'], list(journal.read().index))
+        journal.close()
+
+    def test_batch_written_right_away(self):
+        journal = RatingJournal(self.path, flush_interval=60, batch_size=2)
+        journal.record('a', 3, 'me')
+        journal.record('b', 4, 'me')
+        deadline = time.time() + 5
+        while len(journal.read()) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(2, len(journal.read()))
+        journal.close()
+
+    def test_broken_line_skipped(self):
+        self.path.write_text('{"id": "a", "rating": 2, "labeled by": "me"}\n{"id": "b", "rat')
+        ratings = RatingJournal(self.path).read()
+        self.assertEqual(['a'], list(ratings.index))
+
+    def test_clear(self):
+        journal = RatingJournal(self.path)
+        journal.record('a', 3, 'me')
+        journal.close()
+        journal.clear()
+        self.assertEqual(0, len(journal.read()))
+
+    def test_clear_drops_waiting_ratings(self):
+        journal = RatingJournal(self.path, flush_interval=60)
+        journal.record('a', 3, 'me')
+        journal.flush()
+        journal.record('b', 2, 'me')
+        journal.clear()
+        journal.flush()
+        self.assertEqual(0, len(journal.read()))
+        journal.record('c', 1, 'me')
+        journal.close()
+        self.assertEqual(['c'], list(journal.read().index))
+
+    def test_compacting(self):
+        journal = RatingJournal(self.path, flush_interval=60)
+        journal.record('a', 3, 'me')
+        journal.flush()
+        journal.record('b', 2, 'me')
+        with journal.compacting() as ratings:
+            self.assertEqual(['a', 'b'], list(ratings.index))
+            # recorded meanwhile, written after the journal has been emptied
+            thread = threading.Thread(target=lambda: [journal.record('c', 1, 'me'), journal.flush()])
+            thread.start()
+            time.sleep(0.05)
+        thread.join()
+        self.assertEqual(['c'], list(journal.read().index))
+        journal.close()
+
+    def test_failed_compacting_keeps_ratings(self):
+        journal = RatingJournal(self.path)
+        journal.record('a', 3, 'me')
+        with self.assertRaises(RuntimeError):
+            with journal.compacting():
+                raise RuntimeError('index not written')
+        self.assertEqual(['a'], list(journal.read().index))
+        journal.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
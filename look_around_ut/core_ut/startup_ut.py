@@ -0,0 +1,26 @@
+import unittest
+import sys
+sys.path.append('..')
+sys.path.append('../..')
+sys.path.append('../../look_around')
+# autopep8: off
+from look_around.dev_tools import startup_bench
+from look_around.models import backends
+# autopep8: on
+
+
+class TestStartup(unittest.TestCase):
+
+    def test_no_heavy_backends(self):
+        result = startup_bench.measure_import(
+            'look_around.core.look_around', repeats=1)
+        self.assertEqual([], result['heavy'])
+
+    def test_supported_suffixes(self):
+        self.assertTrue(backends.is_supported('.keras'))
+        self.assertTrue(backends.is_supported('.sklearn'))
+        self.assertFalse(backends.is_supported('.txt'))
+
+
+if __name__ == '__main__':
+    unittest.main()
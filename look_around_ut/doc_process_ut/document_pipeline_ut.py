@@ -0,0 +1,49 @@
+import unittest
+import sys
+sys.path.append('..')
+sys.path.append('../..')
+sys.path.append('../../look_around')
+# autopep8: off
+from look_around.doc_process.document_pipeline import DocumentPipeline
+from look_around.doc_process import html_cleaning, stops_removal, stemming
+# autopep8: on
+
+
+class TestDocumentPipeline(unittest.TestCase):
+
+    html: str
+
+    def setUp(self) -> None:
+        self.html = '<html><head><title>Hiring</title></head><body><h1>Junior Developer</h1><p>We are looking for a developer who is running our databases.</p></body></html>'
+
+    def test_same_as_single_steps(self):
+        expect = html_cleaning.clean_html(self.html)
+        expect = stops_removal.remove_stop_words(expect, lang='english')
+        expect = stemming.stem(expect, lang='english')
+        pipeline = DocumentPipeline(['english'])
+        lang, words = pipeline.process(self.html, lang='english')
+        self.assertEqual('english', lang)
+        self.assertEqual(expect, ' '.join(words))
+
+    def test_detect_lang(self):
+        pipeline = DocumentPipeline(['english', 'german'])
+        lang, words = pipeline.process(self.html)
+        self.assertEqual('english', lang)
+        self.assertIsNotNone(words)
+
+    def test_origin_stopwords(self):
+        pipeline = DocumentPipeline(['english'])
+        _, words = pipeline.process(
+            self.html, lang='english', origin_stopwords=frozenset(['junior', 'developer']))
+        self.assertNotIn('junior', words)
+        self.assertNotIn('develop', words)
+
+    def test_unknown_lang(self):
+        pipeline = DocumentPipeline([])
+        lang, words = pipeline.process(self.html)
+        self.assertEqual('unknown', lang)
+        self.assertIsNone(words)
+
+
+if __name__ == '__main__':
+    unittest.main()
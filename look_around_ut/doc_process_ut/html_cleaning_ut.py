@@ -46,6 +46,26 @@ class TestHtmlCleaning(unittest.TestCase):
         text = cl.clean_html(html)
         self.assertEqual(expect, text)
 
+    def test_deeply_nested_html(self):
+        depth = 2000
+        html = ''.join(['<div>' for _ in range(depth)]) + 'hello' + \
+            ''.join(['</div>' for _ in range(depth)]) + 'world'
+        expect = 'hello world'
+        text = cl.clean_html(html)
+        self.assertEqual(expect, text)
+
+    def test_unclosed_tags(self):
+        html = '<p>hello<p>world<custom attr="x">again'
+        expect = 'hello world again'
+        text = cl.clean_html(html)
+        self.assertEqual(expect, text)
+
+    def test_skipped_bodies(self):
+        html = '<style>p {color: red;}</style>hello<script type="text/javascript">if (a < b) {}</script> <title>Title</title>world'
+        expect = 'hello world'
+        text = cl.clean_html(html)
+        self.assertEqual(expect, text)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import sys
+sys.path.append('..')
+sys.path.append('../..')
+sys.path.append('../../look_around')
+# autopep8: off
+from look_around.doc_process import stemming as st
+# autopep8: on
+
+
+class TestStemming(unittest.TestCase):
+
+    def setUp(self) -> None:
+        st.set_cache_size(100)
+        st.clear_cache()
+
+    def tearDown(self) -> None:
+        st.clear_cache()
+
+    def test_stem(self):
+        text = 'running runner runs'
+        expect = 'run runner run'
+        stemmed = st.stem(text)
+        self.assertEqual(expect, stemmed)
+
+    def test_hits_and_misses(self):
+        st.stem('running runs running')
+        st.stem('runs')
+        info = st.get_cache_info()
+        self.assertEqual(2, info['hits'])
+        self.assertEqual(2, info['misses'])
+        self.assertEqual(2, info['size'])
+
+    def test_languages_apart(self):
+        st.stem('die', lang='english')
+        st.stem('die', lang='german')
+        info = st.get_cache_info()
+        self.assertEqual(0, info['hits'])
+        self.assertEqual(2, info['misses'])
+
+    def test_eviction(self):
+        st.set_cache_size(2)
+        st.stem('apples bananas')
+        st.stem('apples')  # bananas is now least recently used
+        st.stem('cherries')
+        info = st.get_cache_info()
+        self.assertEqual(2, info['size'])
+        st.stem('apples')
+        self.assertEqual(2, st.get_cache_info()['hits'])
+        st.stem('bananas')
+        self.assertEqual(2, st.get_cache_info()['hits'])
+
+    def test_no_cache(self):
+        st.set_cache_size(0)
+        stemmed = st.stem('running running')
+        self.assertEqual('run run', stemmed)
+        info = st.get_cache_info()
+        self.assertEqual(0, info['hits'])
+        self.assertEqual(0, info['size'])
+
+
+if __name__ == '__main__':
+    unittest.main()
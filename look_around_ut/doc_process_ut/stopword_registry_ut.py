@@ -0,0 +1,44 @@
+import unittest
+import sys
+sys.path.append('..')
+sys.path.append('../..')
+sys.path.append('../../look_around')
+# autopep8: off
+from look_around.doc_process import stopword_registry as reg
+# autopep8: on
+
+
+class TestStopwordRegistry(unittest.TestCase):
+
+    def setUp(self) -> None:
+        reg.clear()
+
+    def tearDown(self) -> None:
+        reg.clear()
+
+    def test_loaded_once(self):
+        first = reg.get_stopwords('english')
+        second = reg.get_stopwords('english')
+        self.assertIs(first, second)
+        self.assertIsInstance(first, frozenset)
+        self.assertIn('the', first)
+
+    def test_register(self):
+        words = ['b', 'c', 'e', 'c']
+        expect = frozenset(['b', 'c', 'e'])
+        registered = reg.register_stopwords('origin:unit test', words)
+        self.assertEqual(expect, registered)
+        self.assertIs(registered, reg.get_registered('origin:unit test'))
+        self.assertIs(registered, reg.get_stopwords('origin:unit test'))
+
+    def test_not_registered(self):
+        self.assertRaises(KeyError, reg.get_registered, 'origin:unit test')
+
+    def test_clear(self):
+        reg.register_stopwords('origin:unit test', ['a'])
+        reg.clear()
+        self.assertRaises(KeyError, reg.get_registered, 'origin:unit test')
+
+
+if __name__ == '__main__':
+    unittest.main()
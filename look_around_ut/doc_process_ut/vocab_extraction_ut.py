@@ -1,6 +1,8 @@
 import numpy as np
 import numpy.typing as npt
 from functools import reduce
+from scipy.sparse import csr_matrix
+import tracemalloc
 import unittest
 import sys
 sys.path.append('..')
@@ -61,6 +63,39 @@ class TestVocabExtraction(unittest.TestCase):
         self.assertFalse(np.equal(vocab, 'although').any() and
                          np.equal(vocab, 'coughed').any(), 'both words still present')
 
+    def test_correlated_across_blocks(self):
+        # 'although' and 'dramatically' always appear together, with many words in between.
+        # A tiny memory budget enforces one word per block
+        docs = [
+            'although bart dramatically',
+            'coughed',
+            'although coughed dramatically elephants',
+            'bart elephants fancy',
+            'fancy'
+        ]
+        expect = ['bart', 'coughed', 'dramatically', 'elephants', 'fancy']
+        vocab: npt.NDArray = ve.extract_vocab(
+            docs, verbose=False, max_memory=1)
+        self.assertEqual(len(expect), len(vocab), 'varying length, expected [' +
+                         self.print_list(expect)+'] but got ['+self.print_list(vocab)+']')
+
+        for c in expect:
+            self.assertTrue(np.equal(vocab, c).any(), f'missing word {c}')
+
+    def test_memory_bound(self):
+        rng = np.random.default_rng(0)
+        matrix = csr_matrix((rng.random((300, 2000)) < 0.3).astype(float))
+        inputs = matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+        max_memory = 2**22
+        tracemalloc.start()
+        try:
+            ve._find_correlated_words(matrix, 0.98, max_memory, False)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        # besides the transposed copy of the matrix, just the block is held
+        self.assertLess(peak - inputs, 1.2 * max_memory)
+
     def print_list(self, lst):
         if len(lst) > 1:
             return reduce(lambda a, b: str(a)+', '+str(b), lst)
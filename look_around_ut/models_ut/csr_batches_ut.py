@@ -0,0 +1,64 @@
+import numpy as np
+import unittest
+from scipy.sparse import csr_matrix, random
+import sys
+sys.path.append('..')
+sys.path.append('../..')
+sys.path.append('../../look_around')
+# autopep8: off
+from look_around.models.csr_batches import CsrBatches
+# autopep8: on
+
+
+class TestCsrBatches(unittest.TestCase):
+
+    features: csr_matrix
+
+    def setUp(self) -> None:
+        self.features = random(10, 7, density=0.3, format='csr', random_state=1)
+
+    def test_dense_batches(self):
+        batches = CsrBatches(self.features, batch_size=4)
+        self.assertEqual(3, len(batches))
+        self.assertEqual((2, 7), batches[2].shape)
+        dense = np.concatenate([batches[idx] for idx in range(len(batches))])
+        self.assertTrue(np.allclose(self.features.toarray(), dense))
+
+    def test_targets(self):
+        targets = np.arange(10)
+        batches = CsrBatches(self.features, targets=targets, batch_size=4)
+        features, batch_targets = batches[1]
+        self.assertEqual((4, 7), features.shape)
+        self.assertEqual([4, 5, 6, 7], list(batch_targets))
+
+    def test_sparse_batches(self):
+        batches = CsrBatches(self.features, batch_size=4, sparse=True)
+        self.assertEqual(0, (batches[0] != self.features[0:4]).nnz)
+
+    def test_out_of_range(self):
+        batches = CsrBatches(self.features, batch_size=5)
+        with self.assertRaises(IndexError):
+            batches[2]
+
+    def test_shuffle(self):
+        targets = np.arange(10)
+        batches = CsrBatches(self.features, targets=targets, batch_size=4, shuffle=True, seed=5)
+        first = np.concatenate([batches[idx][1] for idx in range(len(batches))])
+        # every row once, with the targets staying on their rows
+        self.assertEqual(list(range(10)), sorted(first))
+        features, batch_targets = batches[0]
+        self.assertTrue(np.allclose(self.features[batch_targets].toarray(), features))
+
+        batches.on_epoch_end()
+        second = np.concatenate([batches[idx][1] for idx in range(len(batches))])
+        self.assertEqual(list(range(10)), sorted(second))
+        self.assertNotEqual(list(first), list(second))
+
+    def test_no_shuffle_by_default(self):
+        batches = CsrBatches(self.features, targets=np.arange(10), batch_size=4)
+        batches.on_epoch_end()
+        self.assertEqual([0, 1, 2, 3], list(batches[0][1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
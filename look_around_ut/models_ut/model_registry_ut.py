@@ -0,0 +1,77 @@
+import numpy as np
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+sys.path.append('..')
+sys.path.append('../..')
+sys.path.append('../../look_around')
+# autopep8: off
+from look_around.models.model_registry import ModelRegistry
+from look_around.models.model_wrapper import ModelWrapper as MW
+from look_around.models import backends
+# autopep8: on
+
+
+def _load_fake(name: str, file: Path) -> MW:
+    model = MW(name)
+    model.desc = file.read_text()
+    return model
+
+
+class TestModelRegistry(unittest.TestCase):
+
+    tmp_dir: tempfile.TemporaryDirectory
+    registry: ModelRegistry
+
+    def setUp(self) -> None:
+        backends.register_loader('.fake', _load_fake)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp_dir.name)
+        for name in ['a', 'b', 'c']:
+            Path(self.dir, f'{name}.fake').write_text(name)
+        Path(self.dir, 'a.txt').write_text('notes')
+        self.registry = ModelRegistry(self.dir, max_models=2)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_kept_in_memory(self):
+        model = self.registry.get('a')
+        self.assertEqual('a', model.desc)
+        self.assertIs(model, self.registry.get('a'))
+        self.assertEqual(1, self.registry.loads)
+
+    def test_least_recently_used_dropped(self):
+        self.registry.get('a')
+        self.registry.get('b')
+        self.registry.get('a')
+        self.registry.get('c')
+        self.assertEqual(['a', 'c'], self.registry.info()['models'])
+        self.registry.get('b')
+        self.assertEqual(4, self.registry.loads)
+
+    def test_new_file_found(self):
+        self.registry.get('a')
+        Path(self.dir, 'd.fake').write_text('d')
+        self.assertEqual('d', self.registry.get('d').desc)
+
+    def test_missing(self):
+        with self.assertRaises(FileNotFoundError):
+            self.registry.get('e')
+
+    def test_put(self):
+        model = MW('e')
+        self.registry.put(model)
+        self.assertIs(model, self.registry.get('e'))
+        self.assertEqual(0, self.registry.loads)
+
+    def test_put_clears_predictions(self):
+        model = MW('e')
+        model.predict_cached(np.ones((3, 2)))
+        self.registry.put(model)
+        self.assertEqual([], model._predictions)
+
+
+if __name__ == '__main__':
+    unittest.main()
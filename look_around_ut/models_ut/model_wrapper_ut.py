@@ -2,12 +2,14 @@ import numpy.typing as npt
 import numpy as np
 import pandas as pd
 import unittest
+from scipy.sparse import csr_matrix, issparse
 import sys
 sys.path.append('..')
 sys.path.append('../..')
 sys.path.append('../../look_around')
 # autopep8: off
 from look_around.models.model_wrapper import ModelWrapper as MW
+from look_around.tools import keys
 # autopep8: on
 
 _CATS = 3
@@ -88,6 +90,57 @@ class TestModelWrapper(unittest.TestCase):
             self.assertAlmostEqual(
                 expect[idx], actual[idx], delta=.001, msg=f'Wrong f1 in index {idx}')
 
+    def test_compute_confusion_matrix(self):
+        expect = np.array([[4, 0, 0], [1, 2, 1], [1, 2, 1]])
+        actual = self.mw.compute_confusion_matrix(
+            self.labels, self.predictions, categories=_CATS)
+        self.assertTrue(np.array_equal(expect, actual))
+
+    def test_compute_scores(self):
+        scores = self.mw.compute_scores(
+            self.labels, self.predictions, categories=_CATS)
+        self.assertEqual([0, 1, 2, 'avg'], list(scores.index))
+        self.assertTrue(np.allclose(self.mw.compute_f1(
+            self.labels, self.predictions, categories=_CATS), scores[keys.F1].values))
+        self.assertAlmostEqual(7/12, scores.loc['avg', keys.ACCURACY])
+
+    def test_scores_without_predictions_of_label(self):
+        labels = pd.Series([0, 1, 1, 0])
+        pred = np.array([0, 0, 0, 0])
+        scores = self.mw.compute_scores(labels, pred, categories=2)
+        self.assertEqual(0., scores.loc[1, keys.PRECISION])
+        self.assertEqual(0., scores.loc[1, keys.F1])
+
+    def test_predict_proba(self):
+        self.mw.predict = lambda features: np.array([2, 0, 7])
+        proba = self.mw.predict_proba(None, categories=_CATS)
+        self.assertTrue(np.array_equal([[0, 0, 1], [1, 0, 0], [0, 0, 0]], proba))
+        self.assertFalse(self.mw.partial_fit(None, self.labels))
+
+    def test_predict_cached(self):
+        calls = []
+
+        def predict(features):
+            calls.append(features)
+            return np.zeros(features.shape[0], dtype=int)
+        self.mw.predict = predict
+        train = csr_matrix(np.ones((12, 2)))
+        val = csr_matrix(np.eye(12, 2))
+        self.mw.compute_training_scores(train, self.labels)
+        self.mw.validate(val, self.labels)
+        self.mw.validate(val, self.labels)
+        # an equal matrix is recognized, a changed one is not
+        self.mw.compute_training_scores(csr_matrix(np.ones((12, 2))), self.labels)
+        self.assertEqual(2, len(calls))
+        train[0, 0] = 2
+        self.mw.compute_training_scores(train, self.labels)
+        self.assertEqual(3, len(calls))
+        self.mw.clear_predictions()
+        self.mw.validate(val, self.labels)
+        self.assertEqual(4, len(calls))
+        # no matrix is kept alive
+        self.assertFalse(any([issparse(part) for entry in self.mw._predictions for part in entry]))
+
 
 if __name__ == '__main__':
     unittest.main()
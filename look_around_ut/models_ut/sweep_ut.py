@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import tempfile
+import unittest
+from pathlib import Path
+from scipy.sparse import csr_matrix
+import sys
+sys.path.append('..')
+sys.path.append('../..')
+sys.path.append('../../look_around')
+# autopep8: off
+from sklearn.naive_bayes import MultinomialNB
+from look_around.models.sweep import SweepRunner, make_grid
+from look_around.tools import keys
+# autopep8: on
+
+
+def _interrupted(name):
+    raise KeyboardInterrupt()
+
+
+def _failing(name):
+    raise ValueError('cannot build')
+
+
+class TestSweep(unittest.TestCase):
+
+    tmp_dir: tempfile.TemporaryDirectory
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(3)
+        labels = pd.Series(rng.integers(0, 6, 60))
+        # the label is encoded in the features, so the models can learn it
+        features = rng.integers(0, 2, (60, 12))
+        features[np.arange(60), labels.values] = 5
+        self.train_data = (csr_matrix(features[:40]), labels[:40])
+        self.test_data = (csr_matrix(features[40:]), labels[40:])
+        self.grid = make_grid('nb', MultinomialNB(), {'alpha': [0.1, 1.0]})
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_make_grid(self):
+        self.assertEqual(['nb_0', 'nb_1'], list(self.grid.keys()))
+        self.assertEqual(1.0, self.grid['nb_1'].alpha)
+
+    def test_run(self):
+        for workers in [1, 2]:
+            done = []
+            runner = SweepRunner(Path(self.tmp_dir.name), workers=workers)
+            trained = runner.run(self.grid, self.train_data, self.test_data, on_done=done.append)
+            self.assertEqual(['nb_0', 'nb_1'], sorted(trained))
+            self.assertEqual(sorted(trained), sorted([model.name for model in done]))
+            self.assertGreater(done[0].val_scores.loc['avg', keys.ACCURACY], 0.5)
+            self.assertTrue(Path(self.tmp_dir.name, 'nb_0.sklearn').exists())
+
+    def test_resume(self):
+        done = []
+        runner = SweepRunner(Path(self.tmp_dir.name), workers=1)
+        trained = runner.run(self.grid, self.train_data, self.test_data,
+                             skip=['nb_0'], on_done=done.append)
+        self.assertEqual(['nb_1'], trained)
+        self.assertEqual(1, len(done))
+
+    def test_failed_job_is_skipped(self):
+        jobs = {'broken': _failing, 'nb_0': self.grid['nb_0']}
+        runner = SweepRunner(Path(self.tmp_dir.name), workers=1)
+        trained = runner.run(jobs, self.train_data, self.test_data)
+        self.assertEqual(['nb_0'], trained)
+
+    def test_interrupt_stops_sweep(self):
+        jobs = {'stopped': _interrupted, 'nb_0': self.grid['nb_0']}
+        done = []
+        runner = SweepRunner(Path(self.tmp_dir.name), workers=1)
+        with self.assertRaises(KeyboardInterrupt):
+            runner.run(jobs, self.train_data, self.test_data, on_done=done.append)
+        self.assertEqual([], done)
+        self.assertFalse(Path(self.tmp_dir.name, 'nb_0.sklearn').exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
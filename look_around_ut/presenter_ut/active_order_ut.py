@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import unittest
+from scipy.sparse import csr_matrix
+import sys
+sys.path.append('..')
+sys.path.append('../..')
+sys.path.append('../../look_around')
+# autopep8: off
+from sklearn.naive_bayes import MultinomialNB
+from look_around.models.sklearn_model import SklearnModel
+from look_around.presenter import active_order
+from look_around.presenter.active_order import ActiveOrder
+# autopep8: on
+
+
+class TestActiveOrder(unittest.TestCase):
+
+    features: csr_matrix
+    ids: list
+
+    def setUp(self) -> None:
+        rng = np.random.default_rng(5)
+        labels = rng.integers(0, 6, 40)
+        features = rng.integers(0, 2, (40, 12))
+        features[np.arange(40), labels] = 4
+        model = MultinomialNB().fit(features[:20], labels[:20])
+        self.model = SklearnModel('nb', model)
+        self.features = csr_matrix(features[20:])
+        self.labels = labels[20:]
+        self.ids = [f's{num}' for num in range(20)]
+
+    def test_compute_uncertainty(self):
+        proba = np.array([[1., 0., 0.], [0.4, 0.4, 0.2], [0.8, 0.1, 0.1]])
+        for method in [active_order.ENTROPY, active_order.MARGIN, active_order.LEAST_CONFIDENT]:
+            scores = active_order.compute_uncertainty(proba, method)
+            self.assertAlmostEqual(0., scores[0])
+            self.assertGreater(scores[1], scores[2])
+        with self.assertRaises(ValueError):
+            active_order.compute_uncertainty(proba, 'unknown')
+
+    def test_top(self):
+        order = ActiveOrder(self.model, self.features, self.ids)
+        proba = self.model.predict_proba(self.features)
+        expect = np.argsort(-active_order.compute_uncertainty(proba), kind='stable')
+        self.assertEqual([self.ids[row] for row in expect[:5]], order.top(5))
+        self.assertNotIn(self.ids[expect[0]], order.top(5, exclude=[self.ids[expect[0]]]))
+
+    def test_rated_leave(self):
+        order = ActiveOrder(self.model, self.features, self.ids, refit_every=100)
+        first = order.top(1)[0]
+        order.add_rating(first, 3)
+        self.assertNotIn(first, order.top(20))
+        self.assertEqual(19, len(order.top(20)))
+        order.close()
+
+    def test_update(self):
+        order = ActiveOrder(self.model, self.features, self.ids, refit_every=3)
+        for row in range(3):
+            order.add_rating(self.ids[row], self.labels[row])
+        self.assertTrue(order.wait_idle(timeout=10))
+        self.assertEqual(1, order.updates)
+        order.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import sys
+sys.path.append('..')
+sys.path.append('../..')
+sys.path.append('../../look_around')
+# autopep8: off
+from look_around.presenter.page_cache import PageCache
+# autopep8: on
+
+
+class TestPageCache(unittest.TestCase):
+
+    loaded: list
+    cache: PageCache
+
+    def setUp(self) -> None:
+        self.loaded = []
+        self.cache = PageCache(self._load, max_pages=3)
+
+    def tearDown(self) -> None:
+        self.cache.close()
+
+    def _load(self, key: str) -> str:
+        if key == 'broken':
+            raise OSError('cannot read')
+        self.loaded.append(key)
+        return f'<p>{key}</p>'
+
+    def test_get(self):
+        self.assertEqual('<p>a</p>', self.cache.get('a'))
+        self.assertEqual('<p>a</p>', self.cache.get('a'))
+        self.assertEqual(['a'], self.loaded)
+
+    def test_least_recently_used_dropped(self):
+        for key in ['a', 'b', 'c', 'a', 'd']:
+            self.cache.get(key)
+        self.assertTrue(self.cache.contains('a'))
+        self.assertFalse(self.cache.contains('b'))
+
+    def test_prefetch(self):
+        self.cache.prefetch(['a', 'broken', 'b'])
+        self.assertTrue(self.cache.wait_idle(timeout=5))
+        self.assertTrue(self.cache.contains('a'))
+        self.assertTrue(self.cache.contains('b'))
+        self.assertEqual('<p>b</p>', self.cache.get('b'))
+        self.assertEqual(['a', 'b'], self.loaded)
+
+    def test_get_raises(self):
+        with self.assertRaises(OSError):
+            self.cache.get('broken')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import importlib.util
+import tempfile
+import unittest
+from pathlib import Path
+import pandas as pd
+import sys
+sys.path.append('..')
+sys.path.append('../..')
+sys.path.append('../../look_around')
+# autopep8: off
+from look_around.tools import keys
+# autopep8: on
+
+
+class _FixedOrder():
+    """Stands in for the active order, with fixed uncertainties."""
+
+    ids: list
+    """The samples, most uncertain first."""
+
+    def __init__(self, ids: list) -> None:
+        self.ids = ids
+
+    def top(self, count: int, exclude=[]) -> list:
+        return [id for id in self.ids if id not in exclude][:count]
+
+    def close(self) -> None:
+        pass
+
+
+@unittest.skipIf(importlib.util.find_spec('tkinterweb') is None, 'the rating window needs tkinterweb')
+class TestPresenter(unittest.TestCase):
+
+    def setUp(self) -> None:
+        from look_around.presenter.presenter import Presenter
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        ids = ['s0', 's1', 's2']
+        self.data = pd.DataFrame({keys.RAW_FILE: [f'{id}.html' for id in ids]}, index=ids)
+        self.make = lambda order: Presenter(self.data, Path(self.tmp_dir.name), prefetch=0, order=order)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_first_pick_may_be_first_sample(self):
+        presenter = self.make(_FixedOrder(['s0', 's2', 's1']))
+        self.assertEqual(0, presenter.cur_idx)
+        self.assertEqual([0], presenter.history)
+        presenter.pages.close()
+
+    def test_next_skips_current(self):
+        presenter = self.make(_FixedOrder(['s1', 's2', 's0']))
+        self.assertEqual(1, presenter.cur_idx)
+        # the current sample is still the most uncertain, but is not shown again
+        presenter._move_to_most_uncertain()
+        self.assertEqual(2, presenter.cur_idx)
+        presenter.pages.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,166 @@
+import pandas as pd
+import tempfile
 import unittest
+from pathlib import Path
 import sys
 sys.path.append('..')
 sys.path.append('../..')
 sys.path.append('../../look_around')
 # autopep8: off
-from look_around.core.project import Project as Pro
+from look_around.core.project import INDEX_SQLITE, Project as Pro
+from look_around.tools import keys
 # autopep8: on
 
 
 class TestProject(unittest.TestCase):
-    pass
+
+    tmp_dir: tempfile.TemporaryDirectory
+    prj: Pro
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.prj = Pro('unit_test', Path(self.tmp_dir.name))
+        self.prj.make_missing_dirs()
+        for dir in ['0000', '0001']:
+            sub_dir = Path(self.prj.training_dir, dir)
+            sub_dir.mkdir()
+            for name in ['a-raw.html', 'b-raw.htm', 'c-raw-cleaned.txt']:
+                Path(sub_dir, name).write_text('<html></html>')
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_update_training_index(self):
+        file_data = self.prj.read_training_index()
+        file_data = self.prj.update_training_index(file_data)
+        expect = sorted([str(Path(dir, name)) for dir in ['0000', '0001']
+                        for name in ['a-raw.html', 'b-raw.htm']])
+        self.assertEqual(expect, sorted(file_data[keys.RAW_FILE]))
+        self.assertEqual(expect, sorted(self.prj.read_training_index().index))
+
+    def test_update_training_index_no_duplicates(self):
+        file_data = self.prj.read_training_index()
+        file_data = self.prj.update_training_index(file_data)
+        Path(self.prj.training_dir, '0001', 'd-raw.html').write_text('')
+        file_data = self.prj.update_training_index(file_data)
+        self.assertEqual(5, len(file_data))
+        self.assertTrue(file_data.index.is_unique)
+
+    def test_update_training_index_lost_rows(self):
+        file_data = self.prj.read_training_index()
+        file_data = self.prj.update_training_index(file_data)
+        # directories are unchanged, but the index has lost a row
+        file_data = file_data.drop(file_data.index[0])
+        file_data = self.prj.update_training_index(file_data)
+        self.assertEqual(4, len(file_data))
+
+    def test_read_samples(self):
+        file_data = self._make_prepared_index()
+        samples = self.prj.read_train_samples(file_data)
+        self.assertEqual(['a', 'c'], list(samples.index))
+        self.assertEqual(['text a', 'text c'], list(samples))
+
+    def test_read_packed_samples(self):
+        file_data = self._make_prepared_index()
+        self.assertEqual(4, self.prj.pack_training_samples(file_data))
+        # a file prepared again and a sample prepared after packing are read from their files
+        Path(self.prj.training_dir, '0000', 'a-raw-cleaned.txt').write_text('changed')
+        Path(self.prj.training_dir, '0001', 'e-raw-cleaned.txt').write_text('text e ü')
+        file_data.loc['e'] = ['0001/e-raw.html', '0001/e-raw-cleaned.txt', 1, 'train']
+        samples = self.prj.read_train_samples(file_data)
+        self.assertEqual(['a', 'c', 'e'], list(samples.index))
+        self.assertEqual(['changed', 'text c', 'text e ü'], list(samples))
+
+    def test_read_no_samples(self):
+        file_data = self._make_prepared_index()
+        file_data[keys.RATING] = float('nan')
+        samples = self.prj.read_train_samples(file_data)
+        self.assertEqual(0, len(samples))
+
+    def test_append_data_index(self):
+        for index_format in ['csv', 'sqlite']:
+            prj = Pro(f'data_{index_format}', Path(self.tmp_dir.name), index_format=index_format)
+            prj.make_missing_dirs()
+            self.assertEqual(0, len(prj.read_data_index()))
+            for names, pred in [(['0000/a-raw.html', '0000/b-raw.html'], 3), (['0001/c-raw.html'], 5)]:
+                rows = pd.DataFrame({keys.RAW_FILE: names, keys.LANGUAGE: 'english',
+                                     keys.PREDICTION: pred, keys.PREDICTED_BY: 'm'}, index=names)
+                prj.append_data_index_rows(rows)
+            data_index = prj.read_data_index()
+            self.assertEqual(['0000/a-raw.html', '0000/b-raw.html', '0001/c-raw.html'],
+                             sorted(data_index.index))
+            self.assertEqual([3, 3, 5], list(data_index.sort_index()[keys.PREDICTION]))
+
+    def test_find_new_data_files(self):
+        sub_dir = Path(self.prj.data_dir, '0000')
+        sub_dir.mkdir()
+        for name in ['a-raw.html', 'b-raw.html']:
+            Path(sub_dir, name).write_text('<html></html>')
+        names = ['0000/a-raw.html']
+        self.prj.append_data_index_rows(pd.DataFrame({keys.RAW_FILE: names}, index=names))
+        new_files, manifest = self.prj.find_new_data_files(self.prj.read_data_index())
+        self.assertEqual(['0000/b-raw.html'], new_files)
+        self.assertEqual(1, len(self.prj.read_data_index()))
+
+    def test_compact_rating_journal(self):
+        file_data = self._make_prepared_index()
+        self.prj.write_training_index(file_data)
+        journal = self.prj.get_rating_journal()
+        journal.record('b', 4, 'me')
+        journal.record('x', 1, 'me')
+        journal.record('b', 1, 'me')
+        journal.close()
+        file_data = self.prj.read_training_index()
+        self.assertEqual(1, file_data.loc['b', keys.RATING])
+        self.assertEqual('me', file_data.loc['b', keys.LABELED_BY])
+        self.assertNotIn('x', file_data.index)
+        self.assertEqual(0, len(journal.read()))
+        self.assertEqual(1, self.prj.read_training_index().loc['b', keys.RATING])
+        self.assertIs(journal, self.prj.get_rating_journal())
+
+    def test_migrate_csv_to_sqlite(self):
+        file_data = self._make_prepared_index()
+        file_data[keys.LANGUAGE] = ['english', 'german', None, 'english']
+        self.prj.write_training_index(file_data)
+        csv_path = Path(self.prj.training_dir, 'document_index.csv')
+        self.assertTrue(csv_path.exists())
+
+        prj = Pro('unit_test', Path(self.tmp_dir.name), index_format=INDEX_SQLITE)
+        migrated = prj.read_training_index()
+        self.assertFalse(csv_path.exists())
+        self.assertTrue(Path(self.prj.training_dir, 'document_index.csv.migrated').exists())
+        self.assertTrue(Path(self.prj.training_dir, 'document_index.sqlite').exists())
+        self.assertEqual(list(file_data.index), list(migrated.index))
+        self.assertEqual([3, 2, 5, 0], list(migrated[keys.RATING]))
+        self.assertTrue(pd.api.types.is_integer_dtype(migrated[keys.RATING]))
+        self.assertEqual(list(file_data[keys.PREP_FILE]), list(migrated[keys.PREP_FILE]))
+        self.assertTrue(pd.isna(migrated.loc['c', keys.LANGUAGE]))
+
+        # without a configured format, the database is found and used from now on
+        prj = Pro('unit_test', Path(self.tmp_dir.name))
+        self.assertIsNotNone(prj._get_training_index_store())
+        migrated.loc['b', keys.RATING] = 4
+        prj.write_training_index_rows(migrated, ['b'])
+        self.assertEqual(4, prj.read_training_index().loc['b', keys.RATING])
+        self.assertFalse(csv_path.exists())
+
+    def test_csv_by_default(self):
+        self.prj.write_training_index(self._make_prepared_index())
+        self.assertIsNone(self.prj._get_training_index_store())
+        self.assertEqual(4, len(self.prj.read_training_index()))
+        self.assertFalse(Path(self.prj.training_dir, 'document_index.sqlite').exists())
+
+    def _make_prepared_index(self):
+        names = {'a': '0000/a', 'b': '0000/b', 'c': '0001/c', 'd': '0001/d'}
+        for id, name in names.items():
+            Path(self.prj.training_dir, name + '-raw-cleaned.txt').write_text(f'text {id}\n')
+        file_data = pd.DataFrame({
+            keys.RAW_FILE: [name + '-raw.html' for name in names.values()],
+            keys.PREP_FILE: [name + '-raw-cleaned.txt' for name in names.values()],
+            keys.RATING: [3, 2, 5, 0],
+            keys.USAGE: ['train', 'test', 'train', 'test']
+        }, index=list(names.keys()))
+        return file_data
 
 
 if __name__ == '__main__':
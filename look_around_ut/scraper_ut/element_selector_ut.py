@@ -0,0 +1,35 @@
+from selenium.webdriver.common.by import By
+import unittest
+import sys
+sys.path.append('..')
+sys.path.append('../..')
+sys.path.append('../../look_around')
+# autopep8: off
+from look_around.scraper.element_selector import parse_selector
+# autopep8: on
+
+
+class TestElementSelector(unittest.TestCase):
+
+    def test_parse(self):
+        selector = parse_selector(' class = item ')
+        self.assertEqual(By.CLASS_NAME, selector.by)
+        self.assertEqual('item', selector.value)
+        self.assertIsNone(selector.index)
+        self.assertFalse(selector.shadow)
+
+    def test_parse_index(self):
+        selector = parse_selector('tag=li[2]')
+        self.assertEqual(By.TAG_NAME, selector.by)
+        self.assertEqual('li', selector.value)
+        self.assertEqual(2, selector.index)
+        self.assertEqual('tag name=li[2]', repr(selector))
+
+    def test_parse_invalid(self):
+        for child in ['class', 'class=', '=item', 'a=b=c', 'invalid=item', 'tag=li[x]', 'tag=[2]']:
+            self.assertRaises(ValueError, parse_selector, child)
+        self.assertRaises(ValueError, parse_selector, 'tag=li[2]', False)
+
+
+if __name__ == '__main__':
+    unittest.main()
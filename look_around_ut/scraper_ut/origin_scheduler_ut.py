@@ -0,0 +1,207 @@
+import tempfile
+import threading
+import time
+import unittest
+from functools import partial
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+from pathlib import Path
+import sys
+sys.path.append('..')
+sys.path.append('../..')
+sys.path.append('../../look_around')
+# autopep8: off
+from look_around.scraper.origin_scheduler import OriginScheduler, group_by_host
+from look_around.scraper.page_handlers.page_handler import PageHandler
+from look_around.scraper.selenium_scraper import make_driver
+from look_around.scraper.session_pool import SessionPool
+# autopep8: on
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _RecordingHandler(PageHandler):
+
+    pages: list
+
+    def __init__(self) -> None:
+        self.pages = []
+
+    def handle_page(self, driver) -> None:
+        self.pages.append(driver.page_source)
+
+
+class _Session():
+    """Stands in for a web driver where just the life cycle of the sessions matters. Pages are always ready."""
+
+    quit_count: int
+    current_url: str
+
+    def __init__(self) -> None:
+        self.quit_count = 0
+        self.current_url = ''
+
+    def get(self, url: str) -> None:
+        self.current_url = url
+
+    def execute_script(self, script: str):
+        return 'complete'
+
+    def find_element(self, by, value):
+        return self
+
+    def delete_all_cookies(self) -> None:
+        pass
+
+    def quit(self) -> None:
+        self.quit_count += 1
+
+
+class _TimingHandler(PageHandler):
+    """Notes down when a page has been handled. Handling takes a while."""
+
+    name: str
+    log: list
+
+    def __init__(self, name: str, log: list) -> None:
+        self.name = name
+        self.log = log
+
+    def handle_page(self, driver) -> None:
+        start = time.monotonic()
+        time.sleep(0.2)
+        self.log.append((self.name, start, time.monotonic()))
+
+
+def _find_browser() -> str:
+    for browser in ['chrome', 'firefox']:
+        try:
+            make_driver(browser, headless=True).quit()
+            return browser
+        except BaseException:
+            continue
+    return None
+
+
+class TestOriginScheduler(unittest.TestCase):
+
+    tmp_dir: tempfile.TemporaryDirectory
+    server: HTTPServer
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        for num in range(3):
+            links = ''.join(
+                [f'<li><a class="job" href="job{idx}.html">job {idx}</a></li>' for idx in range(2)])
+            Path(cls.tmp_dir.name, f'site{num}.html').write_text(
+                f'<html><body><ul id="jobs">{links}</ul></body></html>')
+        for idx in range(2):
+            Path(cls.tmp_dir.name, f'job{idx}.html').write_text(
+                f'<html><body><h1>Job {idx}</h1></body></html>')
+        handler = partial(_QuietHandler, directory=cls.tmp_dir.name)
+        cls.server = HTTPServer(('127.0.0.1', 0), handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.browser = _find_browser()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.tmp_dir.cleanup()
+
+    def test_group_by_host(self):
+        origins = [{'origin': 'a', 'base_url': 'http://one.example/a'},
+                   {'origin': 'b', 'base_url': 'http://two.example/'},
+                   {'origin': 'c', 'base_url': 'http://ONE.example/c'},
+                   {'origin': 'd'}]
+        groups = group_by_host(origins)
+        self.assertEqual([['a', 'c'], ['b']], [[origin['origin'] for origin in group] for group in groups])
+
+    def test_sessions_reused(self):
+        started = []
+
+        def factory():
+            started.append(_Session())
+            return started[-1]
+        pool = SessionPool('none', max_sessions=2, factory=factory)
+        for _ in range(3):
+            with pool.session():
+                pass
+        self.assertEqual(1, len(started))
+        pool.close()
+        self.assertEqual(1, started[0].quit_count)
+
+    def test_sessions_limited(self):
+        started = []
+        pool = SessionPool('none', max_sessions=2,
+                           factory=lambda: started.append(_Session()) or started[-1])
+        barrier = threading.Barrier(2)
+
+        def borrow():
+            with pool.session():
+                barrier.wait(timeout=5)
+        threads = [threading.Thread(target=borrow) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+        self.assertEqual(2, len(started))
+        pool.close()
+
+    def test_failed_session_quit(self):
+        session = _Session()
+        pool = SessionPool('none', max_sessions=1, factory=lambda: session)
+        with self.assertRaises(RuntimeError):
+            with pool.session():
+                raise RuntimeError('browser crashed')
+        self.assertEqual(1, session.quit_count)
+
+    def test_hosts_run_concurrently(self):
+        log = []
+        pool = SessionPool('none', max_sessions=2, factory=_Session)
+        origins = [{'origin': 'one a', 'base_url': 'http://one.example/a', 'actions': [{'type': 'handle', 'name': 'time'}]},
+                   {'origin': 'one b', 'base_url': 'http://one.example/b', 'actions': [{'type': 'handle', 'name': 'time'}]},
+                   {'origin': 'two', 'base_url': 'http://two.example/', 'actions': [{'type': 'handle', 'name': 'time'}]}]
+        scheduler = OriginScheduler(pool, 'none', lambda origin: {'time': _TimingHandler(origin['origin'], log)})
+        results = scheduler.run(origins)
+        pool.close()
+        self.assertEqual({'one a': True, 'one b': True, 'two': True}, results)
+
+        spans = {name: (start, end) for name, start, end in log}
+
+        def overlap(first, second):
+            return spans[first][0] < spans[second][1] and spans[second][0] < spans[first][1]
+        self.assertTrue(overlap('one a', 'two'))
+        self.assertFalse(overlap('one a', 'one b'))
+
+    def test_scrape_local_site(self):
+        if self.browser is None:
+            self.skipTest('no headless browser available')
+        handlers = {}
+
+        def make_handlers(origin):
+            handlers[origin['origin']] = _RecordingHandler()
+            return {'record': handlers[origin['origin']]}
+
+        actions = [{'type': 'list', 'children': ['id=jobs', 'class=job'], 'actions': [
+            {'type': 'click', 'children': [], 'actions': [{'type': 'handle', 'name': 'record'}, {'type': 'back'}]}]}]
+        # the last site under another host name, so two hosts are scraped at the same time
+        hosts = ['127.0.0.1', '127.0.0.1', 'localhost']
+        origins = [{'origin': f'site{num}', 'base_url': f'http://{hosts[num]}:{self.server.server_port}/site{num}.html',
+                    'actions': actions}
+                   for num in range(3)]
+        pool = SessionPool(self.browser, max_sessions=2)
+        results = OriginScheduler(pool, self.browser, make_handlers).run(origins)
+        pool.close()
+        self.assertEqual({f'site{num}': True for num in range(3)}, results)
+        for num in range(3):
+            self.assertEqual(2, len(handlers[f'site{num}'].pages))
+            self.assertIn('Job 1', handlers[f'site{num}'].pages[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import threading
+import time
+import unittest
+import sys
+sys.path.append('..')
+sys.path.append('../..')
+sys.path.append('../../look_around')
+# autopep8: off
+from look_around.scraper.rate_limiter import HostRateLimiter, TokenBucket
+# autopep8: on
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(20, 3)
+        start = time.monotonic()
+        waits = [bucket.acquire() for _ in range(5)]
+        self.assertEqual([0, 0, 0], waits[:3])
+        self.assertAlmostEqual(0.05, waits[3], delta=0.02)
+        self.assertAlmostEqual(0.05, waits[4], delta=0.02)
+        self.assertGreater(time.monotonic() - start, 0.08)
+
+    def test_refill(self):
+        bucket = TokenBucket(50, 1)
+        bucket.acquire()
+        time.sleep(0.05)
+        self.assertEqual(0, bucket.acquire())
+
+    def test_threads_queue_up(self):
+        bucket = TokenBucket(20, 1)
+        waits = []
+        threads = [threading.Thread(target=lambda: waits.append(bucket.acquire()))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # each thread waits for its own token
+        waits.sort()
+        self.assertEqual(0, waits[0])
+        self.assertGreater(waits[3], 0.12)
+
+    def test_hosts_independent(self):
+        limiter = HostRateLimiter(rate=1, burst=1)
+        self.assertEqual(0, limiter.acquire('https://one.example.com/jobs'))
+        self.assertEqual(0, limiter.acquire('https://two.example.com/jobs'))
+        self.assertEqual(0, limiter.acquire('https://one.example.org/'))
+
+    def test_invalid_rate(self):
+        self.assertRaises(ValueError, TokenBucket, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
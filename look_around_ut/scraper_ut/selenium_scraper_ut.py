@@ -1,14 +1,108 @@
+from selenium.common.exceptions import JavascriptException, NoSuchElementException, StaleElementReferenceException, TimeoutException
 from selenium.webdriver.common.by import By
+import threading
+import time
 import unittest
 import sys
 sys.path.append('..')
 sys.path.append('../..')
 sys.path.append('../../look_around')
 # autopep8: off
+from look_around.scraper.element_selector import parse_selector
 from look_around.scraper.selenium_scraper import SeleniumScraper
 # autopep8: on
 
 
+class _Element():
+    """Stands in for a web element. Children are found by tag name only."""
+
+    tag: str
+    children: list
+    stale: bool
+    finds: int
+    """Number of searches started from this element."""
+    href: str
+    on_click: callable
+
+    def __init__(self, tag: str, children: list = [], href: str = None, on_click: callable = None) -> None:
+        self.tag = tag
+        self.children = children
+        self.stale = False
+        self.finds = 0
+        self.href = href
+        self.on_click = on_click
+
+    def get_attribute(self, name):
+        return self.href if name == 'href' else None
+
+    def click(self) -> None:
+        if self.on_click is not None:
+            self.on_click()
+
+    def is_enabled(self) -> bool:
+        if self.stale:
+            raise StaleElementReferenceException()
+        return True
+
+    def find_elements(self, by, value) -> list:
+        self.finds += 1
+        return [child for child in self.children if child.tag == value]
+
+    def find_element(self, by, value):
+        found = self.find_elements(by, value)
+        if len(found) == 0:
+            raise NoSuchElementException()
+        return found[0]
+
+
+class _Driver():
+
+    html: _Element
+    states: list
+    """Answers to the scripts asking for the state of the page, the last one is repeated. Exceptions are raised."""
+    current_url: str
+    referrer: str
+
+    def __init__(self, html: _Element, states: list = ['complete'], current_url: str = 'https://www.example.com/', referrer: str = '') -> None:
+        self.html = html
+        self.states = list(states)
+        self.current_url = current_url
+        self.referrer = referrer
+
+    def find_element(self, by, value):
+        return self.html
+
+    def execute_script(self, script):
+        if 'referrer' in script:
+            return self.referrer
+        state = self.states[0]
+        if len(self.states) > 1:
+            self.states.pop(0)
+        if isinstance(state, Exception):
+            raise state
+        return state
+
+    def back(self) -> None:
+        pass
+
+    def load(self, url: str) -> None:
+        """Replaces the page, as the browser does when navigating."""
+        self.html.stale = True
+        self.html = _Element('html')
+        self.current_url = url
+
+
+class _Limiter():
+    """Notes down the urls requested instead of delaying them."""
+
+    def __init__(self) -> None:
+        self.urls = []
+
+    def acquire(self, url: str) -> float:
+        self.urls.append(url)
+        return 0.0
+
+
 class TestSeleniumScraper(unittest.TestCase):
 
     scraper: SeleniumScraper
@@ -50,6 +144,154 @@ class TestSeleniumScraper(unittest.TestCase):
         type = 'invalid'
         self.assertRaises(ValueError, self.scraper._get_by, type)
 
+    def test_compile_actions(self):
+        actions = [{'type': 'list', 'children': ['id=main', 'tag=li'],
+                    'actions': [{'type': 'click', 'children': ['tag=a[1]']}, {'type': 'back'}]}]
+        compiled, errors = self.scraper.compile_actions(actions)
+        self.assertEqual([], errors)
+        self.assertEqual(By.ID, compiled[0]['children'][0].by)
+        self.assertEqual(1, compiled[0]['actions'][0]['children'][0].index)
+        # the configuration itself stays as is
+        self.assertEqual('id=main', actions[0]['children'][0])
+
+    def test_compile_errors(self):
+        actions = [{'children': ['id=main']},
+                   {'type': 'jump'},
+                   {'type': 'list', 'children': ['id=main', 'tag=li[0]']},
+                   {'type': 'click', 'children': ['tag=a'], 'actions': [
+                       {'type': 'shadow child', 'children': []}]},
+                   {'type': 'sleep', 'min': 'long'}]
+        compiled, errors = self.scraper.compile_actions(actions)
+        self.assertEqual(5, len(errors))
+        self.assertTrue(errors[0].startswith('actions[0]:'))
+        self.assertTrue(errors[3].startswith('actions[3].actions[0]:'))
+
+    def test_run_aborts_on_invalid_actions(self):
+        # fails before any driver is used
+        self.assertFalse(self.scraper.run([{'type': 'jump'}], driver=object()))
+
+    def test_resolve_from_valid_ancestor(self):
+        items = [_Element('li'), _Element('li')]
+        ul = _Element('ul', items)
+        body = _Element('body', [ul])
+        html = _Element('html', [body])
+        lineage = [(parse_selector('tag=body'), body), (parse_selector('tag=ul'), ul),
+                   (parse_selector('tag=li[1]'), _Element('li'))]
+        lineage[2][1].stale = True
+
+        elem = self.scraper._resolve_lineage(lineage, _Driver(html))
+        self.assertIs(items[1], elem)
+        self.assertIs(items[1], lineage[2][1])
+        self.assertEqual(0, html.finds)
+        self.assertEqual(0, body.finds)
+        self.assertEqual(1, ul.finds)
+
+    def test_resolve_from_root(self):
+        ul = _Element('ul', [_Element('li')])
+        html = _Element('html', [ul])
+        old_ul = _Element('ul')
+        old_ul.stale = True
+        old_li = _Element('li')
+        old_li.stale = True
+        lineage = [(parse_selector('tag=ul'), old_ul),
+                   (parse_selector('tag=li[0]'), old_li)]
+
+        elem = self.scraper._resolve_lineage(lineage, _Driver(html))
+        self.assertIs(ul.children[0], elem)
+        self.assertIs(ul, lineage[0][1])
+
+    def test_wait_dom_ready(self):
+        driver = _Driver(_Element('html'), ['loading', 'interactive', 'complete'])
+        compiled, _ = self.scraper.compile_actions([{'type': 'wait'}])
+        self.scraper._wait_action(driver.html, compiled[0], driver)
+        self.assertEqual(['complete'], driver.states)
+
+    def test_wait_timeout(self):
+        driver = _Driver(_Element('html'), ['loading'])
+        compiled, _ = self.scraper.compile_actions(
+            [{'type': 'wait', 'wait_for': 0.2}])
+        self.assertRaises(TimeoutException, self.scraper._wait_action,
+                          driver.html, compiled[0], driver)
+
+    def test_wait_element(self):
+        body = _Element('body')
+        driver = _Driver(_Element('html', [body]))
+        compiled, errors = self.scraper.compile_actions(
+            [{'type': 'wait', 'until': 'element', 'children': ['tag=body', 'tag=p'], 'wait_for': 2}])
+        self.assertEqual([], errors)
+        threading.Timer(0.2, lambda: body.children.append(_Element('p'))).start()
+        self.scraper._wait_action(driver.html, compiled[0], driver)
+
+    def test_wait_network_idle(self):
+        driver = _Driver(_Element('html'), [['complete', 1], ['complete', 2]])
+        compiled, _ = self.scraper.compile_actions(
+            [{'type': 'wait', 'until': 'network idle', 'idle': 0.2}])
+        start = time.monotonic()
+        self.scraper._wait_action(driver.html, compiled[0], driver)
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+    def test_compile_wait_errors(self):
+        _, errors = self.scraper.compile_actions(
+            [{'type': 'wait', 'until': 'never'}, {'type': 'wait', 'until': 'element'},
+             {'type': 'wait', 'until': 'network idle', 'idle': 0}, {'type': 'wait', 'wait_for': -1}])
+        self.assertEqual(4, len(errors))
+
+    def test_network_idle_polls_sparingly(self):
+        driver = _Driver(_Element('html'), [['loading', 1]])
+        calls = []
+        execute = driver.execute_script
+        driver.execute_script = lambda script: calls.append(script) or execute(script)
+        self.assertRaises(TimeoutException, self.scraper._wait_for_page,
+                          driver, 'network idle', 0.3, idle=0.001)
+        self.assertLess(len(calls), 10)
+
+    def test_click_waits_for_new_page(self):
+        driver = _Driver(_Element('html'))
+        old_page = driver.html
+        link = _Element('a', on_click=lambda: threading.Timer(
+            0.3, driver.load, ['https://www.example.com/next']).start())
+        old_page.children = [link]
+        self.scraper._click_action(
+            old_page, {'children': [parse_selector('tag=a')]}, driver)
+        # the old page is complete too, but must not count as the new page being ready
+        self.assertTrue(old_page.stale)
+
+    def test_click_in_place(self):
+        driver = _Driver(_Element('html'))
+        driver.html.children = [_Element('button')]
+        start = time.monotonic()
+        self.scraper._click_action(
+            driver.html, {'children': [parse_selector('tag=button')]}, driver)
+        self.assertLess(time.monotonic() - start, 5)
+
+    def test_ignore_page_errors(self):
+        driver = _Driver(_Element('html'), [JavascriptException(), 'loading', 'complete'])
+        self.scraper._wait_for_page(driver, 'dom ready', 2)
+        self.assertEqual(['complete'], driver.states)
+
+    def test_polite_to_target(self):
+        limiter = _Limiter()
+        scraper = SeleniumScraper('https://www.example.com', 'browser',
+                                  readiness=None, rate_limiter=limiter)
+        driver = _Driver(_Element('html'), referrer='https://list.example.org/jobs')
+        driver.html.children = [_Element('a', href='https://jobs.example.org/1'),
+                                _Element('button'), _Element('b', href='javascript:void(0)')]
+        for tag in ['a', 'button', 'b']:
+            scraper._click_action(
+                driver.html, {'children': [parse_selector(f'tag={tag}')]}, driver)
+        scraper._back_action(driver)
+        driver.referrer = ''
+        scraper._back_action(driver)
+        self.assertEqual(['https://jobs.example.org/1', driver.current_url, driver.current_url,
+                          'https://list.example.org/jobs', driver.current_url], limiter.urls)
+
+    def test_sleep_left_to_limiter(self):
+        scraper = SeleniumScraper('https://www.example.com', 'browser',
+                                  rate_limiter=_Limiter())
+        start = time.monotonic()
+        scraper._sleep_action({'min': 2, 'max': 3}, None)
+        self.assertLess(time.monotonic() - start, 1)
+
     # def test_list_action(self):
     #     html = '<!DOCTYPE html><html><head><title>Unit Test</title></head><body><p id="first"><ul><li>no1</li><li>no2</li></ul></p><p id="second"><ul><li>yes1</li><li>yes2</li><li>yes3</li></ul></p></body></html>'
 
@@ -0,0 +1,122 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+import sys
+sys.path.append('..')
+sys.path.append('../..')
+sys.path.append('../../look_around')
+# autopep8: off
+from look_around.core.project import Project
+from look_around.scraper.page_handlers.storage_handler import StorageHandler
+from look_around.tools import keys
+# autopep8: on
+
+
+class _Page():
+    """Stands in for a web driver, just the page source and the url are read."""
+
+    page_source: str
+    current_url: str
+
+    def __init__(self, page_source: str, current_url: str = 'https://www.example.com/') -> None:
+        self.page_source = page_source
+        self.current_url = current_url
+
+
+class TestStorageHandler(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.prj = Project('unit_test', Path(self.tmp_dir.name))
+        self.prj.make_missing_dirs()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_store_training_pages(self):
+        handler = StorageHandler(self.prj, 'test origin', batch_size=2)
+        for num in range(5):
+            handler.handle_page(_Page(f'<p>page {num}</p>'))
+        handler.close()
+
+        self.assertEqual(5, handler.stored)
+        file_data = self.prj.read_training_index()
+        self.assertEqual(5, len(file_data))
+        self.assertTrue((file_data[keys.ORIGIN] == 'test origin').all())
+        contents = set()
+        for raw_file in file_data[keys.RAW_FILE]:
+            self.assertRegex(raw_file, r'^\d{4}/\w{6}_\d+-raw\.html$')
+            with open(Path(self.prj.training_dir, raw_file), 'rt') as file:
+                contents.add(file.read())
+        self.assertEqual({f'<p>page {num}</p>' for num in range(5)}, contents)
+
+    def test_flush(self):
+        handler = StorageHandler(self.prj, 'test origin', batch_size=100)
+        handler.handle_page(_Page('<p>page</p>'))
+        handler.flush()
+        self.assertEqual(1, len(self.prj.read_training_index()))
+        handler.close()
+
+    def test_store_data_pages(self):
+        handler = StorageHandler(
+            self.prj, 'test origin', training=False, batch_size=2)
+        for num in range(3):
+            handler.handle_page(_Page(f'<p>page {num}</p>'))
+        handler.close()
+
+        data_index = self.prj.read_data_index()
+        self.assertEqual(3, len(data_index))
+        for raw_file in data_index[keys.RAW_FILE]:
+            self.assertTrue(Path(self.prj.data_dir, raw_file).is_file())
+
+    def test_drop_duplicates(self):
+        handler = StorageHandler(
+            self.prj, 'test origin', dedup=self.prj.get_dedup_index())
+        handler.handle_page(_Page('<p>some posting</p>'))
+        handler.handle_page(_Page('<div><p>Some posting!</p></div>'))
+        handler.handle_page(_Page('<p>another posting</p>'))
+        handler.close()
+
+        self.assertEqual(2, handler.stored)
+        self.assertEqual(1, handler.duplicates)
+        self.assertEqual(2, len(self.prj.read_training_index()))
+
+    def test_duplicates_of_earlier_pages(self):
+        # stored before there was a dedup index
+        handler = StorageHandler(self.prj, 'old origin')
+        handler.handle_page(_Page('<p>some posting</p>'))
+        handler.close()
+        known = self.prj.read_training_index()[keys.RAW_FILE].iloc[0]
+
+        dedup = self.prj.get_dedup_index()
+        handler = StorageHandler(self.prj, 'new origin', dedup=dedup)
+        handler.handle_page(_Page('<div>Some posting</div>', 'https://jobs.example.org/1'))
+        handler.close()
+
+        self.assertEqual(0, handler.stored)
+        links = dedup.get_links(known)
+        self.assertEqual(['new origin'], list(links['origin']))
+        self.assertEqual(['https://jobs.example.org/1'], list(links['url']))
+
+    def test_concurrent_handlers(self):
+        handlers = [StorageHandler(self.prj, f'origin {num}', batch_size=1)
+                    for num in range(4)]
+        threads = [threading.Thread(target=lambda handler=handler: [handler.handle_page(_Page(f'<p>{num}</p>'))
+                                                                    for num in range(50)])
+                   for handler in handlers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for handler in handlers:
+            handler.close()
+
+        file_data = self.prj.read_training_index()
+        self.assertEqual(200, len(file_data))
+        self.assertEqual(200, len(file_data.index.unique()))
+        self.assertEqual(50, (file_data[keys.ORIGIN] == 'origin 3').sum())
+
+
+if __name__ == '__main__':
+    unittest.main()
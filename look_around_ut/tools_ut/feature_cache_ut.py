@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import tempfile
+import unittest
+from pathlib import Path
+from sklearn.feature_extraction.text import TfidfVectorizer as TFV
+import sys
+sys.path.append('..')
+sys.path.append('../..')
+sys.path.append('../../look_around')
+# autopep8: off
+from look_around.tools.feature_cache import FeatureCache
+# autopep8: on
+
+
+class TestFeatureCache(unittest.TestCase):
+
+    tmp_dir: tempfile.TemporaryDirectory
+    vocab: np.ndarray
+    docs: pd.Series
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.vocab = np.array(['apple', 'banana', 'cherry', 'date'])
+        self.docs = pd.Series(['apple banana', 'cherry', 'date apple cherry', 'fig'],
+                              index=['a', 'b', 'c', 'd'])
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def vectorize(self, docs: pd.Series) -> np.ndarray:
+        vect = TFV(use_idf=False, binary=True, norm=None,
+                   vocabulary=self.vocab)
+        return vect.fit_transform(docs).toarray()
+
+    def test_same_as_vectorizer(self):
+        cache = FeatureCache(Path(self.tmp_dir.name))
+        features = cache.get_features(self.vocab, self.docs)
+        np.testing.assert_array_equal(
+            self.vectorize(self.docs), features.toarray())
+
+    def test_reload(self):
+        FeatureCache(Path(self.tmp_dir.name)).get_features(
+            self.vocab, self.docs)
+        cache = FeatureCache(Path(self.tmp_dir.name))
+        subset = self.docs.loc[['c', 'a']]
+        features = cache.get_features(self.vocab, subset)
+        np.testing.assert_array_equal(
+            self.vectorize(subset), features.toarray())
+
+    def test_new_and_changed_docs(self):
+        FeatureCache(Path(self.tmp_dir.name)).get_features(
+            self.vocab, self.docs)
+        docs = self.docs.copy()
+        docs.loc['b'] = 'banana date'
+        docs.loc['e'] = 'cherry banana'
+        cache = FeatureCache(Path(self.tmp_dir.name))
+        features = cache.get_features(self.vocab, docs)
+        np.testing.assert_array_equal(
+            self.vectorize(docs), features.toarray())
+
+        # all of them are cached now
+        features = FeatureCache(Path(self.tmp_dir.name)).get_features(
+            self.vocab, docs)
+        np.testing.assert_array_equal(
+            self.vectorize(docs), features.toarray())
+
+    def test_vocab_changes_key(self):
+        cache = FeatureCache(Path(self.tmp_dir.name))
+        cache.get_features(self.vocab, self.docs)
+        self.vocab = self.vocab[::-1]
+        features = cache.get_features(self.vocab, self.docs)
+        np.testing.assert_array_equal(
+            self.vectorize(self.docs), features.toarray())
+        self.assertEqual(
+            2, len(list(Path(self.tmp_dir.name).glob('features_*.npz'))))
+
+
+if __name__ == '__main__':
+    unittest.main()